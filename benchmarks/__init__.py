@@ -0,0 +1,6 @@
+"""
+오프라인 벤치마크
+
+녹화/합성 픽스처와 로컬 대역 서버로 단계별 처리량을 재고, 결과를 JSON 으로
+남겨 기준선과 비교합니다. 실행 방법은 benchmarks/run.py 참고.
+"""
@@ -0,0 +1,205 @@
+"""
+벤치마크용 응답/데이터 픽스처
+
+외부 API 응답(국토부 XML, VWorld/Kakao JSON, 직방/다방 JSON)과 분석용 거래
+프레임을 원하는 규모로 만듭니다. 같은 seed 면 항상 같은 데이터가 나옵니다.
+
+실제로 녹화한 응답 파일이 있으면 그 안의 항목을 표본으로 써서 규모를 맞춥니다.
+
+    python -m benchmarks.fixtures --record benchmarks/fixtures   # 기본 규모로 파일 저장
+
+    <dir>/molit_apt_trade.xml    국토부 아파트 매매 응답 (<item> 표본)
+    <dir>/vworld_address.json    VWorld 주소 -> 좌표 응답
+    <dir>/kakao_address.json     카카오 주소 검색 응답
+    <dir>/zigbang_items.json     직방 매물 목록 (list)
+    <dir>/dabang_rooms.json      다방 bbox 검색 응답 ({"rooms": [...]})
+"""
+
+import argparse
+import json
+import os
+import xml.etree.ElementTree as ET
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from realestate_core.transaction_schema import compact_transactions
+
+SEED = 20240101
+
+DONGS = ['역삼동', '삼성동', '대치동', '개포동', '도곡동', '청담동', '논현동', '압구정동',
+         '신사동', '세곡동', '일원동', '수서동', '율현동', '자곡동']
+N_APTS = 2_000
+
+
+def _rng(seed: Optional[int]) -> np.random.Generator:
+    return np.random.default_rng(SEED if seed is None else seed)
+
+
+# ==================== 국토부 XML ====================
+
+def _synthetic_items(n: int, rng: np.random.Generator) -> List[Dict[str, str]]:
+    dong_idx = rng.integers(0, len(DONGS), n)
+    apt_idx = rng.integers(0, N_APTS, n)
+    prices = rng.integers(20_000, 400_000, n)
+    areas = rng.uniform(29, 200, n)
+    floors = rng.integers(-1, 50, n)
+    months = rng.integers(1, 13, n)
+    days = rng.integers(1, 29, n)
+    build_years = rng.integers(1975, 2025, n)
+    return [
+        {
+            'aptNm': f"아파트{apt_idx[i]}",
+            'dealAmount': f"{prices[i]:,}",
+            'umdNm': DONGS[dong_idx[i]],
+            'jibun': str(apt_idx[i] % 900 + 1),
+            'sggCd': '11680',
+            'umdCd': f"{10100 + dong_idx[i] * 100}",
+            'excluUseAr': f"{areas[i]:.2f}",
+            'floor': str(floors[i]),
+            'dealYear': '2024',
+            'dealMonth': str(months[i]),
+            'dealDay': str(days[i]),
+            'buildYear': str(build_years[i]),
+        }
+        for i in range(n)
+    ]
+
+
+def load_recorded_items(path: str) -> List[Dict[str, str]]:
+    """녹화한 국토부 XML 의 <item> 들을 dict 목록으로"""
+    root = ET.parse(path).getroot()
+    return [{child.tag: child.text or '' for child in item} for item in root.iter('item')]
+
+
+def molit_xml(n: int, pool: Optional[List[Dict[str, str]]] = None,
+              seed: Optional[int] = None) -> bytes:
+    """
+    n 건짜리 국토부 아파트 매매 응답 XML
+
+    pool(녹화한 항목)을 주면 그 안에서 복원 추출합니다.
+    """
+    rng = _rng(seed)
+    if pool:
+        items = [pool[i] for i in rng.integers(0, len(pool), n)]
+    else:
+        items = _synthetic_items(n, rng)
+
+    parts = ['<?xml version="1.0" encoding="UTF-8"?><response><header><resultCode>000</resultCode>'
+             '<resultMsg>OK</resultMsg></header><body><items>']
+    for item in items:
+        parts.append('<item>')
+        parts.extend(f"<{k}>{v}</{k}>" for k, v in item.items())
+        parts.append('</item>')
+    parts.append(f'</items><numOfRows>{n}</numOfRows><pageNo>1</pageNo>'
+                 f'<totalCount>{n}</totalCount></body></response>')
+    return ''.join(parts).encode('utf-8')
+
+
+# ==================== 좌표 변환 JSON ====================
+
+def vworld_address(lat: float = 37.5006, lon: float = 127.0364) -> Dict:
+    return {'response': {'status': 'OK', 'result': {'point': {'x': str(lon), 'y': str(lat)}}}}
+
+
+def kakao_address(lat: float = 37.5006, lon: float = 127.0364) -> Dict:
+    return {'documents': [{'x': str(lon), 'y': str(lat), 'address_name': '서울 강남구'}],
+            'meta': {'total_count': 1, 'is_end': True}}
+
+
+# ==================== 직방/다방 JSON ====================
+
+def zigbang_items(n: int, seed: Optional[int] = None) -> List[Dict]:
+    rng = _rng(seed)
+    deposits = rng.integers(500, 50_000, n)
+    rents = rng.integers(0, 300, n)
+    sizes = rng.uniform(15, 120, n)
+    return [
+        {
+            'item_id': int(10_000_000 + i),
+            'sales_type': '월세' if rents[i] else '전세',
+            'deposit': int(deposits[i]),
+            'rent': int(rents[i]),
+            'size_m2': round(float(sizes[i]), 2),
+            'floor': str(int(rents[i]) % 20 + 1),
+            'building_floor': '20',
+            'title': f"역세권 매물 {i}",
+            'random_text': 'x' * 40,
+        }
+        for i in range(n)
+    ]
+
+
+def dabang_rooms(n: int, seed: Optional[int] = None) -> Dict:
+    rng = _rng(None if seed is None else seed + 1)
+    sizes = rng.uniform(15, 80, n)
+    prices = rng.integers(500, 30_000, n)
+    return {'rooms': [
+        {
+            'id': f"dabang{i}",
+            'price_title': f"{prices[i]}/{int(prices[i]) % 100}",
+            'room_type': int(prices[i]) % 4,
+            'size_m2': round(float(sizes[i]), 2),
+            'floor': str(int(prices[i]) % 15 + 1),
+            'address': f"서울 강남구 {DONGS[i % len(DONGS)]}",
+        }
+        for i in range(n)
+    ]}
+
+
+# ==================== 분석용 거래 프레임 ====================
+
+def transactions_frame(n: int, seed: Optional[int] = None) -> pd.DataFrame:
+    """
+    압축 스키마(compact_transactions 결과)와 같은 n 건 거래 프레임
+
+    XML 을 거치지 않고 numpy 로 바로 만들어 1천만 건도 수 초 안에 생성합니다.
+    """
+    rng = _rng(seed)
+    apt_idx = rng.integers(0, N_APTS, n)
+    dong_idx = rng.integers(0, len(DONGS), n)
+    apts = pd.Categorical.from_codes(apt_idx, [f"아파트{i}" for i in range(N_APTS)])
+    jibuns = pd.Categorical.from_codes(apt_idx % 900, [str(i + 1) for i in range(900)])
+    dongs = pd.Categorical.from_codes(dong_idx, DONGS)
+    bjdong = pd.Categorical.from_codes(
+        dong_idx, [f"11680{10100 + i * 100}" for i in range(len(DONGS))]
+    )
+    start = np.datetime64('2020-01-01')
+    dates = start + rng.integers(0, 365 * 5, n).astype('timedelta64[D]')
+
+    df = pd.DataFrame({
+        'apt': apts,
+        'price': rng.integers(20_000, 400_000, n).astype('int32'),
+        'dong': dongs,
+        'jibun': jibuns,
+        'bjdong_cd': bjdong,
+        'area': rng.uniform(29, 200, n).astype('float32'),
+        'floor': rng.integers(-1, 50, n).astype('int16'),
+        'build_year': rng.integers(1975, 2025, n).astype('int16'),
+        'date': pd.to_datetime(dates),
+    })
+    return compact_transactions(df)
+
+
+def record_fixtures(directory: str, n: int = 1_000):
+    """기본 규모 픽스처를 파일로 저장"""
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, 'molit_apt_trade.xml'), 'wb') as f:
+        f.write(molit_xml(n))
+    for name, payload in [('vworld_address.json', vworld_address()),
+                          ('kakao_address.json', kakao_address()),
+                          ('zigbang_items.json', zigbang_items(n)),
+                          ('dabang_rooms.json', dabang_rooms(n))]:
+        with open(os.path.join(directory, name), 'w', encoding='utf-8') as f:
+            json.dump(payload, f, ensure_ascii=False)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='벤치마크 픽스처 저장')
+    parser.add_argument('--record', required=True, metavar='DIR', help='저장할 디렉터리')
+    parser.add_argument('--rows', type=int, default=1_000, help='응답당 항목 수')
+    args = parser.parse_args()
+
+    record_fixtures(args.record, args.rows)
+    print(f"✅ 픽스처 저장: {args.record}")
@@ -0,0 +1,406 @@
+"""
+단계별 벤치마크 실행기
+
+    python -m benchmarks.run                                   # 1k, 10k, 100k
+    python -m benchmarks.run --scales 1k,1m,10m --only stats.summary
+    python -m benchmarks.run --save-baseline benchmarks/baseline.json
+    python -m benchmarks.run --baseline benchmarks/baseline.json --threshold 0.15
+
+네트워크와 API 키 없이 실행됩니다. 외부 호출은 benchmarks.stub_server 로,
+캐시는 임시 디렉터리 + 메모리 전용으로 바꾸고 API 호출 간격/한도도 끕니다.
+결과는 benchmarks/results/<시각>.json 에 저장되며, --baseline 을 주면 같은
+(벤치마크, 규모)의 중앙값을 비교해 threshold 이상 느려진 항목이 있으면 종료
+코드 1 로 끝납니다.
+
+각 벤치마크는 감당할 수 있는 최대 규모가 있어, 그보다 큰 규모는 건너뜁니다
+(예: XML 파싱은 100만 건까지, 통계 집계는 1천만 건까지).
+"""
+
+import os
+import tempfile
+
+# realestate_core 를 import 하기 전에 격리된 캐시/한도 설정
+os.environ['REALESTATE_CACHE_DIR'] = tempfile.mkdtemp(prefix='realestate-bench-')
+for _api in ('MOLIT', 'VWORLD', 'KAKAO'):
+    os.environ[f'{_api}_DAILY_QUOTA'] = str(10 ** 12)
+os.environ.pop('REALESTATE_TRACE_FILE', None)
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import warnings
+from datetime import datetime
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+
+from benchmarks import fixtures
+from benchmarks.stub_server import StandInServer, point_clients_at
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+DEFAULT_SCALES = '1k,10k,100k'
+SCALE_SUFFIX = {'k': 1_000, 'm': 1_000_000}
+
+
+def parse_scale(text: str) -> int:
+    """'1k' -> 1000, '10m' -> 10000000"""
+    text = text.strip().lower().replace('_', '')
+    if text[-1] in SCALE_SUFFIX:
+        return int(float(text[:-1]) * SCALE_SUFFIX[text[-1]])
+    return int(text)
+
+
+class Context(NamedTuple):
+    server: StandInServer
+    molit_pool: Optional[List[Dict[str, str]]]
+
+
+class Benchmark(NamedTuple):
+    name: str
+    description: str
+    max_scale: int
+    setup: Callable[[int, Context], Any]   # 측정 제외 준비, 반환값이 run 의 인자
+    run: Callable[[Any], Any]              # 측정 구간
+
+
+# ==================== 벤치마크 정의 ====================
+
+def _setup_parse(n: int, ctx: Context) -> bytes:
+    return fixtures.molit_xml(n, ctx.molit_pool)
+
+
+def _run_parse(xml: bytes):
+    import xml.etree.ElementTree as ET
+    from realestate_core.datasets import get_dataset
+    from realestate_core.molit import parse_response
+    return parse_response(get_dataset('apt_trade'), ET.fromstring(xml))
+
+
+def _setup_fetch(n: int, ctx: Context):
+    from realestate_core.datasets import get_dataset
+    path = f"/molit/{get_dataset('apt_trade').path}"
+    ctx.server.set(path, fixtures.molit_xml(n, ctx.molit_pool), 'application/xml')
+
+
+def _run_fetch(_):
+    from realestate_core.molit import fetch_dataset
+    # 캐시를 거치지 않고 대역 서버 요청 + 파싱
+    return fetch_dataset.__wrapped__('apt_trade', '11680', '202401')
+
+
+def _setup_frame(n: int, ctx: Context) -> pd.DataFrame:
+    from realestate_core.transforms import add_pyeong
+    return add_pyeong(fixtures.transactions_frame(n))
+
+
+def _run_stats(df: pd.DataFrame):
+    from realestate_core.stats import summarize_transactions
+    return summarize_transactions(df)
+
+
+def _run_index(df: pd.DataFrame):
+    from realestate_core.transaction_index import TransactionIndex
+    index = TransactionIndex(df)
+    view = index.query(dong=str(df['dong'].iloc[0]), sort_by='price', ascending=False)
+    return view.page(1, 100)
+
+
+def _run_figure(df: pd.DataFrame):
+    from realestate_core.figures import price_area_figure
+
+    return price_area_figure(df, 'density').to_json()  # 브라우저로 보내는 JSON 까지
+
+
+def _setup_rollup(n: int, ctx: Context):
+    from realestate_core.store import TransactionStore
+
+    # 시군구 50개 x 12개월 파티션으로 나눠 임시 저장소에 기록
+    store = TransactionStore(tempfile.mkdtemp(prefix='realestate-bench-store-'))
+    df = _setup_frame(n, ctx)
+    parts = np.array_split(np.arange(n), 50 * 12)
+    for i, rows in enumerate(parts):
+        store.write_partition(f"{11000 + i // 12 * 10}", f"2024{i % 12 + 1:02d}", df.iloc[rows])
+    return store
+
+
+def _run_rollup(store):
+    from realestate_core.rollup import national_rollup
+
+    return national_rollup(store, '202401', '202412')  # 작업자 = CPU 수
+
+
+def _setup_query(n: int, ctx: Context):
+    from realestate_core.sql import QueryEngine
+
+    store = _setup_rollup(n, ctx)
+    engine = QueryEngine(store.root)
+    engine.refresh()
+    return engine
+
+
+def _run_query(engine):
+    # 시군구 50개 중 하나, 6개월 -> 파일 6개만 읽음
+    return engine.query("""
+        SELECT deal_ymd, dong, count(*) AS trades, median(price) AS median_price
+        FROM apt_trade WHERE lawd_cd = '11100' AND deal_ymd >= '202407'
+        GROUP BY ALL ORDER BY ALL
+    """).frame
+
+
+def _setup_map(n: int, ctx: Context):
+    from realestate_core.geocode import summarize_complexes
+
+    df = _setup_frame(n, ctx)
+    complexes = summarize_complexes(df)
+    rng = np.random.default_rng(fixtures.SEED)
+    complexes['lat'] = 37.4 + rng.random(len(complexes)) * 0.3
+    complexes['lon'] = 126.8 + rng.random(len(complexes)) * 0.4
+    return df, complexes
+
+
+def _run_map(state):
+    from realestate_core.figures import build_marker_layers, build_price_map
+    from realestate_core.transforms import price_quartiles
+    from realestate_core.viewport import ComplexLayer, Viewport
+
+    df, complexes = state
+    layer = ComplexLayer(complexes)
+    quartiles = price_quartiles(df)
+    html = []
+    for zoom in (12, 14, 16):  # 멀리서 집계 -> 단지별
+        m = build_price_map((37.5, 127.03))
+        markers = layer.query(Viewport.around(37.5, 127.03, zoom))
+        for fg in build_marker_layers(markers, quartiles):
+            fg.add_to(m)
+        html.append(m.get_root().render())  # st_folium 에 넘기기 전 HTML 생성까지
+    return html
+
+
+def _setup_geocode(n: int, ctx: Context) -> pd.DataFrame:
+    ctx.server.set_json('/vworld', fixtures.vworld_address())
+    ctx.server.set_json('/kakao/address', fixtures.kakao_address())
+    return fixtures.transactions_frame(n)
+
+
+def _run_geocode(df: pd.DataFrame):
+    from realestate_core.cache import default_cache
+    from realestate_core.geocode import geocode_complexes
+
+    default_cache.clear()  # 매번 대역 서버까지 요청
+    return geocode_complexes(df, '서울특별시', '강남구')
+
+
+def _setup_spatial(n: int, ctx: Context):
+    from realestate_core.spatial import SpatialIndex
+
+    rng = np.random.default_rng(fixtures.SEED)
+    index = SpatialIndex()
+    index.add(37.4 + rng.random(n) * 0.3, 126.8 + rng.random(n) * 0.4)
+    queries = list(zip(37.45 + rng.random(100) * 0.2, 126.85 + rng.random(100) * 0.3))
+    return index, queries
+
+
+def _run_spatial(state):
+    index, queries = state
+    for lat, lon in queries:
+        index.radius(lat, lon, 1_000)
+        index.bbox(lat - 0.005, lon - 0.005, lat + 0.005, lon + 0.005)
+        index.nearest(lat, lon, 10)
+
+
+_GEOHASHES = ['wydm0', 'wydm1', 'wydm2', 'wydm3']
+
+
+def _setup_listings(n: int, ctx: Context):
+    per_geohash = max(1, n // 2 // len(_GEOHASHES))
+    ctx.server.set_json('/zigbang/v2/items/geohash', [{'geohash': g} for g in _GEOHASHES])
+    ctx.server.set_json('/zigbang/v2/items', fixtures.zigbang_items(per_geohash))
+    ctx.server.set_json('/dabang/2/room/list/bbox-point', fixtures.dabang_rooms(n - n // 2))
+
+
+def _run_listings(_):
+    from zigbang_dabang_api import RealEstateAggregator
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        return RealEstateAggregator().search_all_platforms(37.4979, 127.0276)
+
+
+BENCHMARKS = [
+    Benchmark('molit.parse', '국토부 XML -> 압축 프레임 (parse_response)',
+              1_000_000, _setup_parse, _run_parse),
+    Benchmark('molit.fetch', '대역 서버 요청 + 파싱 (fetch_dataset, 캐시 제외)',
+              100_000, _setup_fetch, _run_fetch),
+    Benchmark('stats.summary', '통계 탭 집계 (summarize_transactions)',
+              10_000_000, _setup_frame, _run_stats),
+    Benchmark('stats.figure', '평수별 거래가 분포 구간 집계 그림 + JSON (price_area_figure)',
+              10_000_000, _setup_frame, _run_figure),
+    Benchmark('rollup.national', '전국 집계 (시군구 50 x 12개월 파티션, national_rollup, 작업자 = CPU 수)',
+              10_000_000, _setup_rollup, _run_rollup),
+    Benchmark('sql.query', '저장소 SQL 조회 (시군구 1곳 x 6개월 동별 중앙값, QueryEngine 파티션 가지치기)',
+              10_000_000, _setup_query, _run_query),
+    Benchmark('list.index', '거래 목록 인덱스 생성 + 조회 1회 (TransactionIndex)',
+              10_000_000, _setup_frame, _run_index),
+    Benchmark('map.build', '가격 지도 뷰포트 3단계(줌 12/14/16) 마커 + HTML (ComplexLayer, build_marker_layers)',
+              1_000_000, _setup_map, _run_map),
+    Benchmark('geocode.complexes', '단지별 집계 + 좌표 변환 (geocode_complexes, 대역 서버)',
+              10_000, _setup_geocode, _run_geocode),
+    Benchmark('spatial.query', '공간 인덱스 질의 100회 x (반경 1km + bbox + 최근접 10) (SpatialIndex)',
+              10_000_000, _setup_spatial, _run_spatial),
+    Benchmark('listings.merge', '직방/다방 수집 + 병합 (RealEstateAggregator, 직방 대기 0.4초 포함)',
+              100_000, _setup_listings, _run_listings),
+]
+
+
+# ==================== 실행 ====================
+
+def measure(bench: Benchmark, n: int, ctx: Context, repeat: int) -> Dict[str, Any]:
+    state = bench.setup(n, ctx)
+    bench.run(state)  # 예열 (지연 import, 첫 연결)
+
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        bench.run(state)
+        times.append(time.perf_counter() - start)
+
+    median = statistics.median(times)
+    return {
+        'bench': bench.name,
+        'scale': n,
+        'repeat': repeat,
+        'median_s': round(median, 6),
+        'min_s': round(min(times), 6),
+        'rows_per_s': round(n / median, 1) if median else None,
+    }
+
+
+def environment() -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                text=True, timeout=5).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        commit = ''
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+    }
+
+
+def compare(results: List[Dict[str, Any]], baseline: List[Dict[str, Any]],
+            threshold: float) -> List[Dict[str, Any]]:
+    """같은 (bench, scale) 의 중앙값 비율 (current / baseline)"""
+    base = {(r['bench'], r['scale']): r for r in baseline}
+    rows = []
+    for r in results:
+        b = base.get((r['bench'], r['scale']))
+        if b is None or not b['median_s']:
+            continue
+        ratio = r['median_s'] / b['median_s']
+        rows.append({
+            'bench': r['bench'],
+            'scale': r['scale'],
+            'baseline_s': b['median_s'],
+            'current_s': r['median_s'],
+            'ratio': round(ratio, 3),
+            'regression': ratio > 1 + threshold,
+        })
+    return rows
+
+
+def run(scales: List[int], only: Optional[List[str]], repeat: int,
+        fixture_dir: Optional[str]) -> List[Dict[str, Any]]:
+    from realestate_core import quota
+    from realestate_core.cache import default_cache
+
+    quota.MIN_INTERVALS.clear()  # 호출 간격 대기 없이
+    default_cache.directory = None  # 메모리 캐시만 사용
+
+    pool = None
+    recorded = os.path.join(fixture_dir, 'molit_apt_trade.xml') if fixture_dir else None
+    if recorded and os.path.exists(recorded):
+        pool = fixtures.load_recorded_items(recorded)
+        print(f"📼 녹화된 국토부 응답 {len(pool):,}건을 표본으로 사용")
+
+    results = []
+    with StandInServer() as server, point_clients_at(server):
+        ctx = Context(server, pool)
+        for bench in BENCHMARKS:
+            if only and bench.name not in only:
+                continue
+            for n in scales:
+                if n > bench.max_scale:
+                    continue
+                result = measure(bench, n, ctx, repeat)
+                results.append(result)
+                print(f"{bench.name:<18} {n:>11,}  {result['median_s'] * 1000:>10.1f} ms"
+                      f"  {result['rows_per_s']:>14,.0f} rows/s")
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='부동산 레이더 오프라인 벤치마크')
+    parser.add_argument('--scales', default=DEFAULT_SCALES, help='쉼표로 구분 (예: 1k,100k,10m)')
+    parser.add_argument('--only', help='실행할 벤치마크 이름 (쉼표로 구분)')
+    parser.add_argument('--repeat', type=int, default=3, help='측정 반복 횟수 (중앙값 사용)')
+    parser.add_argument('--fixtures', help='녹화한 응답 디렉터리 (benchmarks.fixtures 참고)')
+    parser.add_argument('--output', help='결과 JSON 경로 (기본: benchmarks/results/<시각>.json)')
+    parser.add_argument('--baseline', help='비교할 기준선 결과 JSON')
+    parser.add_argument('--threshold', type=float, default=0.15,
+                        help='기준선보다 이 비율 이상 느리면 회귀로 판단')
+    parser.add_argument('--save-baseline', metavar='PATH', help='이번 결과를 기준선으로도 저장')
+    parser.add_argument('--list', action='store_true', help='벤치마크 목록만 출력')
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for bench in BENCHMARKS:
+            print(f"{bench.name:<18} 최대 {bench.max_scale:>11,}  {bench.description}")
+        return 0
+
+    warnings.filterwarnings('ignore', category=UserWarning, module='folium')
+
+    scales = [parse_scale(s) for s in args.scales.split(',') if s.strip()]
+    only = [s.strip() for s in args.only.split(',')] if args.only else None
+    results = run(scales, only, args.repeat, args.fixtures)
+
+    report = {'environment': environment(), 'results': results}
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+        report['comparison'] = compare(results, baseline, args.threshold)
+        print(f"\n기준선 비교 ({args.baseline}, 허용 +{args.threshold:.0%})")
+        for row in report['comparison']:
+            mark = '❌' if row['regression'] else '✅'
+            print(f"{mark} {row['bench']:<18} {row['scale']:>11,}  "
+                  f"{row['baseline_s'] * 1000:>9.1f} -> {row['current_s'] * 1000:>9.1f} ms"
+                  f"  x{row['ratio']:.2f}")
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, datetime.now().strftime('%Y%m%d-%H%M%S') + '.json'
+    )
+    for path in filter(None, [output, args.save_baseline]):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n💾 결과 저장: {output}")
+
+    regressions = [r for r in report.get('comparison', []) if r['regression']]
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
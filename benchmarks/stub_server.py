@@ -0,0 +1,92 @@
+"""
+외부 API 대역 HTTP 서버
+
+국토부/VWorld/Kakao/직방/다방 엔드포인트를 로컬 서버로 바꿔 끼워, 네트워크
+없이도 요청 -> 응답 -> 파싱 전체 경로를 잴 수 있게 합니다. 응답은 경로별로
+미리 넣어 둔 바이트를 그대로 돌려주며, 쿼리 문자열은 보지 않습니다.
+
+    with StandInServer() as server, point_clients_at(server):
+        server.set('/molit/RTMSDataSvcAptTrade/getRTMSDataSvcAptTrade',
+                   fixtures.molit_xml(1000), 'application/xml')
+        fetch_dataset.__wrapped__('apt_trade', '11680', '202401')
+"""
+
+import contextlib
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Iterator
+from urllib.parse import urlsplit
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body, content_type = self.server.routes.get(
+            urlsplit(self.path).path, (b'not found', 'text/plain')
+        )
+        self.send_response(200 if content_type != 'text/plain' else 404)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StandInServer:
+    """경로 -> 고정 응답 서버 (별도 스레드)"""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0):
+        self._httpd = ThreadingHTTPServer((host, port), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.routes = {}  # path -> (body, content_type)
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def set(self, path: str, body: bytes, content_type: str = 'application/octet-stream'):
+        self._httpd.routes[path] = (body, content_type)
+
+    def set_json(self, path: str, payload: Any):
+        self.set(path, json.dumps(payload, ensure_ascii=False).encode('utf-8'), 'application/json')
+
+    def __enter__(self) -> 'StandInServer':
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+@contextlib.contextmanager
+def point_clients_at(server: StandInServer) -> Iterator[None]:
+    """각 API 클라이언트의 엔드포인트를 대역 서버로 바꿨다가 되돌림"""
+    from realestate_core import config, geocode, molit
+    import zigbang_dabang_api
+
+    base = server.base_url
+    targets = [
+        (molit, 'MOLIT_BASE_URL', f"{base}/molit"),
+        (geocode, 'VWORLD_ADDRESS_URL', f"{base}/vworld"),
+        (geocode, 'KAKAO_ADDRESS_URL', f"{base}/kakao/address"),
+        (geocode, 'KAKAO_KEYWORD_URL', f"{base}/kakao/keyword"),
+        (zigbang_dabang_api.ZigbangAPI, 'BASE_URL', f"{base}/zigbang"),
+        (zigbang_dabang_api.DabangAPI, 'BASE_URL', f"{base}/dabang"),
+        # 키가 없으면 좌표 변환 함수가 호출 없이 끝나므로 가짜 키를 넣음
+        (config, 'VWORLD_API_KEY', config.VWORLD_API_KEY or 'bench'),
+        (config, 'KAKAO_REST_KEY', config.KAKAO_REST_KEY or 'bench'),
+        (config, 'MOLIT_API_KEY', config.MOLIT_API_KEY or 'bench'),
+    ]
+    saved = [(obj, name, getattr(obj, name)) for obj, name, _ in targets]
+    for obj, name, value in targets:
+        setattr(obj, name, value)
+    try:
+        yield
+    finally:
+        for obj, name, value in saved:
+            setattr(obj, name, value)
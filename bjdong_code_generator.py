@@ -5,11 +5,18 @@
 실무에서는 행정안전부 공식 데이터를 다운로드하여 사용하는 것을 권장합니다.
 """
 
+import argparse
+import csv
+import os
 import pandas as pd
 import requests
-from typing import List, Dict
+from typing import List, Dict, Iterator, Optional, Tuple
 import json
 
+from realestate_core.region_index import RegionIndex
+
+FULL_BJDONG_CSV = "bjdong_full_codes.csv"
+
 def create_comprehensive_bjdong_codes() -> pd.DataFrame:
     """
     대한민국 전체 법정동 코드 생성
@@ -399,21 +406,164 @@ def load_bjdong_codes_from_csv(filename: str = "bjdong_codes.csv") -> pd.DataFra
         return save_bjdong_codes_to_csv(filename)
 
 
-def fetch_bjdong_from_gov_api() -> pd.DataFrame:
+def _detect_encoding(filename: str) -> str:
+    """행정안전부 원본은 보통 CP949, 재가공본은 UTF-8 인 경우가 많음"""
+    with open(filename, 'rb') as f:
+        head = f.read(64 * 1024)
+    try:
+        head.decode('utf-8')
+        return 'utf-8-sig'
+    except UnicodeDecodeError as e:
+        # 버퍼 끝에서 멀티바이트 문자가 잘린 경우는 UTF-8 로 판단
+        return 'utf-8-sig' if e.start >= len(head) - 3 else 'cp949'
+
+
+def iter_full_bjdong_rows(filename: str) -> Iterator[Tuple[str, str, str]]:
     """
-    정부 API에서 법정동 코드 직접 조회
+    행정안전부 법정동코드 전체자료를 한 줄씩 읽기
+
+    지원 형식:
+    - 탭 구분 텍스트 (법정동코드 전체자료.txt): 법정동코드, 법정동명, 폐지여부
+    - 엑셀 (.xlsx): 같은 컬럼 순서의 첫 번째 시트
+
+    Yields:
+        (법정동코드, 법정동명, 폐지여부)
+    """
+    if filename.lower().endswith(('.xlsx', '.xlsm')):
+        from openpyxl import load_workbook
+
+        wb = load_workbook(filename, read_only=True)
+        try:
+            rows = wb.worksheets[0].iter_rows(values_only=True)
+            next(rows, None)  # 헤더
+            for row in rows:
+                if row and row[0]:
+                    yield str(row[0]).strip(), str(row[1] or '').strip(), str(row[2] or '').strip()
+        finally:
+            wb.close()
+        return
+
+    with open(filename, encoding=_detect_encoding(filename), newline='') as f:
+        reader = csv.reader(f, delimiter='\t')
+        next(reader, None)  # 헤더
+        for row in reader:
+            if len(row) >= 3 and row[0].strip():
+                yield row[0].strip(), row[1].strip(), row[2].strip()
+
+
+def iter_active_bjdong_records(
+    filename: str,
+    base_names: Optional[Dict[str, Tuple[str, str]]] = None
+) -> Iterator[Tuple[str, str, str, str]]:
+    """
+    폐지되지 않은 읍면동/리 단계 법정동 코드만 골라 (코드, 시도, 시군구, 읍면동) 으로 변환
+
+    원본은 코드 순으로 정렬되어 있어 시도/시군구 행이 하위 읍면동보다 먼저 나오므로,
+    상위 이름만 기억하면서 한 번의 순회로 처리합니다.
+
+    Args:
+        filename: 법정동코드 전체자료 경로
+        base_names: {시군구코드: (시도, 시군구)} - 있으면 시군구 이름을 이 값으로 맞춤
+    """
+    base_names = base_names or {}
+    sido_names: Dict[str, str] = {}
+    sigungu_names: Dict[str, str] = {}
+
+    for code, name, status in iter_full_bjdong_rows(filename):
+        if len(code) != 10 or status != '존재':
+            continue
+
+        if code[2:] == '00000000':
+            sido_names[code[:2]] = name
+            continue
+        if code[5:] == '00000':
+            sigungu_names[code[:5]] = name
+            continue
+
+        sido = sido_names.get(code[:2], name.split(' ')[0])
+        prefix = sigungu_names.get(code[:5], sido)
+        eupmyeondong = name[len(prefix):].strip() if name.startswith(prefix) else name.split(' ')[-1]
+
+        if code[:5] in base_names:
+            sido, sigungu = base_names[code[:5]]
+        else:
+            sigungu = prefix[len(sido):].strip() or sido
+
+        yield code, sido, sigungu, eupmyeondong
+
+
+def build_full_bjdong_codes(source: str,
+                            base_csv: str = "bjdong_codes.csv",
+                            output: str = FULL_BJDONG_CSV) -> int:
+    """
+    법정동코드 전체자료로 시군구 + 읍면동 통합 코드 파일 생성
+
+    시군구 행은 base_csv(구 단위로 세분화된 조회용 코드)를 그대로 쓰고,
+    그 아래에 원본의 현존 읍면동/리 코드를 붙입니다. 결과 CSV 옆에는
+    RegionIndex 스냅샷(.idx)도 함께 만들어 대시보드가 바로 읽을 수 있게 합니다.
+
+    Returns:
+        int: 기록한 읍면동/리 코드 수
+    """
+    base = load_bjdong_codes_from_csv(base_csv)
+    base['법정동코드'] = base['법정동코드'].astype(str)
+    base_names = {
+        row.법정동코드: (row.시도, row.시군구)
+        for row in base.itertuples(index=False)
+    }
+
+    count = 0
+    tmp = output + '.tmp'
+    with open(tmp, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['시도', '시군구', '읍면동', '법정동코드'])
+        for code, (sido, sigungu) in base_names.items():
+            writer.writerow([sido, sigungu, '', code])
+        for code, sido, sigungu, eupmyeondong in iter_active_bjdong_records(source, base_names):
+            writer.writerow([sido, sigungu, eupmyeondong, code])
+            count += 1
+    os.replace(tmp, output)
+
+    RegionIndex.load(output)  # 스냅샷 생성
+    print(f"✅ {len(base_names)}개 시군구, {count:,}개 읍면동/리 코드를 {output}에 저장했습니다.")
+
+    return count
+
+
+def fetch_bjdong_from_gov_api(source: Optional[str] = None) -> pd.DataFrame:
+    """
+    정부 제공 법정동 코드 조회
     
     참고: 행정안전부는 법정동 코드 조회 API를 제공하지만,
-    일반적으로 엑셀 파일 다운로드를 권장합니다.
+    일반적으로 엑셀/텍스트 파일 다운로드를 권장합니다.
+    
+    Args:
+        source: 다운로드한 법정동코드 전체자료 경로. 주면 현존 읍면동 코드까지 반환
     """
-    # 이 함수는 예시이며, 실제 API는 별도 인증이 필요할 수 있습니다.
-    print("⚠️  정부 API는 직접 다운로드를 권장합니다.")
-    print("   https://www.code.go.kr/stdcode/regCodeL.do")
+    if source is None:
+        print("⚠️  정부 API는 직접 다운로드를 권장합니다.")
+        print("   https://www.code.go.kr/stdcode/regCodeL.do")
+        return create_comprehensive_bjdong_codes()
     
-    return create_comprehensive_bjdong_codes()
+    return pd.DataFrame(
+        list(iter_active_bjdong_records(source)),
+        columns=['법정동코드', '시도', '시군구', '읍면동']
+    )
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="법정동 코드 데이터 생성")
+    parser.add_argument(
+        "--full",
+        metavar="PATH",
+        help="행정안전부 법정동코드 전체자료(.txt/.xlsx)로 읍면동 코드 파일 생성"
+    )
+    args = parser.parse_args()
+    
+    if args.full:
+        build_full_bjdong_codes(args.full)
+        raise SystemExit(0)
+    
     # CSV 파일 생성
     df = save_bjdong_codes_to_csv("bjdong_codes.csv")
     
@@ -0,0 +1,100 @@
+"""
+전국 전세가율 표 생성 (야간 배치)
+
+저장소(realestate_core.store)의 아파트 매매·전월세 파티션으로 시군구마다
+단지·면적대별 전세가율을 계산해 하나의 Parquet 파일로 저장합니다.
+조인 키에 법정동 코드가 들어 있어 시군구 단위로 나눠 계산해도 결과가 같고,
+메모리에는 시군구 하나의 거래만 올라갑니다.
+
+실행:
+    python build_jeonse_ratio.py --months 6 --out data/jeonse_ratio.parquet
+    python build_jeonse_ratio.py --fetch --lawd-cd 11680 --lawd-cd 11650
+
+--fetch 를 주면 저장소에 없는 파티션을 백필 우선순위로 받아 채웁니다
+(대시보드 몫의 API 한도는 남겨 둠).
+"""
+
+import argparse
+import logging
+import os
+import time
+from typing import List, Optional
+
+import pandas as pd
+
+from realestate_core import config
+from realestate_core.jeonse import WINDOW_MONTHS, jeonse_ratio_table
+from realestate_core.molit import MolitAPIError, recent_deal_months
+from realestate_core.quota import Priority, QuotaExceeded, fetch_priority
+from realestate_core.store import TransactionStore
+
+logger = logging.getLogger("jeonse_ratio")
+
+DEFAULT_OUT = os.path.join(config.PROJECT_DIR, "data", "jeonse_ratio.parquet")
+
+
+def build_ratio_table(trade_store: TransactionStore, rent_store: TransactionStore,
+                      start: str, end: str, lawd_cds: Optional[List[str]] = None,
+                      fetch_missing: bool = False,
+                      rent_start: Optional[str] = None) -> pd.DataFrame:
+    """
+    시군구별 전세가율 표를 이어 붙인 전국 표 (lawd_cd 컬럼 추가)
+
+    Args:
+        lawd_cds: 계산할 시군구 (기본: 매매 저장소에 있는 모든 시군구)
+        rent_start: 전월세 조회 시작 월 (기본: start)
+    """
+    if lawd_cds is None:
+        lawd_cds = sorted({key.lawd_cd for key in trade_store.partitions()})
+
+    frames = []
+    for lawd_cd in lawd_cds:
+        try:
+            with fetch_priority(Priority.BACKFILL):
+                trades = trade_store.load_range(lawd_cd, start, end, fetch_missing)
+                rents = rent_store.load_range(lawd_cd, rent_start or start, end, fetch_missing)
+        except (MolitAPIError, QuotaExceeded) as e:
+            logger.warning("%s 건너뜀: %s", lawd_cd, e)
+            continue
+
+        table = jeonse_ratio_table(trades, rents)
+        if not table.empty:
+            frames.append(table.assign(lawd_cd=lawd_cd))
+        logger.info("%s: 매매 %d건, 전월세 %d건 -> %d개 단지·면적대",
+                    lawd_cd, len(trades), len(rents), len(table))
+
+    if not frames:
+        return pd.DataFrame()
+    out = pd.concat(frames, ignore_index=True)
+    for col in ('lawd_cd', 'bjdong_cd', 'dong', 'apt'):
+        out[col] = out[col].astype(str).astype('category')
+    return out
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="전국 단지·면적대별 전세가율 표 생성")
+    parser.add_argument("--store", help="저장소 경로 (기본: data/store 또는 REALESTATE_STORE_DIR)")
+    parser.add_argument("--out", default=DEFAULT_OUT, help="결과 Parquet 경로")
+    parser.add_argument("--months", type=int, default=6, help="최근 N개월 (기본 6)")
+    parser.add_argument("--lawd-cd", action="append", dest="lawd_cds",
+                        help="시군구 코드 (여러 번 지정 가능, 기본: 저장소의 모든 시군구)")
+    parser.add_argument("--fetch", action="store_true", help="없는 파티션을 API 로 받아 채움")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+
+    # 기간 앞쪽 매매에도 전세가 붙도록 전월세는 window 만큼 더 거슬러 받음
+    deal_months = recent_deal_months(args.months + WINDOW_MONTHS)
+    start, end = deal_months[args.months - 1], deal_months[0]
+    rent_start = deal_months[-1]
+
+    root = args.store or TransactionStore().root
+    trade_store = TransactionStore(root, 'apt_trade')
+    rent_store = TransactionStore(root, 'apt_rent')
+
+    began = time.perf_counter()
+    table = build_ratio_table(trade_store, rent_store, start, end, args.lawd_cds,
+                              args.fetch, rent_start)
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    table.to_parquet(args.out, index=False, compression='zstd')
+    print(f"✅ {len(table):,}개 단지·면적대 -> {args.out} ({time.perf_counter() - began:.1f}s)")
@@ -0,0 +1,81 @@
+"""
+전국 시세 집계 (야간 배치)
+
+저장소(realestate_core.store)의 매매 파티션으로 월별 전국 시세, 시군구 x 월,
+동별 평균 순위, 평수대별 집계를 만들어 Parquet 파일로 저장합니다.
+파티션마다 부분 집계를 프로세스 풀에서 계산하므로 코어 수만큼 빨라집니다
+(realestate_core.rollup 참고).
+
+실행:
+    python build_national_rollup.py --months 12 --out data/rollup
+    python build_national_rollup.py --workers 8 --lawd-cd 11680 --lawd-cd 11650 --fetch
+
+결과 (--out 디렉터리):
+    monthly.parquet, districts.parquet, dongs.parquet, py_bands.parquet
+
+--fetch 를 주면 저장소에 없는 파티션을 백필 우선순위로 먼저 받아 채웁니다
+(대시보드 몫의 API 한도는 남겨 둠). 집계 자체는 API 를 호출하지 않습니다.
+"""
+
+import argparse
+import logging
+import os
+import time
+from typing import List
+
+from realestate_core import config
+from realestate_core.datasets import DATASETS
+from realestate_core.molit import MolitAPIError, recent_deal_months
+from realestate_core.quota import Priority, QuotaExceeded, fetch_priority
+from realestate_core.rollup import national_rollup
+from realestate_core.store import TransactionStore, month_range
+
+logger = logging.getLogger("national_rollup")
+
+DEFAULT_OUT = os.path.join(config.PROJECT_DIR, "data", "rollup")
+
+
+def fill_partitions(store: TransactionStore, lawd_cds: List[str], start: str, end: str):
+    """범위에서 없거나 오래된 파티션을 받아 채움 (한도에 걸린 시군구는 건너뜀)"""
+    with fetch_priority(Priority.BACKFILL):
+        for lawd_cd in lawd_cds:
+            try:
+                for deal_ymd in month_range(start, end):
+                    if not store.is_fresh(lawd_cd, deal_ymd):
+                        store.sync_partition(lawd_cd, deal_ymd)
+            except (MolitAPIError, QuotaExceeded) as e:
+                logger.warning("%s 채우기 중단: %s", lawd_cd, e)
+
+
+if __name__ == "__main__":
+    trade_datasets = [name for name, ds in DATASETS.items() if 'price' in ds.fields]
+
+    parser = argparse.ArgumentParser(description="전국 시세 집계 (파티션 병렬)")
+    parser.add_argument("--store", help="저장소 경로 (기본: data/store 또는 REALESTATE_STORE_DIR)")
+    parser.add_argument("--dataset", default="apt_trade", choices=trade_datasets)
+    parser.add_argument("--out", default=DEFAULT_OUT, help="결과 디렉터리")
+    parser.add_argument("--months", type=int, default=12, help="최근 N개월 (기본 12)")
+    parser.add_argument("--lawd-cd", action="append", dest="lawd_cds",
+                        help="시군구 코드 (여러 번 지정 가능, 기본: 저장소의 모든 시군구)")
+    parser.add_argument("--workers", type=int, help="작업자 프로세스 수 (기본: CPU 수)")
+    parser.add_argument("--fetch", action="store_true", help="없는 파티션을 API 로 받아 채움")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+
+    deal_months = recent_deal_months(args.months)
+    start, end = deal_months[-1], deal_months[0]
+    store = TransactionStore(args.store or TransactionStore().root, args.dataset)
+
+    began = time.perf_counter()
+    if args.fetch:
+        lawd_cds = args.lawd_cds or sorted({key.lawd_cd for key in store.partitions()})
+        fill_partitions(store, lawd_cds, start, end)
+
+    result = national_rollup(store, start, end, args.lawd_cds, args.workers)
+    os.makedirs(args.out, exist_ok=True)
+    for name, frame in result._asdict().items():
+        frame.to_parquet(os.path.join(args.out, f"{name}.parquet"), index=False, compression='zstd')
+    total = int(result.monthly['count'].sum()) if not result.monthly.empty else 0
+    print(f"✅ {total:,}건, 시군구·월 {len(result.districts):,}개 -> {args.out} "
+          f"({time.perf_counter() - began:.1f}s)")
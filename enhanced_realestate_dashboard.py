@@ -1,19 +1,65 @@
+import time
+
+_SCRIPT_START = time.perf_counter()
+
 import streamlit as st
-from dotenv import load_dotenv
 import os
-import requests
-import folium
-from streamlit_folium import st_folium
-import xml.etree.ElementTree as ET
+import numpy as np
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from datetime import datetime, timedelta
-import time
-from typing import Dict, List, Tuple, Optional
-import json
-from bs4 import BeautifulSoup
-import re
+from datetime import datetime
+from typing import Tuple, Optional
+
+from realestate_core import config
+from realestate_core.cache import default_cache
+from realestate_core.importtime import IMPORT_TIMES, lazy_import, measure_import_times
+from realestate_core.molit import (
+    fetch_apt_trade_data, fetch_multi_month_data, fetch_dataset_months, data_freshness,
+    recent_deal_months, MolitAPIError
+)
+from realestate_core.geocode import brokers_in_bbox, get_coords, places_near, summarize_complexes
+from realestate_core.jeonse import attach_ratio, jeonse_ratio_table
+from realestate_core.quota import QuotaExceeded, default_scheduler
+from realestate_core.tracing import breakdown, span, trace
+from realestate_core.transforms import (
+    add_pyeong, filter_by_bjdong, format_price_to_uk, price_quartiles
+)
+from realestate_core.transaction_index import TransactionIndex, TransactionView, SORT_OPTIONS
+from realestate_core.transaction_export import EXPORT_FORMATS, export_bytes
+from realestate_core.transaction_schema import memory_usage_report
+from realestate_core.region_index import RegionIndex
+from realestate_core.store import TransactionStore
+from realestate_core.figures import (
+    MAP_ZOOM_START, SCATTER_MAX_POINTS, build_marker_layers, build_price_map, price_area_figure
+)
+from realestate_core.stats import summarize_transactions
+from realestate_core.viewport import ComplexLayer, Viewport
+from realestate_core.warmup import AccessStats
+from realestate_core.watch import JsonLinesSink, Watch, Watchlist, WatchPoller, read_alerts
+from bjdong_code_generator import save_bjdong_codes_to_csv
+
+# 최상위 import 에 걸린 시간 (프로세스 첫 실행 기준, 이후 재실행은 캐시된 모듈 사용)
+IMPORT_TIMES.setdefault('<dashboard top-level>', (time.perf_counter() - _SCRIPT_START) * 1000)
+
+# 탭/렌더러에서 지연 import 하는 무거운 모듈
+HEAVY_MODULES = ['folium', 'streamlit_folium', 'plotly.express', 'plotly.graph_objects',
+                 'realestate_core.sql']
+
+# 가격 지도: 실행마다 좌표를 변환할 최대 단지 수 (나머지는 지도를 움직일 때 이어서)
+MAP_GEOCODE_BATCH = 100
+MAP_HEIGHT = 600
+BROKER_MIN_ZOOM = 15  # 이보다 멀면 중개업소 타일이 너무 많아 표시하지 않음
+
+# SQL 조회 탭
+QUERY_MAX_ROWS = 10_000
+DEFAULT_QUERY = """SELECT deal_ymd, dong, count(*) AS trades, median(price) AS median_price
+FROM apt_trade
+WHERE lawd_cd = '{lawd_cd}'
+GROUP BY ALL
+ORDER BY deal_ymd DESC, trades DESC"""
+
+# 감시 목록: 새 세션에서는 이 시간(초) 안의 알림을 새 알림으로 표시
+ALERT_UNREAD_WINDOW = 24 * 3600
+ALERT_SHOW_LIMIT = 100
 
 # ==================== 설정 ====================
 st.set_page_config(
@@ -22,277 +68,88 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# 환경 변수 로드
-load_dotenv()
-KAKAO_REST_KEY = os.getenv("JHRERSTAPI")
-VWORLD_API_KEY = os.getenv("V_World_API")
-MOLIT_API_KEY = os.getenv("DATAPORTAL")
-
 # ==================== 법정동 코드 자동 로드 ====================
 
-@st.cache_data
-def load_bjdong_codes() -> pd.DataFrame:
+@st.cache_resource
+def load_region_index() -> RegionIndex:
     """
-    법정동 코드 CSV 로드 (행정안전부 제공)
-    CSV가 없으면 샘플 데이터 반환
+    법정동 코드 인덱스 로드 (프로세스당 한 번)
+    CSV가 없으면 bjdong_code_generator로 생성
     """
-    # 실무에서는 행정안전부 법정동 코드 전체 CSV를 다운로드하여 사용
+    # 읍면동 단위 조회는 행정안전부 법정동코드 전체자료로 만든 통합 파일 필요
+    # python bjdong_code_generator.py --full 법정동코드_전체자료.txt
     # https://www.code.go.kr/stdcode/regCodeL.do
+    if os.path.exists(config.FULL_BJDONG_CSV):
+        return RegionIndex.load(config.FULL_BJDONG_CSV)
     
-    sample_data = [
-        # 서울
-        ("서울특별시", "강남구", "11680"),
-        ("서울특별시", "강동구", "11740"),
-        ("서울특별시", "강북구", "11305"),
-        ("서울특별시", "강서구", "11500"),
-        ("서울특별시", "관악구", "11620"),
-        ("서울특별시", "광진구", "11215"),
-        ("서울특별시", "구로구", "11530"),
-        ("서울특별시", "금천구", "11545"),
-        ("서울특별시", "노원구", "11350"),
-        ("서울특별시", "도봉구", "11320"),
-        ("서울특별시", "동대문구", "11230"),
-        ("서울특별시", "동작구", "11590"),
-        ("서울특별시", "마포구", "11440"),
-        ("서울특별시", "서대문구", "11410"),
-        ("서울특별시", "서초구", "11650"),
-        ("서울특별시", "성동구", "11200"),
-        ("서울특별시", "성북구", "11290"),
-        ("서울특별시", "송파구", "11710"),
-        ("서울특별시", "양천구", "11470"),
-        ("서울특별시", "영등포구", "11560"),
-        ("서울특별시", "용산구", "11170"),
-        ("서울특별시", "은평구", "11380"),
-        ("서울특별시", "종로구", "11110"),
-        ("서울특별시", "중구", "11140"),
-        ("서울특별시", "중랑구", "11260"),
-        
-        # 경기도 (구가 있는 시는 구별로 분리)
-        ("경기도", "수원시 장안구", "41111"),
-        ("경기도", "수원시 권선구", "41113"),
-        ("경기도", "수원시 팔달구", "41115"),
-        ("경기도", "수원시 영통구", "41117"),
-        ("경기도", "성남시 수정구", "41131"),
-        ("경기도", "성남시 중원구", "41133"),
-        ("경기도", "성남시 분당구", "41135"),
-        ("경기도", "안양시 만안구", "41171"),
-        ("경기도", "안양시 동안구", "41173"),
-        ("경기도", "용인시 처인구", "41461"),
-        ("경기도", "용인시 기흥구", "41463"),
-        ("경기도", "용인시 수지구", "41465"),
-        ("경기도", "고양시 덕양구", "41281"),
-        ("경기도", "고양시 일산동구", "41285"),
-        ("경기도", "고양시 일산서구", "41287"),
-        ("경기도", "안산시 상록구", "41271"),
-        ("경기도", "안산시 단원구", "41273"),
-        ("경기도", "부천시", "41190"),
-        ("경기도", "광명시", "41210"),
-        ("경기도", "평택시", "41220"),
-        ("경기도", "과천시", "41290"),
-        ("경기도", "오산시", "41370"),
-        ("경기도", "시흥시", "41390"),
-        ("경기도", "군포시", "41410"),
-        ("경기도", "의왕시", "41430"),
-        ("경기도", "하남시", "41450"),
-        ("경기도", "김포시", "41570"),
-        ("경기도", "화성시", "41590"),
-        ("경기도", "광주시", "41610"),
-        ("경기도", "양주시", "41630"),
-        ("경기도", "포천시", "41650"),
-        ("경기도", "여주시", "41670"),
-        ("경기도", "남양주시", "41360"),
-        ("경기도", "의정부시", "41150"),
-        ("경기도", "이천시", "41500"),
-        ("경기도", "파주시", "41480"),
-        
-        # 인천
-        ("인천광역시", "중구", "28110"),
-        ("인천광역시", "동구", "28140"),
-        ("인천광역시", "미추홀구", "28177"),
-        ("인천광역시", "연수구", "28185"),
-        ("인천광역시", "남동구", "28200"),
-        ("인천광역시", "부평구", "28237"),
-        ("인천광역시", "계양구", "28245"),
-        ("인천광역시", "서구", "28260"),
-        
-        # 부산
-        ("부산광역시", "중구", "26110"),
-        ("부산광역시", "서구", "26140"),
-        ("부산광역시", "동구", "26170"),
-        ("부산광역시", "영도구", "26200"),
-        ("부산광역시", "부산진구", "26230"),
-        ("부산광역시", "동래구", "26260"),
-        ("부산광역시", "남구", "26290"),
-        ("부산광역시", "북구", "26320"),
-        ("부산광역시", "해운대구", "26350"),
-        ("부산광역시", "사하구", "26380"),
-        ("부산광역시", "금정구", "26410"),
-        ("부산광역시", "강서구", "26440"),
-        ("부산광역시", "연제구", "26470"),
-        ("부산광역시", "수영구", "26500"),
-        ("부산광역시", "사상구", "26530"),
-        
-        # 대구
-        ("대구광역시", "중구", "27110"),
-        ("대구광역시", "동구", "27140"),
-        ("대구광역시", "서구", "27170"),
-        ("대구광역시", "남구", "27200"),
-        ("대구광역시", "북구", "27230"),
-        ("대구광역시", "수성구", "27260"),
-        ("대구광역시", "달서구", "27290"),
-        ("대구광역시", "달성군", "27710"),
-        
-        # 대전
-        ("대전광역시", "동구", "30110"),
-        ("대전광역시", "중구", "30140"),
-        ("대전광역시", "서구", "30170"),
-        ("대전광역시", "유성구", "30200"),
-        ("대전광역시", "대덕구", "30230"),
-        
-        # 광주
-        ("광주광역시", "동구", "29110"),
-        ("광주광역시", "서구", "29140"),
-        ("광주광역시", "남구", "29155"),
-        ("광주광역시", "북구", "29170"),
-        ("광주광역시", "광산구", "29200"),
-        
-        # 울산
-        ("울산광역시", "중구", "31110"),
-        ("울산광역시", "남구", "31140"),
-        ("울산광역시", "동구", "31170"),
-        ("울산광역시", "북구", "31200"),
-        ("울산광역시", "울주군", "31710"),
-        
-        # 세종
-        ("세종특별자치시", "세종시", "36110"),
-    ]
-    
-    df = pd.DataFrame(sample_data, columns=['시도', '시군구', '법정동코드'])
-    return df
-
-# ==================== 좌표 변환 ====================
-
-@st.cache_data(ttl=3600)
-def get_coords_vworld(address: str) -> Tuple[Optional[float], Optional[float]]:
-    """VWorld API를 사용한 주소 -> 좌표 변환"""
-    if not VWORLD_API_KEY:
-        return None, None
-    
-    url = 'https://api.vworld.kr/req/address'
-    params = {
-        'service': 'address',
-        'request': 'getCoord',
-        'key': VWORLD_API_KEY,
-        'type': 'PARCEL',
-        'address': address
-    }
-    
-    try:
-        res = requests.get(url, params=params, timeout=5)
-        data = res.json()
-        if data['response']['status'] == 'OK':
-            point = data['response']['result']['point']
-            return float(point['y']), float(point['x'])
-    except Exception as e:
-        st.warning(f"좌표 변환 실패: {address} - {str(e)}")
-    
-    return None, None
-
-@st.cache_data(ttl=3600)
-def get_coords_kakao(address: str) -> Tuple[Optional[float], Optional[float]]:
-    """Kakao API를 사용한 주소 -> 좌표 변환 (대안)"""
-    if not KAKAO_REST_KEY:
-        return None, None
-    
-    url = "https://dapi.kakao.com/v2/local/search/address.json"
-    headers = {"Authorization": f"KakaoAK {KAKAO_REST_KEY}"}
-    params = {"query": address}
-    
-    try:
-        res = requests.get(url, headers=headers, params=params, timeout=5)
-        data = res.json()
-        if data['documents']:
-            return float(data['documents'][0]['y']), float(data['documents'][0]['x'])
-    except Exception as e:
-        st.warning(f"카카오 좌표 변환 실패: {address}")
+    if not os.path.exists(config.BJDONG_CSV):
+        save_bjdong_codes_to_csv(config.BJDONG_CSV)
     
-    return None, None
+    return RegionIndex.load(config.BJDONG_CSV)
 
 # ==================== 국토부 실거래 데이터 ====================
 
-@st.cache_data(ttl=600)
-def fetch_apt_trade_data(lawd_cd: str, deal_ymd: str) -> pd.DataFrame:
-    """국토부 아파트 실거래가 조회"""
-    url = "https://apis.data.go.kr/1613000/RTMSDataSvcAptTrade/getRTMSDataSvcAptTrade"
-    params = {
-        'serviceKey': MOLIT_API_KEY,
-        'LAWD_CD': lawd_cd,
-        'DEAL_YMD': deal_ymd,
-        'numOfRows': '1000'
-    }
-    
-    try:
-        res = requests.get(url, params=params, timeout=10)
-        root = ET.fromstring(res.content)
-        
-        items = []
-        for item in root.findall('.//item'):
-            try:
-                items.append({
-                    'apt': item.findtext('aptNm', '').strip(),
-                    'price': int(item.findtext('dealAmount', '0').replace(',', '')),
-                    'dong': item.findtext('umdNm', '').strip(),
-                    'jibun': item.findtext('jibun', '').strip(),
-                    'area': float(item.findtext('excluUseAr', '0')),
-                    'floor': item.findtext('floor', ''),
-                    'year': item.findtext('dealYear', ''),
-                    'month': item.findtext('dealMonth', ''),
-                    'day': item.findtext('dealDay', ''),
-                    'build_year': item.findtext('buildYear', ''),
-                })
-            except Exception as e:
-                continue
-        
-        if items:
-            df = pd.DataFrame(items)
-            df['date'] = pd.to_datetime(df['year'] + '-' + df['month'] + '-' + df['day'])
-            return df
-        
-    except Exception as e:
-        st.error(f"데이터 조회 실패: {str(e)}")
-    
-    return pd.DataFrame()
-
-@st.cache_data(ttl=600)
-def fetch_multi_month_data(lawd_cd: str, months: int = 6) -> pd.DataFrame:
-    """최근 N개월 데이터 조회"""
-    all_data = []
-    current_date = datetime.now()
-    
+def load_trade_data(lawd_cd: str, months: int) -> pd.DataFrame:
+    """최근 N개월 데이터 조회 (진행 상황 표시)"""
     progress_bar = st.progress(0)
     status_text = st.empty()
     
-    for i in range(months):
-        target_date = current_date - timedelta(days=30 * i)
-        deal_ymd = target_date.strftime("%Y%m")
-        
-        status_text.text(f"📥 {deal_ymd} 데이터 로딩 중...")
-        df = fetch_apt_trade_data(lawd_cd, deal_ymd)
-        
-        if not df.empty:
-            all_data.append(df)
-        
-        progress_bar.progress((i + 1) / months)
-        time.sleep(0.3)  # API 호출 제한 고려
+    def on_progress(done: int, total: int, message: str):
+        progress_bar.progress(done / total)
+        status_text.text(message)
     
-    progress_bar.empty()
-    status_text.empty()
+    try:
+        if months == 1:
+            current_month = datetime.now().strftime("%Y%m")
+            return fetch_apt_trade_data(lawd_cd, current_month)
+        return fetch_multi_month_data(lawd_cd, months, progress=on_progress)
+    except MolitAPIError as e:
+        st.error(f"데이터 조회 실패: {str(e)}")
+        return pd.DataFrame()
+    except QuotaExceeded as e:
+        st.error(f"API 일일 호출 한도에 도달했습니다: {str(e)}")
+        return pd.DataFrame()
+    finally:
+        progress_bar.empty()
+        status_text.empty()
+
+def load_rent_data(lawd_cd: str, months: int) -> pd.DataFrame:
+    """최근 N개월 아파트 전월세 조회 (전세가율 계산용, 실패해도 매매 화면은 유지)"""
+    try:
+        return fetch_dataset_months('apt_rent', lawd_cd, months)
+    except (MolitAPIError, QuotaExceeded) as e:
+        st.warning(f"전월세 데이터를 불러오지 못해 전세가율을 표시하지 않습니다: {str(e)}")
+        return pd.DataFrame()
+
+@st.cache_resource(ttl=600)
+def get_jeonse_table(lawd_cd: str, bjdong_cd: Optional[str], months: int, version: tuple,
+                     _trades: pd.DataFrame, _rents: pd.DataFrame) -> pd.DataFrame:
+    """단지·면적대별 전세가율 (조회 조건·캐시 버전별로 한 번만 계산)"""
+    return jeonse_ratio_table(_trades, _rents)
+
+@st.fragment(run_every="5s")
+def render_freshness(lawd_cd: str, months: int, version: tuple):
+    """
+    데이터 신선도 표시
+
+    만료된 캐시로 화면을 먼저 그리고 백그라운드에서 갱신하므로, 갱신이 끝나
+    캐시 버전이 바뀌면 앱을 다시 실행해 새 데이터로 교체합니다.
+    """
+    freshness = data_freshness(lawd_cd, months)
+    if freshness.version != version and not freshness.refreshing:
+        st.rerun(scope="app")
+    if freshness.oldest is None:
+        return
     
-    if all_data:
-        return pd.concat(all_data, ignore_index=True)
-    return pd.DataFrame()
+    age_min = int((time.time() - freshness.oldest) // 60)
+    if freshness.refreshing:
+        st.caption(f"🟡 {age_min}분 전 데이터 · 최신 데이터를 받는 중입니다 (완료되면 자동 반영)")
+    elif age_min < 10:
+        st.caption(f"🟢 최신 데이터 ({age_min}분 전 조회)")
+    else:
+        st.caption(f"🟠 {age_min}분 전 데이터")
 
-# ==================== 네이버/카카오 부동산 데이터 수집 ====================
+# ==================== 네이버 부동산 데이터 수집 ====================
 
 def fetch_naver_listings(region: str) -> pd.DataFrame:
     """
@@ -332,95 +189,33 @@ def fetch_naver_listings(region: str) -> pd.DataFrame:
     # 샘플 반환 (실제 구현 필요)
     return pd.DataFrame()
 
-def fetch_kakao_property_info(lat: float, lon: float, radius: int = 500) -> Dict:
-    """
-    카카오 지도 API로 주변 부동산 정보 조회
-    
-    카카오는 장소 검색 API를 제공하지만, 매물 정보는 제공하지 않습니다.
-    대신 주변 부동산 중개업소 정보를 가져올 수 있습니다.
-    """
-    if not KAKAO_REST_KEY:
-        return {}
-    
-    url = "https://dapi.kakao.com/v2/local/search/keyword.json"
-    headers = {"Authorization": f"KakaoAK {KAKAO_REST_KEY}"}
-    params = {
-        "query": "부동산",
-        "x": lon,
-        "y": lat,
-        "radius": radius,
-        "size": 15
-    }
-    
-    try:
-        res = requests.get(url, headers=headers, params=params, timeout=5)
-        return res.json()
-    except:
-        return {}
-
-# ==================== 데이터 가공 ====================
-
-def calc_pyeong(m2: float) -> float:
-    """제곱미터를 평수로 변환"""
-    try:
-        return round(float(m2) / 3.3058, 1)
-    except:
-        return 0
-
-def format_price_to_uk(price: int) -> str:
-    """만원 단위를 억/천 단위로 변환"""
-    try:
-        uk = price // 10000
-        man = price % 10000
-        
-        if uk > 0:
-            if man > 0:
-                return f"{uk}.{man//100:02d}억"
-            return f"{uk}억"
-        return f"{price}만"
-    except:
-        return str(price)
-
-def get_price_color(price: int, df: pd.DataFrame) -> str:
-    """가격대별 색상 반환 (카카오 스타일)"""
-    if df.empty:
-        return "#258fff"
-    
-    q1 = df['price'].quantile(0.25)
-    q2 = df['price'].quantile(0.50)
-    q3 = df['price'].quantile(0.75)
-    
-    if price <= q1:
-        return "#4CAF50"  # 저가 - 녹색
-    elif price <= q2:
-        return "#2196F3"  # 중저가 - 파란색
-    elif price <= q3:
-        return "#FF9800"  # 중고가 - 주황색
-    else:
-        return "#F44336"  # 고가 - 빨간색
-
 # ==================== UI 구성 ====================
 
-def render_sidebar() -> Tuple[str, str]:
+def render_sidebar() -> Tuple[str, str, str, Optional[str], int, bool]:
     """사이드바 렌더링"""
     st.sidebar.title("🌍 지역 선택")
     
-    # 법정동 코드 로드
-    bjdong_df = load_bjdong_codes()
+    # 법정동 코드 인덱스
+    regions = load_region_index()
     
     # 시도 선택
-    sido_list = bjdong_df['시도'].unique().tolist()
-    selected_sido = st.sidebar.selectbox("시·도", sido_list, index=0)
+    selected_sido = st.sidebar.selectbox("시·도", regions.sido_list(), index=0)
     
     # 시군구 선택
-    sigungu_list = bjdong_df[bjdong_df['시도'] == selected_sido]['시군구'].tolist()
-    selected_sigungu = st.sidebar.selectbox("시·군·구", sigungu_list, index=0)
+    selected_sigungu = st.sidebar.selectbox(
+        "시·군·구", regions.sigungu_list(selected_sido), index=0
+    )
     
     # 법정동 코드 추출
-    lawd_cd = bjdong_df[
-        (bjdong_df['시도'] == selected_sido) & 
-        (bjdong_df['시군구'] == selected_sigungu)
-    ]['법정동코드'].iloc[0]
+    lawd_cd = regions.lawd_cd(selected_sido, selected_sigungu)
+    
+    # 읍면동 선택 (통합 법정동 코드 파일이 있을 때만)
+    bjdong_cd = None
+    eupmyeondong_list = regions.eupmyeondong_list(lawd_cd)
+    if eupmyeondong_list:
+        selected_emd = st.sidebar.selectbox("읍·면·동", ['전체'] + eupmyeondong_list, index=0)
+        if selected_emd != '전체':
+            bjdong_cd = regions.code_of(selected_sido, selected_sigungu, selected_emd)
     
     st.sidebar.divider()
     
@@ -436,134 +231,192 @@ def render_sidebar() -> Tuple[str, str]:
     month_map = {"최근 1개월": 1, "최근 3개월": 3, "최근 6개월": 6}
     months = month_map[data_range]
     
+    with_jeonse = st.sidebar.checkbox(
+        "전세가율 함께 보기", value=False,
+        help="같은 기간 전월세 실거래를 추가로 조회해 단지·면적대별 전세가율을 계산합니다."
+    )
+    
     # 필터 옵션
     st.sidebar.title("🔍 필터")
     
-    return selected_sido, selected_sigungu, lawd_cd, months
+    return selected_sido, selected_sigungu, lawd_cd, bjdong_cd, months, with_jeonse
+
+@st.cache_resource(ttl=600)
+def get_complex_layer(lawd_cd: str, bjdong_cd: Optional[str], months: int, version: tuple,
+                      _df: pd.DataFrame, _jeonse: Optional[pd.DataFrame]) -> ComplexLayer:
+    """지도 단지 레이어 (조회 조건·캐시 버전별로 한 번 만들고, 좌표는 실행마다 이어서 채움)"""
+    complexes = summarize_complexes(_df)
+    if _jeonse is not None and not _jeonse.empty:
+        complexes['ratio'] = (
+            _df.assign(ratio=attach_ratio(_df, _jeonse))
+            .groupby(['dong', 'jibun', 'apt'], observed=True)['ratio'].median()
+            .to_numpy()
+        )
+    return ComplexLayer(complexes)
 
-def render_map_tab(df: pd.DataFrame, sido: str, sigungu: str):
-    """지도 탭 렌더링"""
+def render_map_tab(layer: ComplexLayer, df: pd.DataFrame, sido: str, sigungu: str,
+                   jeonse: Optional[pd.DataFrame] = None):
+    """지도 탭 렌더링 (보이는 범위·줌에 맞는 단지 마커 또는 집계만 그림)"""
     st.subheader("📍 실거래 가격 지도")
     
     if df.empty:
         st.warning("표시할 데이터가 없습니다.")
         return
     
-    # 중심 좌표 계산
-    sample_addr = f"{sido} {sigungu} {df.iloc[0]['dong']} {df.iloc[0]['jibun']}"
-    center_lat, center_lon = get_coords_vworld(sample_addr)
+    st_folium = lazy_import('streamlit_folium').st_folium
     
-    if not center_lat:
-        center_lat, center_lon = get_coords_kakao(sample_addr)
+    # 단지 좌표 변환 (거래 많은 단지부터 실행마다 일부씩, 변환 결과는 디스크 캐시)
+    with span("map.geocode", pending=layer.pending):
+        layer.locate(
+            lambda dong, jibun: get_coords(f"{sido} {sigungu} {dong} {jibun}"),
+            MAP_GEOCODE_BATCH
+        )
     
-    if not center_lat:
+    if layer.home is None:
         st.error("지도 중심 좌표를 찾을 수 없습니다.")
         return
     
-    # Folium 지도 생성
-    m = folium.Map(
-        location=[center_lat, center_lon],
-        zoom_start=14,
-        tiles="cartodbpositron"
-    )
+    col1, col2 = st.columns([3, 1])
+    color_by = "거래가"
+    if jeonse is not None and not jeonse.empty:
+        with col1:
+            color_by = st.radio("마커 색상", ["거래가", "전세가율"], horizontal=True)
+    with col2:
+        show_brokers = st.checkbox("🏢 중개업소 표시", value=False)
+    by_ratio = color_by == "전세가율"
+    
+    # 직전 실행에서 지도가 보고한 범위·줌 (지역이나 범례가 바뀌어 지도를 새로 그리면 무시)
+    map_id = (layer.home, by_ratio)
+    view = None
+    if st.session_state.get("price_map_id") == map_id:
+        view = Viewport.from_folium(st.session_state.get("price_map"))
+    view = view or Viewport.around(*layer.home, MAP_ZOOM_START, height_px=MAP_HEIGHT)
+    st.session_state["price_map_id"] = map_id
+    
+    with span("map.markers", zoom=view.zoom):
+        markers = layer.query(view)
+    
+    brokers = None
+    if show_brokers:
+        if view.zoom >= BROKER_MIN_ZOOM:
+            with span("map.brokers"):
+                # 보이는 범위를 덮는 타일만 조회 (타일은 디스크에 7일간 캐시)
+                brokers = brokers_in_bbox(view.south, view.west, view.north, view.east)
+        else:
+            st.caption("🏢 중개업소는 지도를 더 확대하면 표시됩니다.")
+    
+    with span("map.build", markers=len(markers.frame)):
+        m = build_price_map(layer.home, by_ratio)
+        layers = build_marker_layers(markers, price_quartiles(df), by_ratio, brokers)
+    
+    with span("map.render"):
+        # 기본 지도는 그대로 두고 마커 레이어만 교체 (지도를 움직이면 범위·줌만 돌려받음)
+        st_folium(
+            m, key="price_map", width="100%", height=MAP_HEIGHT,
+            returned_objects=["bounds", "zoom"], feature_group_to_add=layers
+        )
     
-    # 마커 추가 (최대 100개)
-    for idx, row in df.head(100).iterrows():
-        addr = f"{sido} {sigungu} {row['dong']} {row['jibun']}"
-        lat, lon = get_coords_vworld(addr)
+    located = f"좌표 {layer.located:,}/{len(layer.complexes):,}개 단지"
+    if layer.pending:
+        located += " (지도를 움직이면 이어서 변환)"
+    if markers.hidden:
+        located = f"거래 많은 {len(markers.frame):,}개 단지만 표시 (확대하면 나머지 {markers.hidden:,}개) · " + located
+    st.caption(f"{'단지별 마커' if markers.detail else '지역별 집계 (확대하면 단지별)'} · {located}")
+    
+    render_nearby_deals(df, layer.located_frame(), sido, sigungu)
+
+def render_nearby_deals(df: pd.DataFrame, complexes: pd.DataFrame, sido: str, sigungu: str):
+    """선택한 단지 반경 안의 거래 (변환해 둔 좌표의 공간 인덱스로 조회, API 호출 없음)"""
+    # 같은 이름의 단지가 여러 동에 있을 수 있으므로 (동, 지번)까지 붙여 구분
+    located = {
+        f"{apt} ({dong} {jibun})": (lat, lon)
+        for dong, jibun, apt, lat, lon in zip(
+            complexes['dong'], complexes['jibun'], complexes['apt'],
+            complexes['lat'], complexes['lon']
+        )
+    }
+    if not located:
+        return
+    
+    with st.expander("📏 반경 내 거래"):
+        col1, col2 = st.columns(2)
+        with col1:
+            label = st.selectbox("기준 단지", sorted(located))
+        with col2:
+            radius = st.select_slider(
+                "반경", options=[300, 500, 1000, 2000, 3000], value=1000,
+                format_func=lambda m: f"{m:,}m"
+            )
         
-        if not lat:
-            lat, lon = get_coords_kakao(addr)
+        with span("map.nearby"):
+            near = dict(places_near(*located[label], radius))
+            # (동, 지번) 묶음마다 한 번만 주소를 만들어 거리 조회
+            groups = df.groupby(['dong', 'jibun'], observed=True)
+            group_dist = np.array([
+                near.get(f"{sido} {sigungu} {dong} {jibun}", np.nan)
+                for dong, jibun in groups.size().index
+            ])
+            distance = pd.Series(group_dist[groups.ngroup().to_numpy()], index=df.index)
+            hits = df[distance.notna()].assign(distance=distance.dropna())
         
-        if lat:
-            price_display = format_price_to_uk(row['price'])
-            color = get_price_color(row['price'], df)
-            
-            # 카카오 스타일 마커
-            icon_html = f'''
-            <div style="
-                background: {color};
-                color: white;
-                padding: 5px 10px;
-                border-radius: 15px;
-                font-size: 12px;
-                font-weight: bold;
-                border: 2px solid white;
-                box-shadow: 0 2px 6px rgba(0,0,0,0.3);
-                white-space: nowrap;
-            ">
-                {price_display}
-            </div>
-            '''
-            
-            popup_html = f"""
-            <div style="font-family: sans-serif; min-width: 200px;">
-                <h4 style="margin: 0 0 10px 0; color: #333;">{row['apt']}</h4>
-                <table style="width: 100%; font-size: 13px;">
-                    <tr><td><b>거래가</b></td><td>{price_display}</td></tr>
-                    <tr><td><b>면적</b></td><td>{row['py']}평 ({row['area']}㎡)</td></tr>
-                    <tr><td><b>층</b></td><td>{row['floor']}층</td></tr>
-                    <tr><td><b>거래일</b></td><td>{row['date'].strftime('%Y-%m-%d')}</td></tr>
-                    <tr><td><b>건축년도</b></td><td>{row['build_year']}년</td></tr>
-                </table>
-            </div>
-            """
-            
-            folium.Marker(
-                [lat, lon],
-                icon=folium.DivIcon(html=icon_html),
-                popup=folium.Popup(popup_html, max_width=300)
-            ).add_to(m)
-    
-    # 범례 추가
-    legend_html = f'''
-    <div style="
-        position: fixed;
-        bottom: 50px;
-        left: 50px;
-        background: white;
-        padding: 15px;
-        border-radius: 10px;
-        box-shadow: 0 2px 6px rgba(0,0,0,0.3);
-        z-index: 1000;
-        font-size: 13px;
-    ">
-        <h4 style="margin: 0 0 10px 0;">가격대별 색상</h4>
-        <div><span style="color: #4CAF50;">●</span> 하위 25%</div>
-        <div><span style="color: #2196F3;">●</span> 25~50%</div>
-        <div><span style="color: #FF9800;">●</span> 50~75%</div>
-        <div><span style="color: #F44336;">●</span> 상위 25%</div>
-    </div>
-    '''
-    m.get_root().html.add_child(folium.Element(legend_html))
-    
-    st_folium(m, width="100%", height=600)
-
-def render_statistics_tab(df: pd.DataFrame):
-    """통계 탭 렌더링"""
+        if hits.empty:
+            st.info("반경 안에서 좌표를 아는 거래가 없습니다. 지도에 표시된 단지만 조회됩니다.")
+            return
+        
+        hits = hits.sort_values(['distance', 'date'], ascending=[True, False])
+        st.caption(f"{len(hits):,}건 · {hits['apt'].nunique()}개 단지")
+        st.dataframe(
+            pd.DataFrame({
+                '거리': hits['distance'].round().astype(int).map(lambda m: f"{m:,}m"),
+                '아파트': hits['apt'],
+                '동': hits['dong'],
+                '평수': hits['py'],
+                '거래가': hits['price'].map(format_price_to_uk),
+                '거래일': hits['date'].dt.strftime('%Y-%m-%d'),
+            }),
+            use_container_width=True,
+            hide_index=True
+        )
+
+@st.cache_resource(ttl=600)
+def get_price_area_figure(lawd_cd: str, bjdong_cd: Optional[str], months: int, version: tuple,
+                          mode: str, _df: pd.DataFrame) -> dict:
+    """평수별 거래가 분포 그림 스펙 (조회 조건·캐시 버전·방식별로 한 번만 생성, figures.price_area_figure)"""
+    return price_area_figure(_df, mode, SCATTER_MAX_POINTS).to_dict()
+
+def render_statistics_tab(df: pd.DataFrame, cache_key: tuple,
+                          jeonse: Optional[pd.DataFrame] = None):
+    """
+    통계 탭 렌더링
+
+    cache_key 는 (lawd_cd, bjdong_cd, months, version) 으로 그림 스펙 캐시에 씁니다.
+    """
     st.subheader("📊 거래 통계 및 시세 분석")
     
     if df.empty:
         st.warning("표시할 데이터가 없습니다.")
         return
     
+    px = lazy_import('plotly.express')
+    go = lazy_import('plotly.graph_objects')
+    
+    with span("stats.summary"):
+        summary = summarize_transactions(df)
+    
     # 주요 지표
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        st.metric("총 거래 건수", f"{len(df):,}건")
+        st.metric("총 거래 건수", f"{summary['count']:,}건")
     
     with col2:
-        avg_price = df['price'].mean()
-        st.metric("평균 거래가", format_price_to_uk(int(avg_price)))
+        st.metric("평균 거래가", format_price_to_uk(int(summary['avg_price'])))
     
     with col3:
-        median_price = df['price'].median()
-        st.metric("중간 거래가", format_price_to_uk(int(median_price)))
+        st.metric("중간 거래가", format_price_to_uk(int(summary['median_price'])))
     
     with col4:
-        avg_py = df['py'].mean()
-        st.metric("평균 면적", f"{avg_py:.1f}평")
+        st.metric("평균 면적", f"{summary['avg_py']:.1f}평")
     
     st.divider()
     
@@ -571,28 +424,20 @@ def render_statistics_tab(df: pd.DataFrame):
     col1, col2 = st.columns(2)
     
     with col1:
-        # 평수별 가격 분포
-        fig1 = px.scatter(
-            df,
-            x="py",
-            y="price",
-            size="price",
-            color="price",
-            hover_data=["apt", "dong", "floor"],
-            title="평수별 거래가 분포",
-            labels={"py": "면적 (평)", "price": "거래가 (만원)"},
-            color_continuous_scale="Viridis"
-        )
-        fig1.update_layout(height=400)
+        # 평수별 가격 분포 (거래가 많으면 구간 집계 또는 표본만 브라우저로 보냄)
+        mode = "points"
+        if len(df) > SCATTER_MAX_POINTS:
+            choice = st.radio("분포 표시", ["구간 집계", "표본 점"], horizontal=True,
+                              key="price_area_mode")
+            mode = "density" if choice == "구간 집계" else "sample"
+        with span("stats.figure", mode=mode):
+            fig1 = get_price_area_figure(*cache_key, mode, df)
         st.plotly_chart(fig1, use_container_width=True)
     
     with col2:
         # 동별 평균 가격
-        dong_avg = df.groupby('dong')['price'].agg(['mean', 'count']).reset_index()
-        dong_avg = dong_avg.sort_values('mean', ascending=False).head(10)
-        
         fig2 = px.bar(
-            dong_avg,
+            summary['dong_avg'],
             x="dong",
             y="mean",
             title="동별 평균 거래가 (상위 10개)",
@@ -605,12 +450,11 @@ def render_statistics_tab(df: pd.DataFrame):
         st.plotly_chart(fig2, use_container_width=True)
     
     # 시계열 분석
-    if len(df['date'].unique()) > 1:
+    if summary['n_dates'] > 1:
         st.subheader("📈 시세 추이")
         
         # 월별 평균 가격
-        df['year_month'] = df['date'].dt.to_period('M').astype(str)
-        monthly_avg = df.groupby('year_month')['price'].mean().reset_index()
+        monthly_avg = summary['monthly_avg']
         
         fig3 = go.Figure()
         fig3.add_trace(go.Scatter(
@@ -635,13 +479,7 @@ def render_statistics_tab(df: pd.DataFrame):
     # 평수대별 분석
     st.subheader("📐 평수대별 분석")
     
-    df['py_range'] = pd.cut(
-        df['py'],
-        bins=[0, 20, 30, 40, 50, 100],
-        labels=['20평 이하', '20-30평', '30-40평', '40-50평', '50평 이상']
-    )
-    
-    py_stats = df.groupby('py_range')['price'].agg(['mean', 'median', 'count']).reset_index()
+    py_stats = summary['py_stats']
     
     col1, col2 = st.columns(2)
     
@@ -665,12 +503,80 @@ def render_statistics_tab(df: pd.DataFrame):
             title="평수대별 거래 비중"
         )
         st.plotly_chart(fig5, use_container_width=True)
+    
+    if jeonse is not None:
+        render_jeonse_section(jeonse)
+
+def render_jeonse_section(jeonse: pd.DataFrame):
+    """단지·면적대별 전세가율"""
+    st.subheader("🏘 전세가율")
+    
+    if jeonse.empty:
+        st.info("같은 단지·면적대의 전세 거래가 없어 전세가율을 계산할 수 없습니다.")
+        return
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("전세가율 중앙값", f"{jeonse['ratio'].median():.1f}%")
+    with col2:
+        st.metric("평균 갭", format_price_to_uk(int(jeonse['gap'].mean())))
+    with col3:
+        st.metric("전세가율 80% 이상", f"{int((jeonse['ratio'] >= 80).sum()):,}개 단지·면적대")
+    
+    top = jeonse.head(50)
+    st.dataframe(
+        pd.DataFrame({
+            '동': top['dong'],
+            '아파트': top['apt'],
+            '면적대': top['area_band'].astype(str) + '㎡~',
+            '매매가': top['trade_price'].map(format_price_to_uk),
+            '전세가': top['jeonse_deposit'].map(format_price_to_uk),
+            '전세가율': top['ratio'],
+            '갭': top['gap'].map(format_price_to_uk),
+            '매매/전세 건수': top['trades'].astype(str) + ' / ' + top['rents'].astype(str),
+        }),
+        column_config={
+            '전세가율': st.column_config.ProgressColumn(
+                '전세가율', format="%.1f%%", min_value=0, max_value=100
+            ),
+        },
+        use_container_width=True,
+        hide_index=True
+    )
 
-def render_list_tab(df: pd.DataFrame):
+PAGE_SIZE_OPTIONS = [50, 100, 200, 500]
+DISPLAY_COLUMNS = ['date', 'dong', 'apt', 'py', 'price', 'floor', 'build_year']
+
+def to_display_frame(rows: pd.DataFrame) -> pd.DataFrame:
+    """거래 행을 화면/내보내기용 한글 컬럼 프레임으로 변환"""
+    return pd.DataFrame({
+        '거래일': rows['date'].dt.strftime('%Y-%m-%d'),
+        '동': rows['dong'],
+        '아파트': rows['apt'],
+        '평수': rows['py'],
+        '거래가': rows['price'].map(format_price_to_uk),
+        '층': rows['floor'],
+        '건축년도': rows['build_year'],
+    })
+
+def build_export(view: TransactionView, fmt: str, chunk_size: int = 50_000) -> bytes:
+    """필터 결과 전체를 청크 단위로 내보내기 (다운로드 클릭 시에만 호출)"""
+    chunks = view.iter_chunks(chunk_size, DISPLAY_COLUMNS)
+    if EXPORT_FORMATS[fmt].formatted:
+        chunks = (to_display_frame(chunk) for chunk in chunks)
+    return export_bytes(fmt, chunks)
+
+@st.cache_resource(ttl=600)
+def get_transaction_index(lawd_cd: str, bjdong_cd: Optional[str], months: int,
+                          version: tuple, _df: pd.DataFrame) -> TransactionIndex:
+    """거래 목록 필터 인덱스 (조회 조건·캐시 버전별로 한 번만 생성)"""
+    return TransactionIndex(_df)
+
+def render_list_tab(index: TransactionIndex):
     """거래 목록 탭 렌더링"""
     st.subheader("📝 실거래 내역")
     
-    if df.empty:
+    if len(index) == 0:
         st.warning("표시할 데이터가 없습니다.")
         return
     
@@ -678,15 +584,15 @@ def render_list_tab(df: pd.DataFrame):
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        apt_list = ['전체'] + sorted(df['apt'].unique().tolist())
+        apt_list = ['전체'] + index.apt_options()
         selected_apt = st.selectbox("아파트", apt_list)
     
     with col2:
-        dong_list = ['전체'] + sorted(df['dong'].unique().tolist())
+        dong_list = ['전체'] + index.dong_options()
         selected_dong = st.selectbox("동", dong_list)
     
     with col3:
-        min_price, max_price = int(df['price'].min()), int(df['price'].max())
+        min_price, max_price = (int(v) for v in index.value_range('price'))
         price_range = st.slider(
             "가격대 (만원)",
             min_price,
@@ -694,116 +600,305 @@ def render_list_tab(df: pd.DataFrame):
             (min_price, max_price)
         )
     
-    # 필터 적용
-    filtered_df = df.copy()
-    
-    if selected_apt != '전체':
-        filtered_df = filtered_df[filtered_df['apt'] == selected_apt]
-    
-    if selected_dong != '전체':
-        filtered_df = filtered_df[filtered_df['dong'] == selected_dong]
-    
-    filtered_df = filtered_df[
-        (filtered_df['price'] >= price_range[0]) &
-        (filtered_df['price'] <= price_range[1])
-    ]
-    
-    # 표시할 데이터 준비
-    display_df = filtered_df[[
-        'date', 'dong', 'apt', 'py', 'price', 'floor', 'build_year'
-    ]].copy()
-    
-    display_df['date'] = display_df['date'].dt.strftime('%Y-%m-%d')
-    display_df['price_display'] = display_df['price'].apply(format_price_to_uk)
-    display_df = display_df.rename(columns={
-        'date': '거래일',
-        'dong': '동',
-        'apt': '아파트',
-        'py': '평수',
-        'price_display': '거래가',
-        'floor': '층',
-        'build_year': '건축년도'
-    })
-    
-    display_df = display_df[[
-        '거래일', '동', '아파트', '평수', '거래가', '층', '건축년도'
-    ]]
-    
     # 정렬 옵션
-    sort_by = st.selectbox(
-        "정렬 기준",
-        ['거래일 (최신순)', '거래일 (오래된순)', '거래가 (높은순)', '거래가 (낮은순)', '평수 (큰순)', '평수 (작은순)']
+    sort_by = st.selectbox("정렬 기준", list(SORT_OPTIONS))
+    sort_col, ascending = SORT_OPTIONS[sort_by]
+    
+    # 필터 적용 (원본 프레임은 복사하지 않고 행 위치만 계산)
+    view = index.query(
+        apt=None if selected_apt == '전체' else selected_apt,
+        dong=None if selected_dong == '전체' else selected_dong,
+        price_range=price_range,
+        sort_by=sort_col,
+        ascending=ascending
     )
     
-    if sort_by == '거래일 (최신순)':
-        display_df = display_df.sort_values('거래일', ascending=False)
-    elif sort_by == '거래일 (오래된순)':
-        display_df = display_df.sort_values('거래일', ascending=True)
-    elif sort_by == '거래가 (높은순)':
-        display_df = display_df.sort_values('평수', ascending=False)
-    elif sort_by == '거래가 (낮은순)':
-        display_df = display_df.sort_values('평수', ascending=True)
-    elif sort_by == '평수 (큰순)':
-        display_df = display_df.sort_values('평수', ascending=False)
-    elif sort_by == '평수 (작은순)':
-        display_df = display_df.sort_values('평수', ascending=True)
-    
-    st.info(f"총 {len(display_df):,}건의 거래가 검색되었습니다.")
+    st.info(f"총 {len(view):,}건의 거래가 검색되었습니다.")
+    
+    # 페이지 선택 (현재 페이지만 브라우저로 전송)
+    col1, col2 = st.columns([1, 3])
+    
+    with col1:
+        page_size = st.selectbox("페이지당 건수", PAGE_SIZE_OPTIONS, index=1)
+    
+    with col2:
+        n_pages = view.n_pages(page_size)
+        page_no = st.number_input(
+            f"페이지 (총 {n_pages:,}쪽)", min_value=1, max_value=n_pages, value=1
+        )
     
     # 데이터 표시
     st.dataframe(
-        display_df,
+        to_display_frame(view.page(page_no, page_size, DISPLAY_COLUMNS)),
         use_container_width=True,
         hide_index=True,
         height=500
     )
     
-    # CSV 다운로드
-    csv = display_df.to_csv(index=False, encoding='utf-8-sig')
-    st.download_button(
-        label="📥 CSV 다운로드",
-        data=csv,
-        file_name=f"real_estate_data_{datetime.now().strftime('%Y%m%d')}.csv",
-        mime="text/csv"
-    )
+    # 다운로드 (버튼을 눌렀을 때만 생성)
+    col1, col2 = st.columns([1, 3])
+    
+    with col1:
+        export_fmt = st.selectbox("내보내기 형식", list(EXPORT_FORMATS))
+    
+    with col2:
+        spec = EXPORT_FORMATS[export_fmt]
+        st.download_button(
+            label=f"📥 {export_fmt} 다운로드",
+            data=lambda: build_export(view, export_fmt),
+            file_name=f"real_estate_data_{datetime.now().strftime('%Y%m%d')}.{spec.extension}",
+            mime=spec.mime,
+            on_click="ignore"
+        )
+
+@st.cache_resource
+def get_query_engine():
+    """저장소 SQL 엔진 (세션 사이 공유)"""
+    return lazy_import('realestate_core.sql').QueryEngine()
+
+def sync_store(lawd_cd: str, months: int):
+    """현재 지역·기간 파티션을 저장소에 채움 (이미 받은 캐시를 쓰므로 보통 API 호출 없음)"""
+    store = TransactionStore()
+    for deal_ymd in recent_deal_months(months):
+        if store.is_fresh(lawd_cd, deal_ymd):
+            continue
+        try:
+            store.sync_partition(lawd_cd, deal_ymd)
+        except (MolitAPIError, QuotaExceeded):
+            return
+
+def render_query_tab(lawd_cd: str, months: int):
+    """SQL 조회 탭 렌더링 (저장소의 모든 지역·기간 대상)"""
+    st.subheader("🧮 SQL 조회")
+    sql_module = lazy_import('realestate_core.sql')
+    
+    with span("query.sync"):
+        sync_store(lawd_cd, months)
+    engine = get_query_engine()
+    
+    with st.expander("테이블 및 컬럼"):
+        st.caption(
+            "저장소의 데이터셋마다 테이블이 있습니다. lawd_cd(시군구 코드)와 deal_ymd(YYYYMM)는 "
+            "문자열이며, 이 두 조건은 파일 단위로 걸러져 빠릅니다."
+        )
+        try:
+            st.dataframe(engine.tables(), use_container_width=True, hide_index=True)
+        except sql_module.QueryError as e:
+            st.error(f"저장소를 읽을 수 없습니다: {e}")
+    
+    sql = st.text_area("SQL (SELECT 문 하나)", value=DEFAULT_QUERY.format(lawd_cd=lawd_cd),
+                       height=180, key="sql_text")
+    if st.button("▶ 실행", type="primary"):
+        try:
+            with span("query.run"):
+                st.session_state["sql_result"] = engine.query(sql, limit=QUERY_MAX_ROWS)
+        except sql_module.QueryError as e:
+            st.session_state.pop("sql_result", None)
+            st.error(f"쿼리 오류: {e}")
+    
+    result = st.session_state.get("sql_result")
+    if result is None:
+        return
+    
+    note = f" · 처음 {QUERY_MAX_ROWS:,}행만 표시" if result.truncated else ""
+    st.caption(f"{len(result.frame):,}행 · {result.elapsed:.2f}초{note}")
+    st.dataframe(result.frame, use_container_width=True, hide_index=True)
+
+@st.cache_resource
+def get_watch_poller() -> WatchPoller:
+    """감시 목록 백그라운드 폴러 (서버 프로세스당 하나)"""
+    return WatchPoller(Watchlist(), [JsonLinesSink()]).start()
+
+def render_watch_panel(lawd_cd: str, df: pd.DataFrame):
+    """감시 목록 관리 + 새 거래 알림 배지"""
+    poller = get_watch_poller()
+    watchlist = poller.watchlist
+    read_at = st.session_state.setdefault("alerts_read_at", time.time() - ALERT_UNREAD_WINDOW)
+    unread = [a for a in read_alerts(limit=ALERT_SHOW_LIMIT) if a['detected_at'] > read_at]
+    
+    label = f"🔔 감시 목록 · 새 거래 {len(unread)}건" if unread else "🔔 감시 목록"
+    with st.sidebar.expander(label, expanded=bool(unread)):
+        if unread:
+            alerts = pd.DataFrame(unread[::-1])
+            st.dataframe(
+                pd.DataFrame({
+                    '거래일': alerts['date'],
+                    '감시': alerts['watch'],
+                    '거래가': alerts['price'].map(format_price_to_uk),
+                    '층': alerts['floor'],
+                }),
+                use_container_width=True,
+                hide_index=True
+            )
+            if st.button("읽음 처리", key="alerts_read"):
+                st.session_state["alerts_read_at"] = unread[-1]['detected_at']
+                st.rerun()
+        
+        watches = [w for w in watchlist.watches() if w.lawd_cd == lawd_cd]
+        for watch in watches:
+            col1, col2 = st.columns([4, 1])
+            col1.caption(watch.label)
+            if col2.button("✕", key=f"unwatch_{watch.apt}_{watch.dong}"):
+                watchlist.remove(watch)
+                st.rerun()
+        
+        if not df.empty:
+            target = st.selectbox("단지", ["지역 전체"] + sorted(df['apt'].dropna().unique()),
+                                  key="watch_target")
+            if st.button("감시 추가", key="watch_add"):
+                watchlist.add(Watch(lawd_cd, apt=None if target == "지역 전체" else str(target)))
+                st.rerun()
+        
+        checked = (f"{int((time.time() - poller.last_poll) // 60)}분 전 확인"
+                   if poller.last_poll else "확인 전")
+        st.caption(f"이 지역 {len(watches)}건 · 전체 {len(watchlist.watches())}건 · {checked}")
+
+def render_debug_panel():
+    """import 시간·캐시 디버그 패널 (REALESTATE_DEBUG=1 또는 ?debug=1)"""
+    if os.getenv("REALESTATE_DEBUG") != "1" and st.query_params.get("debug") != "1":
+        return
+    
+    with st.sidebar.expander("🛠 디버그: 캐시"):
+        st.caption(
+            f"메모리 {default_cache.resident_bytes / 1024 ** 2:.1f} / "
+            f"{default_cache.max_bytes / 1024 ** 2:.0f} MB (프로세스 누적 통계)"
+        )
+        stats = pd.DataFrame.from_dict(default_cache.stats(), orient='index')
+        if not stats.empty:
+            stats['resident_mb'] = (stats.pop('resident_bytes') / 1024 ** 2).round(2)
+            st.dataframe(stats, use_container_width=True)
+    
+    with st.sidebar.expander("🛠 디버그: import 시간"):
+        st.caption("이 프로세스에서 처음 불러올 때 걸린 시간")
+        st.dataframe(
+            pd.DataFrame(
+                sorted(IMPORT_TIMES.items(), key=lambda kv: kv[1], reverse=True),
+                columns=['모듈', 'ms']
+            ).round(1),
+            use_container_width=True,
+            hide_index=True
+        )
+        
+        if st.button("콜드 스타트 측정 (-X importtime)"):
+            with st.spinner("새 인터프리터에서 측정 중..."):
+                timings = measure_import_times(
+                    ['streamlit', 'pandas', 'realestate_core.molit'] + HEAVY_MODULES
+                )
+            st.dataframe(
+                pd.DataFrame(
+                    [t for t in timings if t.depth == 0],
+                    columns=['module', 'self_ms', 'cumulative_ms', 'depth']
+                ).drop(columns='depth').round(1),
+                use_container_width=True,
+                hide_index=True
+            )
+
+def render_quota_status():
+    """API 별 오늘 사용량 (한국 시간 자정 초기화)"""
+    status = default_scheduler.ledger.status()
+    pending = default_scheduler.pending()
+    with st.sidebar.expander("📡 API 사용량"):
+        for api, usage in status.items():
+            ratio = usage['used'] / usage['limit'] if usage['limit'] else 1.0
+            st.caption(f"{api}: {usage['used']:,} / {usage['limit']:,} · 대기 {pending.get(api, 0)}건")
+            st.progress(min(ratio, 1.0))
 
 # ==================== 메인 앱 ====================
 
-def main():
+def render_timing_panel(root):
+    """이번 실행의 구간별 시간"""
+    with st.sidebar.expander(f"⏱ 구간별 시간 ({root.duration_ms:,.0f} ms)"):
+        rows = breakdown(root)
+        st.dataframe(
+            pd.DataFrame({
+                '구간': ['\u3000' * r['depth'] + r['name'] for r in rows],
+                '호출': [r['calls'] for r in rows],
+                'ms': [round(r['ms'], 1) for r in rows],
+                '자체 ms': [round(r['self_ms'], 1) for r in rows],
+            }),
+            use_container_width=True,
+            hide_index=True
+        )
+
+def render_app():
     # 타이틀
     st.title("🏠 대한민국 부동산 레이더")
     st.caption("국토교통부 실거래가 데이터 기반 부동산 시장 분석 대시보드")
     
     # 사이드바
-    sido, sigungu, lawd_cd, months = render_sidebar()
+    sido, sigungu, lawd_cd, bjdong_cd, months, with_jeonse = render_sidebar()
+    
+    # 조회 조건이 바뀔 때만 접근 통계에 기록 (야간 캐시 워밍 대상 선정용)
+    selection = (lawd_cd, months, with_jeonse)
+    if st.session_state.get("recorded_selection") != selection:
+        AccessStats().record(lawd_cd, sido, sigungu, months, with_jeonse)
+        st.session_state["recorded_selection"] = selection
     
     # 데이터 로드
-    with st.spinner("📥 데이터를 불러오는 중..."):
-        if months == 1:
-            current_month = datetime.now().strftime("%Y%m")
-            df = fetch_apt_trade_data(lawd_cd, current_month)
-        else:
-            df = fetch_multi_month_data(lawd_cd, months)
+    with st.spinner("📥 데이터를 불러오는 중..."), span("load", lawd_cd=lawd_cd, months=months):
+        df = load_trade_data(lawd_cd, months)
+        rents = load_rent_data(lawd_cd, months) if with_jeonse and not df.empty else None
+    version = data_freshness(lawd_cd, months).version
+    render_freshness(lawd_cd, months, version)
+    render_quota_status()
+    render_watch_panel(lawd_cd, df)
+    render_debug_panel()
+    
+    # 데이터 가공
+    with span("enrich"):
+        if not df.empty and bjdong_cd:
+            df = filter_by_bjdong(df, load_region_index(), lawd_cd, bjdong_cd)
+        if not df.empty:
+            df = add_pyeong(df)
+    
+    jeonse = None
+    rent_version = None
+    if rents is not None:
+        with span("jeonse.join"):
+            if not rents.empty and bjdong_cd:
+                rents = filter_by_bjdong(rents, load_region_index(), lawd_cd, bjdong_cd)
+            rent_version = data_freshness(lawd_cd, months, 'apt_rent').version
+            jeonse = get_jeonse_table(
+                lawd_cd, bjdong_cd, months, (version, rent_version), df, rents
+            )
     
     if not df.empty:
-        # 데이터 가공
-        df['py'] = df['area'].apply(calc_pyeong)
+        # 탭 구성 (선택된 탭만 렌더링)
+        tab1, tab2, tab3, tab4 = st.tabs(
+            ["📍 가격 지도", "📊 시세 통계", "📝 거래 목록", "🧮 SQL 조회"],
+            key="main_tab",
+            on_change="rerun"
+        )
+        
+        if tab1.open:
+            with tab1, span("render.map"):
+                layer = get_complex_layer(
+                    lawd_cd, bjdong_cd, months, (version, rent_version), df, jeonse
+                )
+                render_map_tab(layer, df, sido, sigungu, jeonse)
         
-        # 탭 구성
-        tab1, tab2, tab3 = st.tabs(["📍 가격 지도", "📊 시세 통계", "📝 거래 목록"])
+        if tab2.open:
+            with tab2, span("render.stats"):
+                render_statistics_tab(df, (lawd_cd, bjdong_cd, months, version), jeonse)
         
-        with tab1:
-            render_map_tab(df, sido, sigungu)
+        if tab3.open:
+            with tab3, span("render.list"):
+                with span("list.index"):
+                    index = get_transaction_index(lawd_cd, bjdong_cd, months, version, df)
+                render_list_tab(index)
         
-        with tab2:
-            render_statistics_tab(df)
+        if tab4.open:
+            with tab4, span("render.query"):
+                render_query_tab(lawd_cd, months)
         
-        with tab3:
-            render_list_tab(df)
+        with st.sidebar.expander("🧠 데이터 메모리"):
+            report = memory_usage_report(df)
+            st.caption(f"{len(df):,}건 · {report.loc['합계', 'bytes'] / 1024 ** 2:.2f} MB")
+            st.dataframe(report, use_container_width=True)
     
     else:
         st.warning(f"""
-        ⚠️ {sido} {sigungu}의 최근 {months}개월 거래 데이터가 없습니다.
+        ⚠️ {load_region_index().full_name(bjdong_cd or lawd_cd)}의 최근 {months}개월 거래 데이터가 없습니다.
         
         다음을 확인해 주세요:
         - 법정동 코드가 올바른지 확인
@@ -836,5 +931,10 @@ def main():
         - **Data**: Pandas
         """)
 
+def main():
+    with trace("rerun") as root:
+        render_app()
+    render_timing_panel(root)
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,81 @@
+"""
+저장소 SQL 조회 (DuckDB)
+
+저장소(realestate_core.store)의 Parquet 파티션에 SELECT 문을 실행합니다.
+데이터셋마다 테이블(apt_trade, apt_rent, ...)이 있고, lawd_cd/deal_ymd 조건은
+파일 단위로 걸러지므로 필요한 파티션만 읽습니다 (realestate_core.sql 참고).
+
+실행:
+    python query_store.py "SELECT lawd_cd, count(*) FROM apt_trade WHERE deal_ymd >= '202401' GROUP BY ALL"
+    python query_store.py -f report.sql --out report.parquet
+    python query_store.py --explain "SELECT * FROM apt_trade WHERE lawd_cd = '11680'"
+    python query_store.py --tables
+
+--out 확장자가 .parquet 이면 Parquet, 그 외에는 CSV(utf-8-sig)로 저장합니다.
+"""
+
+import argparse
+import sys
+import time
+
+import pandas as pd
+
+from realestate_core.sql import QueryEngine, QueryError
+from realestate_core.store import TransactionStore
+
+DEFAULT_MAX_ROWS = 1_000_000
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="저장소 SQL 조회 (SELECT 문 하나)")
+    parser.add_argument("sql", nargs="?", help="SQL (생략하면 -f 파일 또는 표준 입력)")
+    parser.add_argument("-f", "--file", help="SQL 파일")
+    parser.add_argument("--store", help="저장소 경로 (기본: data/store 또는 REALESTATE_STORE_DIR)")
+    parser.add_argument("--out", help="결과 파일 (.csv 또는 .parquet, 기본: 화면 출력)")
+    parser.add_argument("--max-rows", type=int, default=DEFAULT_MAX_ROWS,
+                        help=f"최대 행 수 (기본 {DEFAULT_MAX_ROWS:,})")
+    parser.add_argument("--memory-limit", help="DuckDB 메모리 한도 (예: 4GB)")
+    parser.add_argument("--explain", action="store_true", help="실행 계획만 출력")
+    parser.add_argument("--tables", action="store_true", help="테이블·컬럼 목록 출력")
+    args = parser.parse_args()
+
+    engine = QueryEngine(args.store or TransactionStore().root, memory_limit=args.memory_limit)
+    if args.tables:
+        try:
+            tables = engine.tables()
+        except QueryError as e:
+            print(f"❌ {e}", file=sys.stderr)
+            sys.exit(1)
+        with pd.option_context('display.max_rows', None):
+            print(tables.to_string(index=False))
+        sys.exit(0)
+
+    if args.file:
+        with open(args.file, encoding='utf-8') as f:
+            sql = f.read()
+    else:
+        sql = args.sql or sys.stdin.read()
+
+    try:
+        if args.explain:
+            print(engine.explain(sql))
+            sys.exit(0)
+        began = time.perf_counter()
+        result = engine.query(sql, limit=args.max_rows)
+    except QueryError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        sys.exit(1)
+
+    frame = result.frame
+    if args.out:
+        if args.out.endswith('.parquet'):
+            frame.to_parquet(args.out, index=False, compression='zstd')
+        else:
+            frame.to_csv(args.out, index=False, encoding='utf-8-sig')
+        print(f"✅ {len(frame):,}행 -> {args.out} ({time.perf_counter() - began:.1f}s)")
+    else:
+        with pd.option_context('display.max_rows', 100, 'display.width', None):
+            print(frame)
+
+    if result.truncated:
+        print(f"⚠️ {args.max_rows:,}행에서 잘렸습니다 (--max-rows 로 조정)", file=sys.stderr)
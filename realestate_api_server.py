@@ -0,0 +1,254 @@
+"""
+부동산 레이더 읽기 전용 HTTP API
+
+대시보드와 같은 거래 데이터/통계를 다른 내부 도구에서 쓸 수 있도록 제공합니다.
+요청은 로컬 저장소(realestate_core.store)에서 응답하며, 저장소에 없는 월이나
+TTL 이 지난 최근 월만 국토부 API 로 받아 채웁니다. 여러 클라이언트가 하나의
+워밍된 저장소/캐시를 공유합니다.
+
+실행:
+    python realestate_api_server.py --port 8080
+
+엔드포인트 (모두 GET):
+    /health
+    /v1/transactions?lawd_cd=11680&from=202401&to=202403[&format=arrow|json]
+    /v1/stats?lawd_cd=11680&from=202401&to=202403
+    /v1/complexes?lawd_cd=11680&from=202401&to=202403[&format=arrow|json]
+
+모든 /v1 엔드포인트는 dataset 파라미터로 데이터셋(datasets.DATASETS: apt_trade,
+apt_rent, offi_trade, ...)을 고를 수 있습니다. 기본은 apt_trade 이며, stats 와
+complexes 는 매매가(price)가 있는 데이터셋만 지원합니다.
+
+from/to 를 생략하면 최근 3개월입니다. 응답에는 저장소 파티션 버전으로 만든
+ETag 가 붙고, If-None-Match 가 일치하면 본문 없이 304 를 돌려줍니다.
+Arrow 응답은 zstd 압축 IPC 스트림, JSON 응답은 클라이언트가 허용하면 gzip 압축합니다.
+국토부 API 한도에 걸려 채울 수 없는 파티션이 있으면 503 을 돌려줍니다.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import io
+import json
+import logging
+import re
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+import pandas as pd
+from aiohttp import web
+
+from realestate_core.datasets import DATASETS
+from realestate_core.geocode import geocode_complexes
+from realestate_core.molit import MolitAPIError, recent_deal_months
+from realestate_core.quota import QuotaExceeded
+from realestate_core.region_index import default_region_index
+from realestate_core.stats import summarize_transactions, summary_to_json
+from realestate_core.store import TransactionStore, month_range
+
+logger = logging.getLogger("realestate_api")
+
+ARROW_STREAM_MIME = "application/vnd.apache.arrow.stream"
+MAX_MONTHS = 120
+PAYLOAD_CACHE_SIZE = 256
+
+LAWD_CD_RE = re.compile(r"^\d{5}$")
+YMD_RE = re.compile(r"^\d{6}$")
+
+
+class PayloadCache:
+    """ETag -> (본문, Content-Type) LRU"""
+
+    def __init__(self, maxsize: int = PAYLOAD_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._items: "OrderedDict[str, Tuple[bytes, str]]" = OrderedDict()
+
+    def get(self, etag: str) -> Optional[Tuple[bytes, str]]:
+        item = self._items.get(etag)
+        if item is not None:
+            self._items.move_to_end(etag)
+        return item
+
+    def set(self, etag: str, body: bytes, content_type: str):
+        self._items[etag] = (body, content_type)
+        self._items.move_to_end(etag)
+        while len(self._items) > self.maxsize:
+            self._items.popitem(last=False)
+
+
+# ==================== 직렬화 ====================
+
+def frame_to_arrow(df: pd.DataFrame) -> bytes:
+    """DataFrame -> zstd 압축 Arrow IPC 스트림"""
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    sink = io.BytesIO()
+    options = pa.ipc.IpcWriteOptions(compression="zstd")
+    with pa.ipc.new_stream(sink, table.schema, options=options) as writer:
+        writer.write_table(table)
+    return sink.getvalue()
+
+
+def frame_to_json(df: pd.DataFrame) -> bytes:
+    return df.to_json(orient="records", date_format="iso", force_ascii=False).encode("utf-8")
+
+
+# ==================== 요청 처리 ====================
+
+def parse_range(request: web.Request) -> Tuple[str, str, str]:
+    """(lawd_cd, from, to) 검증"""
+    lawd_cd = request.query.get("lawd_cd", "")
+    if not LAWD_CD_RE.match(lawd_cd):
+        raise web.HTTPBadRequest(text="lawd_cd 는 5자리 시군구 코드여야 합니다.")
+
+    recent = recent_deal_months(3)
+    start = request.query.get("from", recent[-1])
+    end = request.query.get("to", recent[0])
+    if not (YMD_RE.match(start) and YMD_RE.match(end)) or start > end:
+        raise web.HTTPBadRequest(text="from/to 는 YYYYMM 형식이며 from <= to 여야 합니다.")
+    if len(month_range(start, end)) > MAX_MONTHS:
+        raise web.HTTPBadRequest(text=f"한 번에 최대 {MAX_MONTHS}개월까지 조회할 수 있습니다.")
+
+    return lawd_cd, start, end
+
+
+def parse_dataset(request: web.Request, kind: str) -> str:
+    """dataset 파라미터 검증 (stats/complexes 는 매매 데이터셋만)"""
+    name = request.query.get("dataset", "apt_trade")
+    dataset = DATASETS.get(name)
+    if dataset is None:
+        raise web.HTTPBadRequest(text=f"dataset 은 {', '.join(DATASETS)} 중 하나입니다.")
+    if kind != "transactions" and "price" not in dataset.fields:
+        raise web.HTTPBadRequest(text=f"{kind} 는 매매 데이터셋에서만 지원합니다.")
+    return name
+
+
+class RealEstateAPI:
+    """엔드포인트 핸들러 묶음"""
+
+    def __init__(self, store: TransactionStore, fetch_missing: bool = True):
+        self.store = store
+        self.stores: Dict[str, TransactionStore] = {store.dataset: store}
+        self.fetch_missing = fetch_missing
+        self.payloads = PayloadCache()
+
+    def _store(self, dataset: str) -> TransactionStore:
+        """데이터셋별 저장소 (같은 루트 아래)"""
+        store = self.stores.get(dataset)
+        if store is None:
+            store = self.stores[dataset] = TransactionStore(self.store.root, dataset)
+        return store
+
+    def _sync(self, store: TransactionStore, lawd_cd: str, start: str, end: str):
+        """범위의 파티션을 저장소에 채움 (유효한 파티션은 건드리지 않음)"""
+        if not self.fetch_missing:
+            return
+        for deal_ymd in month_range(start, end):
+            if not store.is_fresh(lawd_cd, deal_ymd):
+                store.sync_partition(lawd_cd, deal_ymd)
+
+    def _etag(self, kind: str, fmt: str, store: TransactionStore,
+              lawd_cd: str, start: str, end: str) -> str:
+        version = store.range_version(lawd_cd, start, end)
+        raw = repr((kind, fmt, store.dataset, lawd_cd, start, end, version))
+        return '"' + hashlib.sha1(raw.encode("utf-8")).hexdigest() + '"'
+
+    async def _respond(self, request: web.Request, kind: str,
+                       build: Callable[..., Tuple[bytes, str]]) -> web.StreamResponse:
+        lawd_cd, start, end = parse_range(request)
+        store = self._store(parse_dataset(request, kind))
+        fmt = request.query.get("format", "json" if kind == "stats" else "arrow")
+        if fmt not in ("arrow", "json"):
+            raise web.HTTPBadRequest(text="format 은 arrow 또는 json 입니다.")
+
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(None, self._sync, store, lawd_cd, start, end)
+        except MolitAPIError as e:
+            raise web.HTTPBadGateway(text=str(e))
+        except QuotaExceeded as e:
+            raise web.HTTPServiceUnavailable(text=str(e), headers={"Retry-After": "3600"})
+
+        etag = self._etag(kind, fmt, store, lawd_cd, start, end)
+        headers = {"ETag": etag, "Cache-Control": "max-age=60"}
+
+        if etag in request.headers.get("If-None-Match", ""):
+            return web.Response(status=304, headers=headers)
+
+        cached = self.payloads.get(etag)
+        if cached is None:
+            cached = await loop.run_in_executor(None, build, fmt, store, lawd_cd, start, end)
+            self.payloads.set(etag, *cached)
+
+        body, content_type = cached
+        response = web.Response(body=body, content_type=content_type, headers=headers)
+        if content_type == "application/json":
+            response.enable_compression()
+        return response
+
+    # ---------- 본문 생성 (executor 에서 실행) ----------
+
+    @staticmethod
+    def _load(store: TransactionStore, lawd_cd: str, start: str, end: str) -> pd.DataFrame:
+        return store.load_range(lawd_cd, start, end, fetch_missing=False)
+
+    def _build_transactions(self, fmt, store, lawd_cd, start, end) -> Tuple[bytes, str]:
+        df = self._load(store, lawd_cd, start, end)
+        if fmt == "arrow":
+            return frame_to_arrow(df), ARROW_STREAM_MIME
+        return frame_to_json(df), "application/json"
+
+    def _build_stats(self, fmt, store, lawd_cd, start, end) -> Tuple[bytes, str]:
+        df = self._load(store, lawd_cd, start, end)
+        payload = {"dataset": store.dataset, "lawd_cd": lawd_cd, "from": start, "to": end}
+        payload.update(summary_to_json(summarize_transactions(df)) if not df.empty else {"count": 0})
+        return json.dumps(payload, ensure_ascii=False).encode("utf-8"), "application/json"
+
+    def _build_complexes(self, fmt, store, lawd_cd, start, end) -> Tuple[bytes, str]:
+        df = self._load(store, lawd_cd, start, end)
+        if df.empty:
+            complexes = pd.DataFrame()
+        else:
+            sido, sigungu, _ = default_region_index().names_of(lawd_cd) or ("", "", "")
+            complexes = geocode_complexes(df, sido, sigungu)
+        if fmt == "arrow":
+            return frame_to_arrow(complexes), ARROW_STREAM_MIME
+        return frame_to_json(complexes), "application/json"
+
+    # ---------- 라우트 ----------
+
+    async def health(self, request: web.Request) -> web.Response:
+        return web.json_response({"status": "ok"})
+
+    async def transactions(self, request: web.Request) -> web.StreamResponse:
+        return await self._respond(request, "transactions", self._build_transactions)
+
+    async def stats(self, request: web.Request) -> web.StreamResponse:
+        return await self._respond(request, "stats", self._build_stats)
+
+    async def complexes(self, request: web.Request) -> web.StreamResponse:
+        return await self._respond(request, "complexes", self._build_complexes)
+
+
+def create_app(store: Optional[TransactionStore] = None, fetch_missing: bool = True) -> web.Application:
+    api = RealEstateAPI(store or TransactionStore(), fetch_missing)
+    app = web.Application()
+    app.router.add_get("/health", api.health)
+    app.router.add_get("/v1/transactions", api.transactions)
+    app.router.add_get("/v1/stats", api.stats)
+    app.router.add_get("/v1/complexes", api.complexes)
+    return app
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="부동산 레이더 읽기 전용 HTTP API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--store", help="저장소 경로 (기본: data/store 또는 REALESTATE_STORE_DIR)")
+    parser.add_argument("--offline", action="store_true", help="국토부 API 를 호출하지 않고 저장소만 사용")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    store = TransactionStore(args.store) if args.store else TransactionStore()
+    web.run_app(create_app(store, fetch_missing=not args.offline), host=args.host, port=args.port)
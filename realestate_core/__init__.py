@@ -0,0 +1,103 @@
+"""
+대한민국 부동산 레이더 데이터 코어
+
+Streamlit 없이 쓸 수 있는 데이터 계층입니다. 조회/파싱/캐시/가공 함수를
+대시보드와 배치 작업이 함께 사용합니다.
+
+    from realestate_core import fetch_multi_month_data
+    df = fetch_multi_month_data("11680", months=3)
+
+패키지 import 자체는 하위 모듈을 읽지 않으며, 이름을 처음 사용할 때
+해당 모듈만 불러옵니다 (pandas/requests 도 그때 import 됩니다).
+"""
+
+import importlib
+
+_EXPORTS = {
+    # 국토부 실거래
+    'fetch_dataset': 'molit',
+    'fetch_dataset_months': 'molit',
+    'fetch_apt_trade_data': 'molit',
+    'fetch_multi_month_data': 'molit',
+    'recent_deal_months': 'molit',
+    'MolitAPIError': 'molit',
+    'DATASETS': 'datasets',
+    'MolitDataset': 'datasets',
+    # 좌표 변환
+    'get_coords': 'geocode',
+    'get_coords_vworld': 'geocode',
+    'get_coords_kakao': 'geocode',
+    'GeocodeError': 'geocode',
+    'geocode_complexes': 'geocode',
+    'summarize_complexes': 'geocode',
+    'fetch_kakao_property_info': 'geocode',
+    'places_near': 'geocode',
+    'brokers_in_bbox': 'geocode',
+    'SpatialIndex': 'spatial',
+    'ComplexLayer': 'viewport',
+    'Viewport': 'viewport',
+    # 가공
+    'calc_pyeong': 'transforms',
+    'add_pyeong': 'transforms',
+    'format_price_to_uk': 'transforms',
+    'get_price_color': 'transforms',
+    'filter_by_bjdong': 'transforms',
+    'compact_transactions': 'transaction_schema',
+    'memory_usage_report': 'transaction_schema',
+    # 조회/내보내기
+    'TransactionIndex': 'transaction_index',
+    'TransactionView': 'transaction_index',
+    'SORT_OPTIONS': 'transaction_index',
+    'EXPORT_FORMATS': 'transaction_export',
+    'export_bytes': 'transaction_export',
+    # 통계
+    'summarize_transactions': 'stats',
+    'jeonse_ratio_table': 'jeonse',
+    'attach_ratio': 'jeonse',
+    'national_rollup': 'rollup',
+    'price_area_figure': 'figures',
+    'build_price_map': 'figures',
+    'build_marker_layers': 'figures',
+    'QueryEngine': 'sql',
+    # 저장소
+    'TransactionStore': 'store',
+    # 캐시 워밍
+    'AccessStats': 'warmup',
+    'warm_up': 'warmup',
+    # 감시 목록
+    'Watch': 'watch',
+    'Watchlist': 'watch',
+    'WatchPoller': 'watch',
+    # 법정동 코드
+    'RegionIndex': 'region_index',
+    'default_region_index': 'region_index',
+    # 캐시
+    'memoize': 'cache',
+    'default_cache': 'cache',
+    # API 한도/스케줄링
+    'Priority': 'quota',
+    'QuotaExceeded': 'quota',
+    'QuotaLedger': 'quota',
+    'FetchScheduler': 'quota',
+    'fetch_priority': 'quota',
+    'default_scheduler': 'quota',
+    # 구간 측정
+    'span': 'tracing',
+    'trace': 'tracing',
+    'traced': 'tracing',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{module_name}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
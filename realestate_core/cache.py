@@ -0,0 +1,363 @@
+"""
+메모리 LRU / 압축 디스크 2단 캐시
+
+st.cache_data 대신 쓰는 Streamlit 비의존 캐시입니다. 메모리에 없으면 디스크
+(CACHE_DIR/<namespace>/<key>.pkl.z, zlib 압축 pickle)를 보고, 둘 다 없을 때만
+원래 함수를 호출합니다. 디스크 단계를 대시보드와 배치 작업이 함께 쓰므로
+한쪽에서 받아 둔 데이터를 다른 쪽에서 바로 재사용할 수 있습니다.
+
+메모리 단계는 바이트 예산(REALESTATE_CACHE_MEMORY_MB, 기본 256MB)을 넘으면
+가장 오래 쓰지 않은 항목부터 내보냅니다. 내보낸 항목은 디스크에 남아 있으므로
+다음 요청 때 네트워크 없이 다시 올라옵니다. Cache.stats() 로 네임스페이스별
+적중/미스/축출 횟수와 메모리 점유량을 볼 수 있습니다.
+
+예외는 캐시하지 않으므로 일시적인 API 오류는 다음 호출에서 다시 시도됩니다.
+
+캐시 미스 시 같은 키의 동시 호출은 singleflight 로 합쳐지므로, 여러 세션이
+한꺼번에 같은 데이터를 요청해도 원래 함수는 한 번만 실행됩니다.
+
+stale_on 에 지정한 예외(API 한도 초과 등)가 나면 TTL 이 지난 항목이라도
+남아 있으면 그 값을 대신 돌려줍니다.
+
+stale_while_revalidate 를 주면 TTL 이 지난 항목을 기다리지 않고 바로 돌려주고,
+같은 키의 갱신을 백그라운드 스레드 하나에서 실행합니다. 갱신된 값은 다음
+호출부터 보입니다. 대시보드 응답 시간이 외부 API 지연과 무관해집니다.
+"""
+
+import contextlib
+import functools
+import hashlib
+import logging
+import os
+import pickle
+import sys
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterator, NamedTuple, Optional, Set, Tuple, Type
+
+from .config import CACHE_DIR, CACHE_MEMORY_BYTES
+from .fileio import atomic_write
+from .quota import Priority, fetch_priority
+from .singleflight import SingleFlight, file_lock
+
+logger = logging.getLogger(__name__)
+
+# 디스크 압축 수준 (읽기 속도 우선)
+COMPRESS_LEVEL = 3
+
+STAT_FIELDS = ('memory_hits', 'disk_hits', 'misses', 'evictions', 'entries', 'resident_bytes')
+
+
+def make_key(args: tuple, kwargs: dict) -> str:
+    """함수 인자 -> 캐시 키"""
+    raw = repr((args, sorted(kwargs.items())))
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+def _copy(value: Any) -> Any:
+    """
+    DataFrame 은 얕은 복사본을 돌려줌
+
+    호출한 쪽에서 컬럼을 추가해도 캐시에 든 원본은 바뀌지 않습니다.
+    """
+    copy = getattr(value, 'copy', None)
+    if copy is not None and hasattr(value, 'columns'):
+        return copy(deep=False)
+    return value
+
+
+def sizeof(value: Any) -> int:
+    """캐시 값의 대략적인 메모리 크기(바이트)"""
+    memory_usage = getattr(value, 'memory_usage', None)
+    if memory_usage is not None and hasattr(value, 'columns'):
+        return int(memory_usage(deep=True).sum())
+    if isinstance(value, (tuple, list)):
+        return sys.getsizeof(value) + sum(sys.getsizeof(v) for v in value)
+    return sys.getsizeof(value)
+
+
+class _Entry(NamedTuple):
+    stored_at: float
+    value: Any
+    size: int
+
+
+class Cache:
+    """메모리 LRU + 압축 디스크 캐시"""
+
+    def __init__(self, directory: Optional[str] = CACHE_DIR,
+                 max_bytes: int = CACHE_MEMORY_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._memory: "OrderedDict[Tuple[str, str], _Entry]" = OrderedDict()
+        self._resident = 0
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def _path(self, namespace: str, key: str) -> str:
+        return os.path.join(self.directory, namespace, key + '.pkl.z')
+
+    def _count(self, namespace: str, field: str, n: int = 1):
+        """self._lock 을 잡은 상태에서 호출"""
+        stats = self._stats.setdefault(namespace, dict.fromkeys(STAT_FIELDS, 0))
+        stats[field] += n
+
+    def _remember(self, namespace: str, key: str, stored_at: float, value: Any):
+        """메모리 단계에 넣고 예산을 넘는 만큼 오래된 항목 축출"""
+        size = sizeof(value)
+        with self._lock:
+            old = self._memory.pop((namespace, key), None)
+            if old is not None:
+                self._resident -= old.size
+                self._count(namespace, 'entries', -1)
+                self._count(namespace, 'resident_bytes', -old.size)
+
+            if size > self.max_bytes:
+                return  # 예산보다 큰 값은 디스크에만 둠
+
+            self._memory[(namespace, key)] = _Entry(stored_at, value, size)
+            self._resident += size
+            self._count(namespace, 'entries')
+            self._count(namespace, 'resident_bytes', size)
+
+            while self._resident > self.max_bytes:
+                (ns, _), evicted = self._memory.popitem(last=False)
+                self._resident -= evicted.size
+                self._count(ns, 'entries', -1)
+                self._count(ns, 'resident_bytes', -evicted.size)
+                self._count(ns, 'evictions')
+
+    def _recall(self, namespace: str, key: str) -> Optional[_Entry]:
+        """메모리 단계 조회 (최근 사용으로 표시)"""
+        with self._lock:
+            entry = self._memory.get((namespace, key))
+            if entry is not None:
+                self._memory.move_to_end((namespace, key))
+            return entry
+
+    @contextlib.contextmanager
+    def lock(self, namespace: str, key: str) -> Iterator[None]:
+        """같은 키를 채우는 다른 프로세스와의 배타 잠금"""
+        if not self.directory:
+            yield
+            return
+        with file_lock(os.path.join(self.directory, namespace, key + '.lock')):
+            yield
+
+    def _load(self, namespace: str, key: str,
+              newer_than: Optional[float] = None) -> Optional[Tuple[float, Any]]:
+        """디스크 단계 조회 (newer_than 보다 새 파일만 읽음)"""
+        if not self.directory:
+            return None
+        path = self._path(namespace, key)
+        try:
+            stored_at = os.path.getmtime(path)
+            if newer_than is not None and stored_at <= newer_than:
+                return None
+            with open(path, 'rb') as f:
+                value = pickle.loads(zlib.decompress(f.read()))
+        except (OSError, pickle.UnpicklingError, EOFError, zlib.error):
+            return None
+        self._remember(namespace, key, stored_at, value)
+        return stored_at, value
+
+    def get_entry(self, namespace: str, key: str) -> Optional[Tuple[float, Any]]:
+        """
+        (저장 시각, 값), TTL 과 무관하게 남아 있는 항목
+
+        다른 프로세스가 디스크에 더 새 값을 써 두었으면 그 값을 읽습니다.
+        """
+        entry = self._recall(namespace, key)
+        loaded = self._load(namespace, key, entry.stored_at if entry is not None else None)
+        if loaded is not None:
+            return loaded
+        return (entry.stored_at, entry.value) if entry is not None else None
+
+    def get(self, namespace: str, key: str, ttl: Optional[float] = None,
+            record: bool = True) -> Tuple[bool, Any]:
+        """
+        (적중 여부, 값)
+
+        Args:
+            record: False 면 적중/미스 통계에 넣지 않음 (재확인·상태 조회용)
+        """
+        now = time.time()
+        field = 'misses'
+
+        entry = self._recall(namespace, key)
+        if entry is not None and (ttl is None or now - entry.stored_at < ttl):
+            result = (True, entry.value)
+            field = 'memory_hits'
+        else:
+            loaded = self._load(namespace, key, entry.stored_at if entry is not None else None)
+            if loaded is not None and (ttl is None or now - loaded[0] < ttl):
+                result = (True, loaded[1])
+                field = 'disk_hits'
+            else:
+                result = (False, None)
+
+        if record:
+            with self._lock:
+                self._count(namespace, field)
+        return result
+
+    def set(self, namespace: str, key: str, value: Any):
+        stored_at = time.time()
+
+        if self.directory:
+            path = self._path(namespace, key)
+            try:
+                data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+                with atomic_write(path) as f:
+                    f.write(zlib.compress(data, COMPRESS_LEVEL))
+                # 디스크 시각에 맞춰 두어야 get_entry 가 자기 파일을 다시 읽지 않음
+                stored_at = os.path.getmtime(path)
+            except OSError:
+                pass  # 디스크에 쓸 수 없으면 메모리 캐시만 사용
+
+        self._remember(namespace, key, stored_at, value)
+
+    def clear(self, namespace: Optional[str] = None):
+        """메모리 캐시 비우기 (디스크 파일은 TTL 로 만료)"""
+        with self._lock:
+            for k in [k for k in self._memory if namespace is None or k[0] == namespace]:
+                entry = self._memory.pop(k)
+                self._resident -= entry.size
+                self._count(k[0], 'entries', -1)
+                self._count(k[0], 'resident_bytes', -entry.size)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """{namespace: {memory_hits, disk_hits, misses, evictions, entries, resident_bytes}}"""
+        with self._lock:
+            return {ns: dict(stats) for ns, stats in sorted(self._stats.items())}
+
+    @property
+    def resident_bytes(self) -> int:
+        return self._resident
+
+
+default_cache = Cache()
+
+# 프로세스 안에서 진행 중인 캐시 채우기 호출
+_flights = SingleFlight()
+
+# 백그라운드 갱신 중인 키 ("namespace/key")
+_refreshing: Set[str] = set()
+_refreshing_lock = threading.Lock()
+
+
+def _refresh_in_background(flight_key: str, fill: Callable[[], Any]) -> bool:
+    """
+    키당 하나의 갱신 스레드 시작 (이미 갱신 중이면 False)
+
+    갱신은 선조회 우선순위로 나가므로 대화형 호출보다 뒤에 처리됩니다.
+    """
+    with _refreshing_lock:
+        if flight_key in _refreshing:
+            return False
+        _refreshing.add(flight_key)
+
+    def run():
+        try:
+            with fetch_priority(Priority.PREFETCH):
+                _flights.do(flight_key, fill)
+        except Exception as e:
+            logger.warning("%s 백그라운드 갱신 실패: %s", flight_key, e)
+        finally:
+            with _refreshing_lock:
+                _refreshing.discard(flight_key)
+
+    threading.Thread(target=run, name=f"refresh-{flight_key}", daemon=True).start()
+    return True
+
+
+def memoize(namespace: str, ttl: Optional[float] = None,
+            cache: Optional[Cache] = None,
+            stale_on: Tuple[Type[BaseException], ...] = (),
+            stale_while_revalidate: float = 0) -> Callable:
+    """
+    함수 결과 캐시 데코레이터
+
+    Args:
+        namespace: 캐시 구분 이름 (디스크 하위 디렉터리)
+        ttl: 유효 시간(초), None 이면 만료 없음
+        cache: 사용할 Cache (기본: default_cache)
+        stale_on: 이 예외가 나면 만료된 캐시 값으로 대신 응답 (없으면 예외 전달)
+        stale_while_revalidate: TTL 이 지난 뒤에도 이 시간(초) 동안은 만료된 값을
+            바로 반환하고 백그라운드에서 갱신 (0 이면 사용 안 함, ttl 이 있어야 함)
+
+    Raises:
+        ValueError: ttl 없이 stale_while_revalidate 를 준 경우
+    """
+    if stale_while_revalidate and ttl is None:
+        raise ValueError(f"{namespace}: stale_while_revalidate 는 ttl 과 함께 써야 합니다")
+
+    def decorator(func: Callable) -> Callable:
+        def lookup(args: tuple, kwargs: dict, allow_stale: bool):
+            store = cache or default_cache
+            key = make_key(args, kwargs)
+            flight_key = f"{namespace}/{key}"
+
+            def fill():
+                with store.lock(namespace, key):
+                    # 잠금을 기다리는 동안 다른 프로세스가 채웠을 수 있음
+                    hit, value = store.get(namespace, key, ttl, record=False)
+                    if hit:
+                        return value
+                    try:
+                        value = func(*args, **kwargs)
+                    except stale_on:
+                        stale, value = store.get(namespace, key, record=False)
+                        if not stale:
+                            raise
+                        logger.info("%s: 만료된 캐시로 응답", namespace)
+                        return value
+                    store.set(namespace, key, value)
+                    return value
+
+            hit, value = store.get(namespace, key, ttl)
+            if not hit:
+                entry = None
+                if stale_while_revalidate and allow_stale:
+                    entry = store.get_entry(namespace, key)
+                if entry is not None and time.time() - entry[0] < ttl + stale_while_revalidate:
+                    _refresh_in_background(flight_key, fill)
+                    value = entry[1]
+                else:
+                    value = _flights.do(flight_key, fill)
+
+            return _copy(value)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return lookup(args, kwargs, allow_stale=True)
+
+        def revalidate(*args, **kwargs):
+            """TTL 이 지났으면 만료된 값 대신 새로 받을 때까지 기다림 (stale_while_revalidate 무시)"""
+            return lookup(args, kwargs, allow_stale=False)
+
+        def is_cached(*args, **kwargs) -> bool:
+            """호출하지 않고 캐시 적중 여부만 확인"""
+            store = cache or default_cache
+            return store.get(namespace, make_key(args, kwargs), ttl, record=False)[0]
+
+        def cached_at(*args, **kwargs) -> Optional[float]:
+            """캐시된 값의 저장 시각 (time.time 기준, 없으면 None)"""
+            entry = (cache or default_cache).get_entry(namespace, make_key(args, kwargs))
+            return entry[0] if entry is not None else None
+
+        def is_refreshing(*args, **kwargs) -> bool:
+            """백그라운드 갱신 진행 여부"""
+            with _refreshing_lock:
+                return f"{namespace}/{make_key(args, kwargs)}" in _refreshing
+
+        wrapper.revalidate = revalidate
+        wrapper.is_cached = is_cached
+        wrapper.cached_at = cached_at
+        wrapper.is_refreshing = is_refreshing
+        wrapper.cache_clear = lambda: (cache or default_cache).clear(namespace)
+        return wrapper
+
+    return decorator
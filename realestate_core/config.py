@@ -0,0 +1,27 @@
+"""
+환경 변수 / 경로 설정
+
+.env 는 이 모듈을 처음 import 할 때 한 번만 읽습니다.
+"""
+
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+KAKAO_REST_KEY = os.getenv("JHRERSTAPI")
+VWORLD_API_KEY = os.getenv("V_World_API")
+MOLIT_API_KEY = os.getenv("DATAPORTAL")
+
+# 프로젝트 루트 (realestate_core 의 상위 디렉터리)
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 대시보드와 배치 작업이 함께 쓰는 디스크 캐시 위치
+CACHE_DIR = os.getenv("REALESTATE_CACHE_DIR", os.path.join(PROJECT_DIR, ".cache"))
+
+# 프로세스 메모리 캐시 예산 (넘으면 LRU 축출, 디스크 캐시는 그대로)
+CACHE_MEMORY_BYTES = int(os.getenv("REALESTATE_CACHE_MEMORY_MB", "256")) * 1024 ** 2
+
+BJDONG_CSV = os.path.join(PROJECT_DIR, "bjdong_codes.csv")
+FULL_BJDONG_CSV = os.path.join(PROJECT_DIR, "bjdong_full_codes.csv")
@@ -0,0 +1,118 @@
+"""
+국토부 실거래 데이터셋 정의
+
+공공데이터포털 RTMS 서비스는 모두 (LAWD_CD, DEAL_YMD) 로 조회하고 같은 XML
+구조(<items><item>...)를 돌려주므로, 데이터셋마다 다른 것은 서비스 이름과
+필드 이름뿐입니다. 여기에 그 차이만 선언해 두면 molit.fetch_dataset 이 조회,
+페이지 처리, 파싱, 압축 스키마, 캐시, 호출 한도를 모두 똑같이 적용합니다.
+
+컬럼 이름은 데이터셋이 달라도 같은 뜻이면 같게 씁니다. 단지/건물 이름은 모두
+'apt', 매매가는 'price', 전월세는 'deposit'/'monthly_rent' 입니다.
+"""
+
+from typing import Dict, NamedTuple, Tuple, Union
+
+# 하나의 태그, 또는 이어 붙일 태그 묶음 (예: 법정동 코드 = sggCd + umdCd)
+FieldSource = Union[str, Tuple[str, ...]]
+
+
+class MolitDataset(NamedTuple):
+    name: str
+    title: str
+    service: str                      # 예: RTMSDataSvcAptTrade
+    fields: Dict[str, FieldSource]    # 컬럼 -> XML 태그
+    dtypes: Dict[str, str] = {}       # COMPACT_DTYPES 에 없는 컬럼의 압축 타입
+    required: Tuple[str, ...] = ()    # 숫자로 읽히지 않으면 행을 버릴 컬럼
+
+    @property
+    def path(self) -> str:
+        return f"{self.service}/get{self.service}"
+
+
+# 모든 데이터셋에 공통인 위치/날짜 필드
+_COMMON = {
+    'dong': 'umdNm',
+    'jibun': 'jibun',
+    'bjdong_cd': ('sggCd', 'umdCd'),
+    'year': 'dealYear',
+    'month': 'dealMonth',
+    'day': 'dealDay',
+}
+
+_RENT = {
+    'deposit': 'deposit',
+    'monthly_rent': 'monthlyRent',
+    'contract_type': 'contractType',
+    'contract_term': 'contractTerm',
+    'pre_deposit': 'preDeposit',
+    'pre_monthly_rent': 'preMonthlyRent',
+}
+
+_RENT_DTYPES = {
+    'deposit': 'int32',
+    'monthly_rent': 'int32',
+    'contract_type': 'category',
+    'contract_term': 'category',
+    'pre_deposit': 'int32',
+    'pre_monthly_rent': 'int32',
+}
+
+
+DATASETS: Dict[str, MolitDataset] = {ds.name: ds for ds in [
+    MolitDataset(
+        'apt_trade', '아파트 매매', 'RTMSDataSvcAptTrade',
+        {'apt': 'aptNm', 'price': 'dealAmount', **_COMMON, 'area': 'excluUseAr',
+         'floor': 'floor', 'build_year': 'buildYear'},
+        required=('price', 'area'),
+    ),
+    MolitDataset(
+        'apt_rent', '아파트 전월세', 'RTMSDataSvcAptRent',
+        {'apt': 'aptNm', **_RENT, **_COMMON, 'area': 'excluUseAr',
+         'floor': 'floor', 'build_year': 'buildYear'},
+        dtypes=_RENT_DTYPES,
+        required=('deposit', 'area'),
+    ),
+    MolitDataset(
+        'offi_trade', '오피스텔 매매', 'RTMSDataSvcOffiTrade',
+        {'apt': 'offiNm', 'price': 'dealAmount', **_COMMON, 'area': 'excluUseAr',
+         'floor': 'floor', 'build_year': 'buildYear'},
+        required=('price', 'area'),
+    ),
+    MolitDataset(
+        'offi_rent', '오피스텔 전월세', 'RTMSDataSvcOffiRent',
+        {'apt': 'offiNm', **_RENT, **_COMMON, 'area': 'excluUseAr',
+         'floor': 'floor', 'build_year': 'buildYear'},
+        dtypes=_RENT_DTYPES,
+        required=('deposit', 'area'),
+    ),
+    MolitDataset(
+        'rh_trade', '연립다세대 매매', 'RTMSDataSvcRHTrade',
+        {'apt': 'mhouseNm', 'house_type': 'houseType', 'price': 'dealAmount', **_COMMON,
+         'area': 'excluUseAr', 'land_area': 'landAr', 'floor': 'floor',
+         'build_year': 'buildYear'},
+        dtypes={'house_type': 'category', 'land_area': 'float32'},
+        required=('price', 'area'),
+    ),
+    MolitDataset(
+        'rh_rent', '연립다세대 전월세', 'RTMSDataSvcRHRent',
+        {'apt': 'mhouseNm', 'house_type': 'houseType', **_RENT, **_COMMON,
+         'area': 'excluUseAr', 'floor': 'floor', 'build_year': 'buildYear'},
+        dtypes={'house_type': 'category', **_RENT_DTYPES},
+        required=('deposit', 'area'),
+    ),
+    MolitDataset(
+        'presale', '아파트 분양권전매', 'RTMSDataSvcSilvTrade',
+        {'apt': 'aptNm', 'ownership': 'ownershipGbn', 'price': 'dealAmount', **_COMMON,
+         'area': 'excluUseAr', 'floor': 'floor'},
+        dtypes={'ownership': 'category'},
+        required=('price', 'area'),
+    ),
+]}
+
+
+def get_dataset(name: str) -> MolitDataset:
+    """이름으로 데이터셋 조회 (없으면 KeyError 에 가능한 이름을 담아 던짐)"""
+    try:
+        return DATASETS[name]
+    except KeyError:
+        raise KeyError(f"알 수 없는 데이터셋 {name!r} (가능: {', '.join(DATASETS)})") from None
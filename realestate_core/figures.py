@@ -0,0 +1,238 @@
+"""
+그림·지도 생성 (plotly, folium)
+
+시세 통계 탭의 평수별 거래가 분포 그림과 가격 지도(기본 지도 + 마커 레이어)를
+만듭니다. 대시보드는 이 함수들을 캐시로 감싸기만 하고, 벤치마크와 배치 작업도
+Streamlit 없이 같은 그림을 만들 수 있습니다.
+
+    fig = price_area_figure(df, mode="density")
+    m = build_price_map((37.5, 127.03))
+    for layer in build_marker_layers(markers, price_quartiles(df)):
+        layer.add_to(m)
+
+plotly/folium 은 무거우므로 함수를 처음 호출할 때 import 합니다.
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .importtime import lazy_import
+from .jeonse import get_ratio_color
+from .stats import price_area_histogram, sample_rows
+from .transforms import format_price_to_uk, price_color
+from .viewport import ViewportMarkers
+
+# 평수별 거래가 분포: 이 건수까지는 거래마다 점(WebGL), 넘으면 구간 집계 또는 표본 점
+SCATTER_MAX_POINTS = 5_000
+
+MAP_ZOOM_START = 14
+
+
+# ==================== 평수별 거래가 분포 ====================
+
+def price_area_figure(df: pd.DataFrame, mode: str = "points",
+                      max_points: int = SCATTER_MAX_POINTS):
+    """
+    평수별 거래가 분포 그림 (plotly Figure)
+
+    mode 는 "points"(거래마다 점), "sample"(max_points 개 표본 점), "density"(구간 집계)이며,
+    뒤의 두 방식은 그림 크기가 거래 건수와 무관합니다.
+    """
+    labels = {"py": "면적 (평)", "price": "거래가 (만원)"}
+
+    if mode == "density":
+        go = lazy_import('plotly.graph_objects')
+        hist = price_area_histogram(df)
+        x_edges, y_edges = hist['x_edges'], hist['y_edges']
+        counts = hist['counts'].astype('float64')
+        counts[counts == 0] = np.nan  # 거래 없는 구간은 투명하게
+        fig = go.Figure(go.Heatmap(
+            x=(x_edges[:-1] + x_edges[1:]) / 2,
+            y=(y_edges[:-1] + y_edges[1:]) / 2,
+            z=counts,
+            colorscale="Viridis",
+            colorbar=dict(title="거래 수"),
+            hovertemplate="%{x:.1f}평 · %{y:,.0f}만원<br>%{z:,}건<extra></extra>"
+        ))
+        fig.update_layout(
+            title=f"평수별 거래가 분포 ({len(df):,}건, 구간 집계)",
+            xaxis_title=labels["py"],
+            yaxis_title=labels["price"]
+        )
+    else:
+        px = lazy_import('plotly.express')
+        rows = df if mode == "points" else sample_rows(df, max_points)
+        title = "평수별 거래가 분포"
+        if len(rows) < len(df):
+            title += f" (표본 {len(rows):,}/{len(df):,}건)"
+        fig = px.scatter(
+            rows,
+            x="py",
+            y="price",
+            size="price",
+            color="price",
+            hover_data=["apt", "dong", "floor"],
+            title=title,
+            labels=labels,
+            color_continuous_scale="Viridis",
+            render_mode="webgl"
+        )
+
+    fig.update_layout(height=400)
+    return fig
+
+
+# ==================== 가격 지도 ====================
+
+def build_price_map(center: Tuple[float, float], by_ratio: bool = False,
+                    zoom_start: int = MAP_ZOOM_START):
+    """
+    범례를 올린 기본 Folium 지도
+
+    마커는 build_marker_layers 레이어로 따로 넘겨, 지도를 움직여도 기본 지도는
+    다시 그리지 않습니다.
+    """
+    folium = lazy_import('folium')
+    center_lat, center_lon = center
+
+    # Folium 지도 생성
+    m = folium.Map(
+        location=[center_lat, center_lon],
+        zoom_start=zoom_start,
+        tiles="cartodbpositron"
+    )
+
+    # 범례 추가
+    if not by_ratio:
+        legend_title = "가격대별 색상"
+        legend_items = [("#4CAF50", "하위 25%"), ("#2196F3", "25~50%"),
+                        ("#FF9800", "50~75%"), ("#F44336", "상위 25%")]
+    else:
+        legend_title = "전세가율"
+        legend_items = [("#4CAF50", "60% 미만"), ("#2196F3", "60~70%"),
+                        ("#FF9800", "70~80%"), ("#F44336", "80% 이상"), ("#9E9E9E", "전세 거래 없음")]
+    legend_rows = "".join(
+        f'<div><span style="color: {color};">●</span> {label}</div>' for color, label in legend_items
+    )
+    legend_html = f'''
+    <div style="
+        position: fixed;
+        bottom: 50px;
+        left: 50px;
+        background: white;
+        padding: 15px;
+        border-radius: 10px;
+        box-shadow: 0 2px 6px rgba(0,0,0,0.3);
+        z-index: 1000;
+        font-size: 13px;
+    ">
+        <h4 style="margin: 0 0 10px 0;">{legend_title}</h4>
+        {legend_rows}
+    </div>
+    '''
+    m.get_root().html.add_child(folium.Element(legend_html))
+    return m
+
+
+def build_marker_layers(markers: ViewportMarkers, quartiles: Tuple[float, float, float],
+                        by_ratio: bool = False, brokers: Optional[pd.DataFrame] = None) -> list:
+    """
+    뷰포트 마커 레이어
+
+    단지별이면 평균 거래가 말풍선, 집계면 단지 수·평균가 원형 마커입니다.
+    by_ratio 면 전세가율로 색칠하고, brokers 를 주면 중개업소를 작은 점으로 얹습니다.
+    """
+    folium = lazy_import('folium')
+    layer = folium.FeatureGroup(name="실거래")
+    for row in markers.frame.itertuples(index=False):
+        price_display = format_price_to_uk(int(round(row.avg_price)))
+        ratio = getattr(row, 'ratio', np.nan)
+        color = get_ratio_color(ratio) if by_ratio else price_color(row.avg_price, quartiles)
+
+        if not markers.detail:
+            # 집계 마커: 거래가 많을수록 조금 크게
+            size = 40 + 6 * min(4, int(np.log10(max(row.count, 1))))
+            icon_html = f'''
+            <div style="
+                background: {color};
+                color: white;
+                width: {size}px;
+                height: {size}px;
+                margin: -{size // 2}px 0 0 -{size // 2}px;
+                border-radius: 50%;
+                border: 2px solid white;
+                box-shadow: 0 2px 6px rgba(0,0,0,0.3);
+                display: flex;
+                flex-direction: column;
+                align-items: center;
+                justify-content: center;
+                font-size: 11px;
+                font-weight: bold;
+                line-height: 1.2;
+            ">
+                <span>{price_display}</span><span style="font-weight: normal;">{row.complexes}단지</span>
+            </div>
+            '''
+            tooltip = f"{row.complexes}개 단지 · {row.count:,}건 · 평균 {price_display}"
+            if not pd.isna(ratio):
+                tooltip += f" · 전세가율 {ratio:.1f}%"
+            folium.Marker(
+                [row.lat, row.lon], icon=folium.DivIcon(html=icon_html), tooltip=tooltip
+            ).add_to(layer)
+            continue
+
+        ratio_row = ""
+        if by_ratio:
+            ratio_text = "-" if pd.isna(ratio) else f"{ratio:.1f}%"
+            ratio_row = f"<tr><td><b>전세가율</b></td><td>{ratio_text}</td></tr>"
+
+        # 카카오 스타일 마커
+        icon_html = f'''
+        <div style="
+            background: {color};
+            color: white;
+            padding: 5px 10px;
+            border-radius: 15px;
+            font-size: 12px;
+            font-weight: bold;
+            border: 2px solid white;
+            box-shadow: 0 2px 6px rgba(0,0,0,0.3);
+            white-space: nowrap;
+        ">
+            {price_display}
+        </div>
+        '''
+
+        popup_html = f"""
+        <div style="font-family: sans-serif; min-width: 200px;">
+            <h4 style="margin: 0 0 10px 0; color: #333;">{row.apt}</h4>
+            <table style="width: 100%; font-size: 13px;">
+                <tr><td><b>평균 거래가</b></td><td>{price_display}</td></tr>
+                <tr><td><b>거래</b></td><td>{row.count:,}건</td></tr>
+                <tr><td><b>주소</b></td><td>{row.dong} {row.jibun}</td></tr>
+                <tr><td><b>최근 거래일</b></td><td>{row.last_date.strftime('%Y-%m-%d')}</td></tr>
+                {ratio_row}
+            </table>
+        </div>
+        """
+
+        folium.Marker(
+            [row.lat, row.lon],
+            icon=folium.DivIcon(html=icon_html),
+            popup=folium.Popup(popup_html, max_width=300)
+        ).add_to(layer)
+
+    layers = [layer]
+    if brokers is not None and not brokers.empty:
+        broker_layer = folium.FeatureGroup(name="중개업소")
+        phones = brokers['phone'] if 'phone' in brokers else [''] * len(brokers)
+        for name, phone, lat, lon in zip(brokers['place_name'], phones,
+                                         brokers['lat'], brokers['lon']):
+            folium.CircleMarker(
+                [lat, lon], radius=4, color="#6D4C41", fill=True, fill_opacity=0.8,
+                tooltip=f"{name} {phone or ''}".strip()
+            ).add_to(broker_layer)
+        layers.append(broker_layer)
+    return layers
@@ -0,0 +1,59 @@
+"""
+원자적 파일 쓰기
+
+여러 스레드·프로세스가 함께 읽고 쓰는 파일(디스크 캐시, 저장소 파티션, 법정동
+스냅샷, API 한도 장부, 감시 목록, 접근 통계, 감시 지문)을 같은 디렉터리의 임시
+파일에 쓴 뒤 os.replace 로 바꿔 넣습니다.
+읽는 쪽은 항상 이전 파일이나 완성된 새 파일 중 하나만 봅니다.
+
+    data = atomic_json_read(path, {})
+    data['count'] = data.get('count', 0) + 1
+    atomic_json_write(path, data)
+
+    with atomic_write(path + '.npy') as f:
+        np.save(f, ids)
+
+읽기-수정-쓰기 전체를 직렬화하려면 호출하는 쪽에서 file_lock 으로 감쌉니다.
+"""
+
+import contextlib
+import json
+import os
+import tempfile
+from typing import Any, BinaryIO, Iterator
+
+
+@contextlib.contextmanager
+def atomic_write(path: str) -> Iterator[BinaryIO]:
+    """
+    임시 파일에 쓰고 블록이 끝나면 path 로 교체 (바이너리 모드)
+
+    블록에서 예외가 나면 임시 파일을 지우고 path 는 그대로 둡니다.
+    """
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=os.path.basename(path) + '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            yield f
+        os.replace(tmp, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmp)
+        raise
+
+
+def atomic_json_read(path: str, default: Any = None) -> Any:
+    """JSON 파일 읽기 (없거나 깨졌으면 default)"""
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def atomic_json_write(path: str, data: Any, **dump_kwargs):
+    """JSON 파일 원자적 쓰기 (한글은 그대로, dump_kwargs 는 json.dump 에 전달)"""
+    dump_kwargs.setdefault('ensure_ascii', False)
+    with atomic_write(path) as f:
+        f.write(json.dumps(data, **dump_kwargs).encode('utf-8'))
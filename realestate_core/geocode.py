@@ -0,0 +1,350 @@
+"""
+주소 -> 좌표 변환 및 카카오 로컬 API
+
+변환에 성공한 주소는 프로세스 공용 공간 인덱스(place_index)에 쌓여, 반경/경계
+상자 질의(places_near)를 네트워크 없이 처리합니다. 주변 중개업소는 격자 타일
+단위로 받아 디스크에 캐시하고, 겹치는 질의는 타일을 합쳐 답합니다.
+
+VWorld/Kakao 호출은 quota.default_scheduler 를 거칩니다. 한도 초과
+(QuotaExceeded)와 일시적인 실패(GeocodeError: 네트워크 오류, 시간 초과, 응답
+형식 오류)는 결과로 캐시하지 않고, 만료된 캐시가 있으면 그 값을, 없으면
+get_coords 에서 다른 서비스로 넘어갑니다. (None, None) 은 서비스가 "결과 없음"
+으로 답한 주소만 캐시됩니다.
+"""
+
+import logging
+import math
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+import requests
+
+from . import config
+from .cache import memoize
+from .quota import QuotaExceeded, default_scheduler
+from .spatial import M_PER_DEG_LAT, SpatialIndex, haversine_m
+from .tracing import span
+
+logger = logging.getLogger(__name__)
+
+Coords = Tuple[Optional[float], Optional[float]]
+
+VWORLD_ADDRESS_URL = 'https://api.vworld.kr/req/address'
+KAKAO_ADDRESS_URL = "https://dapi.kakao.com/v2/local/search/address.json"
+KAKAO_KEYWORD_URL = "https://dapi.kakao.com/v2/local/search/keyword.json"
+
+# 좌표 캐시: 하루가 지나면 새로 받되, 30일 안의 값은 기다리지 않고 먼저 씀
+# (야간 캐시 워밍 결과가 아침 첫 조회까지 유효하도록)
+GEOCODE_TTL = 24 * 3600
+GEOCODE_STALE = 30 * 24 * 3600
+
+# 응답 파싱 중 나는 예외 (형식이 바뀌었거나 오류 응답)
+_PARSE_ERRORS = (ValueError, KeyError, IndexError, TypeError)
+
+# 변환된 주소 공간 인덱스 (id = 주소)
+_places = SpatialIndex()
+_place_addresses = set()
+_places_lock = threading.Lock()
+
+
+class GeocodeError(Exception):
+    """일시적인 좌표 변환 실패 (캐시하지 않고 다음에 다시 시도)"""
+
+
+@memoize('geocode_vworld', ttl=GEOCODE_TTL, stale_on=(QuotaExceeded, GeocodeError),
+         stale_while_revalidate=GEOCODE_STALE)
+def get_coords_vworld(address: str) -> Coords:
+    """
+    VWorld API를 사용한 주소 -> 좌표 변환
+
+    Raises:
+        GeocodeError: 네트워크 오류나 오류 응답 (주소를 찾지 못한 경우는 (None, None))
+    """
+    if not config.VWORLD_API_KEY:
+        return None, None
+
+    url = VWORLD_ADDRESS_URL
+    params = {
+        'service': 'address',
+        'request': 'getCoord',
+        'key': config.VWORLD_API_KEY,
+        'type': 'PARCEL',
+        'address': address
+    }
+
+    try:
+        with span('geocode.vworld'):
+            res = default_scheduler.call(
+                'vworld', lambda: requests.get(url, params=params, timeout=5)
+            )
+        response = res.json()['response']
+        if response['status'] == 'OK':
+            point = response['result']['point']
+            return float(point['y']), float(point['x'])
+    except (requests.RequestException, *_PARSE_ERRORS) as e:
+        logger.warning("좌표 변환 실패: %s - %s", address, e)
+        raise GeocodeError(f"VWorld: {e}") from e
+
+    if response['status'] != 'NOT_FOUND':
+        logger.warning("좌표 변환 실패: %s - %s", address, response.get('error'))
+        raise GeocodeError(f"VWorld: {response['status']} {response.get('error')}")
+    return None, None
+
+
+@memoize('geocode_kakao', ttl=GEOCODE_TTL, stale_on=(QuotaExceeded, GeocodeError),
+         stale_while_revalidate=GEOCODE_STALE)
+def get_coords_kakao(address: str) -> Coords:
+    """
+    Kakao API를 사용한 주소 -> 좌표 변환 (대안)
+
+    Raises:
+        GeocodeError: 네트워크 오류나 오류 응답 (주소를 찾지 못한 경우는 (None, None))
+    """
+    if not config.KAKAO_REST_KEY:
+        return None, None
+
+    url = KAKAO_ADDRESS_URL
+    headers = {"Authorization": f"KakaoAK {config.KAKAO_REST_KEY}"}
+    params = {"query": address}
+
+    try:
+        with span('geocode.kakao'):
+            res = default_scheduler.call(
+                'kakao', lambda: requests.get(url, headers=headers, params=params, timeout=5)
+            )
+        documents = res.json()['documents']
+        if documents:
+            return float(documents[0]['y']), float(documents[0]['x'])
+    except (requests.RequestException, *_PARSE_ERRORS) as e:
+        logger.warning("카카오 좌표 변환 실패: %s - %s", address, e)
+        raise GeocodeError(f"Kakao: {e}") from e
+
+    return None, None
+
+
+def get_coords(address: str, revalidate: bool = False) -> Coords:
+    """
+    VWorld 로 먼저 변환하고, 실패하면 카카오로 재시도
+
+    두 서비스 모두 한도에 걸리거나 일시적으로 실패하면 (None, None) 을 반환합니다
+    (캐시하지 않음).
+
+    Args:
+        revalidate: 캐시가 만료됐으면 만료된 좌표를 쓰지 않고 새로 받음 (캐시 워밍용)
+    """
+    vworld = get_coords_vworld.revalidate if revalidate else get_coords_vworld
+    kakao = get_coords_kakao.revalidate if revalidate else get_coords_kakao
+    lat, lon = None, None
+    try:
+        lat, lon = vworld(address)
+    except (QuotaExceeded, GeocodeError) as e:
+        logger.info("%s", e)
+    if not lat:
+        try:
+            lat, lon = kakao(address)
+        except (QuotaExceeded, GeocodeError) as e:
+            logger.info("%s", e)
+    if lat:
+        _remember_place(address, lat, lon)
+    return lat, lon
+
+
+def _remember_place(address: str, lat: float, lon: float):
+    with _places_lock:
+        if address in _place_addresses:
+            return
+        _place_addresses.add(address)
+    _places.add([lat], [lon], ids=[address])
+
+
+def place_index() -> SpatialIndex:
+    """지금까지 get_coords 로 변환한 주소의 공간 인덱스"""
+    return _places
+
+
+def places_near(lat: float, lon: float, radius_m: float) -> List[Tuple[str, float]]:
+    """반경 안의 변환된 주소 [(주소, 거리 m)] - 가까운 순, API 호출 없음"""
+    pos, dist = _places.radius(lat, lon, radius_m)
+    return list(zip(_places.ids_at(pos), dist.tolist()))
+
+
+def summarize_complexes(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    단지(동, 지번, 아파트명) 단위 집계 (좌표 없음)
+
+    Returns:
+        pd.DataFrame: dong, jibun, apt, count, avg_price, last_date
+    """
+    return (
+        df.groupby(['dong', 'jibun', 'apt'], observed=True)
+        .agg(count=('price', 'size'), avg_price=('price', 'mean'), last_date=('date', 'max'))
+        .reset_index()
+    )
+
+
+def geocode_complexes(df: pd.DataFrame, sido: str, sigungu: str) -> pd.DataFrame:
+    """
+    단지(동, 지번, 아파트명) 단위 집계 + 좌표
+
+    같은 지번의 거래는 한 번만 좌표 변환합니다.
+
+    Returns:
+        pd.DataFrame: dong, jibun, apt, count, avg_price, last_date, lat, lon
+    """
+    complexes = summarize_complexes(df)
+
+    coords = [
+        get_coords(f"{sido} {sigungu} {dong} {jibun}")
+        for dong, jibun in zip(complexes['dong'], complexes['jibun'])
+    ]
+    complexes['lat'] = [lat for lat, _ in coords]
+    complexes['lon'] = [lon for _, lon in coords]
+    return complexes
+
+
+# ==================== 주변 중개업소 (타일 캐시) ====================
+
+# 타일 한 변(도). 0.02도 ≈ 남북 2.2km x 동서 1.8km
+BROKER_TILE_DEG = 0.02
+BROKER_TILE_TTL = 7 * 24 * 3600
+# 카카오 키워드 검색은 한 질의에 최대 45건(15건 x 3페이지)까지만 넘겨 주므로
+# 그보다 많으면 타일을 4등분해 다시 받음
+KAKAO_PAGE_SIZE = 15
+KAKAO_MAX_PAGES = 3
+BROKER_MAX_SPLIT = 3
+BROKER_QUERY = "부동산"
+
+
+class KakaoAPIError(Exception):
+    """카카오 로컬 API 호출 실패 (캐시하지 않음)"""
+
+
+def _tile_rect(tx: int, ty: int, level: int) -> Tuple[float, float, float, float]:
+    """타일 -> (서, 남, 동, 북)"""
+    size = BROKER_TILE_DEG / 2 ** level
+    return tx * size, ty * size, (tx + 1) * size, (ty + 1) * size
+
+
+def _search_rect(rect: Tuple[float, float, float, float],
+                 can_split: bool) -> Tuple[List[Dict], bool]:
+    """
+    사각형 안의 키워드 검색 결과 전체 페이지 (문서 목록, 45건 제한에 걸렸는지)
+
+    첫 페이지에서 이미 제한에 걸린 것이 보이고 나눠 받을 수 있으면 나머지
+    페이지는 받지 않습니다.
+    """
+    url = KAKAO_KEYWORD_URL
+    headers = {"Authorization": f"KakaoAK {config.KAKAO_REST_KEY}"}
+    documents = []
+    for page in range(1, KAKAO_MAX_PAGES + 1):
+        params = {
+            "query": BROKER_QUERY,
+            "rect": ",".join(f"{v:.6f}" for v in rect),
+            "page": page,
+            "size": KAKAO_PAGE_SIZE,
+        }
+        try:
+            res = default_scheduler.call(
+                'kakao', lambda: requests.get(url, headers=headers, params=params, timeout=5)
+            )
+            res.raise_for_status()
+            data = res.json()
+        except (requests.RequestException, ValueError) as e:
+            raise KakaoAPIError(f"중개업소 검색 실패 {rect}: {e}") from e
+
+        documents.extend(data.get('documents', []))
+        meta = data.get('meta', {})
+        truncated = meta.get('total_count', 0) > meta.get('pageable_count', meta.get('total_count', 0))
+        if truncated and can_split:
+            return documents, True
+        if meta.get('is_end', True):
+            break
+    return documents, truncated
+
+
+@memoize('kakao_broker_tile', ttl=BROKER_TILE_TTL, stale_on=(QuotaExceeded, KakaoAPIError))
+def fetch_broker_tile(tx: int, ty: int, level: int = 0) -> List[Dict]:
+    """
+    타일 하나의 중개업소 전체 (페이지를 끝까지 받고, 45건 제한에 걸리면 4등분)
+
+    Raises:
+        KakaoAPIError, QuotaExceeded: 만료된 타일 캐시가 없을 때만 전달
+    """
+    with span('brokers.tile', level=level):
+        documents, truncated = _search_rect(_tile_rect(tx, ty, level),
+                                            can_split=level < BROKER_MAX_SPLIT)
+    if not truncated or level >= BROKER_MAX_SPLIT:
+        if truncated:
+            logger.info("중개업소 타일 %s 는 45건까지만 받음", (tx, ty, level))
+        return documents
+
+    merged = {}
+    for dx in (0, 1):
+        for dy in (0, 1):
+            for doc in fetch_broker_tile(tx * 2 + dx, ty * 2 + dy, level + 1):
+                merged[doc.get('id')] = doc
+    return list(merged.values())
+
+
+def brokers_in_bbox(south: float, west: float, north: float, east: float) -> pd.DataFrame:
+    """
+    경계 상자 안의 중개업소 (겹치는 타일을 캐시에서 합침)
+
+    Returns:
+        pd.DataFrame: id, place_name, phone, address_name, road_address_name,
+            place_url, lat, lon (타일 조회에 실패한 구역은 빠짐)
+    """
+    if not config.KAKAO_REST_KEY:
+        return pd.DataFrame()
+
+    tx0, tx1 = int(west // BROKER_TILE_DEG), int(east // BROKER_TILE_DEG)
+    ty0, ty1 = int(south // BROKER_TILE_DEG), int(north // BROKER_TILE_DEG)
+    merged = {}
+    for tx in range(tx0, tx1 + 1):
+        for ty in range(ty0, ty1 + 1):
+            try:
+                documents = fetch_broker_tile(tx, ty)
+            except (KakaoAPIError, QuotaExceeded) as e:
+                logger.info("%s", e)
+                continue
+            for doc in documents:
+                merged[doc.get('id')] = doc
+
+    if not merged:
+        return pd.DataFrame()
+    df = pd.DataFrame(list(merged.values()))
+    df['lat'] = pd.to_numeric(df.pop('y'), errors='coerce')
+    df['lon'] = pd.to_numeric(df.pop('x'), errors='coerce')
+    inside = df['lat'].between(south, north) & df['lon'].between(west, east)
+    return df[inside].reset_index(drop=True)
+
+
+def fetch_kakao_property_info(lat: float, lon: float, radius: int = 500) -> Dict:
+    """
+    카카오 지도 API로 주변 부동산 정보 조회
+
+    카카오는 장소 검색 API를 제공하지만, 매물 정보는 제공하지 않습니다.
+    대신 주변 부동산 중개업소 정보를 가져올 수 있습니다.
+
+    반경을 덮는 타일을 디스크 캐시(BROKER_TILE_TTL)에서 합쳐 답하므로 겹치는
+    질의는 API 를 다시 부르지 않고, 15건 제한 없이 반경 안의 전체를 거리순으로
+    돌려줍니다 (카카오 응답 형식: documents, meta).
+    """
+    dlat = radius / M_PER_DEG_LAT
+    dlon = dlat / max(math.cos(math.radians(lat)), 1e-6)
+    brokers = brokers_in_bbox(lat - dlat, lon - dlon, lat + dlat, lon + dlon)
+    if brokers.empty:
+        return {}
+
+    distance = haversine_m(lat, lon, brokers['lat'], brokers['lon'])
+    brokers = brokers.assign(distance=distance)[distance <= radius].sort_values('distance')
+    documents = []
+    for doc in brokers.to_dict(orient='records'):
+        doc_lat, doc_lon = doc.pop('lat'), doc.pop('lon')
+        doc.update(x=str(doc_lon), y=str(doc_lat), distance=str(int(round(doc['distance']))))
+        documents.append(doc)
+    return {
+        'documents': documents,
+        'meta': {'total_count': len(documents), 'pageable_count': len(documents), 'is_end': True},
+    }
@@ -0,0 +1,67 @@
+"""
+지연 import 와 import 시간 측정
+
+무거운 시각화 모듈(folium, plotly 등)은 필요한 탭에서 lazy_import 로 불러오고,
+처음 불러올 때 걸린 시간을 IMPORT_TIMES 에 기록합니다.
+measure_import_times 는 새 인터프리터를 `-X importtime` 으로 띄워
+콜드 스타트 기준 모듈별 import 시간을 측정합니다.
+"""
+
+import importlib
+import subprocess
+import sys
+import time
+from types import ModuleType
+from typing import Dict, Iterable, List, NamedTuple
+
+# 모듈 이름 -> 이 프로세스에서 처음 import 하는 데 걸린 시간(ms)
+IMPORT_TIMES: Dict[str, float] = {}
+
+
+def lazy_import(name: str) -> ModuleType:
+    """모듈을 처음 필요할 때 import (이미 불러온 모듈은 그대로 반환)"""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+
+    start = time.perf_counter()
+    module = importlib.import_module(name)
+    IMPORT_TIMES[name] = (time.perf_counter() - start) * 1000
+    return module
+
+
+class ImportTiming(NamedTuple):
+    module: str
+    self_ms: float
+    cumulative_ms: float
+    depth: int
+
+
+def measure_import_times(modules: Iterable[str], timeout: float = 60) -> List[ImportTiming]:
+    """
+    새 파이썬 프로세스에서 modules 를 import 하며 `-X importtime` 결과를 수집
+
+    Returns:
+        누적 시간 내림차순 정렬된 모듈별 측정값 (depth 0 은 최상위 import)
+    """
+    code = '; '.join(f'import {m}' for m in modules)
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        capture_output=True, text=True, timeout=timeout
+    )
+
+    timings = []
+    for line in proc.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        except ValueError:
+            continue
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        timings.append(ImportTiming(
+            name.strip(), int(self_us) / 1000, int(cumulative_us) / 1000, depth
+        ))
+
+    return sorted(timings, key=lambda t: t.cumulative_ms, reverse=True)
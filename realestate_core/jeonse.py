@@ -0,0 +1,193 @@
+"""
+전세가율 집계 (매매 x 전세 조인)
+
+같은 단지·면적대의 매매가와 전세 보증금을 맞대어 전세가율(보증금 / 매매가)과
+갭(매매가 - 보증금)을 구합니다. 조인 키는 (법정동 코드, 단지, 면적대)이며,
+매매 한 건에 거래 월이 가장 가까운(±window_months) 달의 전세 보증금 중앙값을
+붙입니다.
+
+수백만 행에서도 빠르도록 문자열 비교 없이 처리합니다.
+
+1. 키 컬럼을 카테고리 코드(정수)로 바꿔 하나의 int64 키로 합치고
+2. 전세를 (키, 월) 로 집계해 행 수를 줄인 뒤
+3. (키, 월)을 정수 하나로 펴서 매매와 merge_asof 로 붙입니다.
+
+입력은 compact_transactions 결과(apt_trade / apt_rent 데이터셋)이며 수정하지
+않습니다.
+"""
+
+from typing import Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+# 면적대 폭(㎡) - 84.xx 와 59.xx 처럼 같은 평형은 한 면적대로 묶임
+AREA_BAND_M2 = 5
+WINDOW_MONTHS = 3
+JOIN_KEYS = ('bjdong_cd', 'apt', 'area_band')
+
+RATIO_COLUMNS = ['bjdong_cd', 'dong', 'apt', 'area_band', 'trade_price', 'jeonse_deposit',
+                 'ratio', 'gap', 'trades', 'rents', 'last_trade']
+
+# 전세가율 구간별 색상 (높을수록 보증금 회수 위험)
+RATIO_BINS = [(60, "#4CAF50"), (70, "#2196F3"), (80, "#FF9800")]
+RATIO_HIGH_COLOR = "#F44336"
+
+
+def area_band(area: pd.Series) -> pd.Series:
+    """전용면적 -> 면적대 하한(㎡)"""
+    return ((area // AREA_BAND_M2) * AREA_BAND_M2).astype('int16')
+
+
+def jeonse_only(rents: pd.DataFrame) -> pd.DataFrame:
+    """전월세 중 순수 전세(월세 0, 보증금 있음)만"""
+    return rents[(rents['monthly_rent'] == 0).to_numpy() & (rents['deposit'] > 0).to_numpy()]
+
+
+def _month_index(dates: pd.Series) -> np.ndarray:
+    return (dates.dt.year * 12 + dates.dt.month - 1).to_numpy(dtype='int32')
+
+
+def _joint_codes(left: pd.Series, right: pd.Series) -> Tuple[np.ndarray, int]:
+    """두 시리즈를 같은 정수 코드 체계로 (이어 붙인 코드 배열, 코드 수)"""
+    if isinstance(left.dtype, pd.CategoricalDtype) and isinstance(right.dtype, pd.CategoricalDtype):
+        # 카테고리끼리는 카테고리 목록만 합치고 행은 코드 재매핑만 함
+        categories = left.cat.categories.union(right.cat.categories)
+        codes = np.concatenate([
+            categories.get_indexer(left.cat.categories)[left.cat.codes],
+            categories.get_indexer(right.cat.categories)[right.cat.codes],
+        ])
+        return codes.astype('int64'), len(categories)
+    codes, uniques = pd.factorize(np.concatenate([left.to_numpy(), right.to_numpy()]))
+    return codes.astype('int64'), len(uniques)
+
+
+def _join_keys(trades: pd.DataFrame, rents: pd.DataFrame,
+               keys: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """키 컬럼들을 하나의 int64 키로 (매매 키, 전세 키)"""
+    key = np.zeros(len(trades) + len(rents), dtype='int64')
+    size = 1
+    for col in keys:
+        codes, n = _joint_codes(trades[col], rents[col])
+        key = key * n + codes
+        size *= n
+        if size > 2 ** 40:  # 곱이 int64 를 넘기 전에 조밀한 코드로 다시 번호 매김
+            key, uniques = pd.factorize(key)
+            size = len(uniques)
+    return key[:len(trades)], key[len(trades):]
+
+
+def jeonse_ratio_table(trades: pd.DataFrame, rents: pd.DataFrame,
+                       window_months: int = WINDOW_MONTHS,
+                       keys: Sequence[str] = JOIN_KEYS) -> pd.DataFrame:
+    """
+    단지·면적대별 전세가율 표
+
+    Args:
+        trades: 매매 거래 (apt_trade)
+        rents: 전월세 거래 (apt_rent) - 전세만 사용
+        window_months: 매매 월과 전세 월의 최대 차이
+
+    Returns:
+        RATIO_COLUMNS 프레임 (전세가 붙은 매매가 있는 단지·면적대만, 전세가율 내림차순)
+            trade_price, jeonse_deposit - 매매가 / 붙은 전세 보증금 중앙값 (만원)
+            ratio - 매매 건별 전세가율의 중앙값 (%)
+            gap   - trade_price - jeonse_deposit
+            trades, rents - 조인된 매매 건수 / 해당 키의 전세 건수
+    """
+    rents = jeonse_only(rents) if not rents.empty else rents
+    if trades.empty or rents.empty:
+        return pd.DataFrame(columns=RATIO_COLUMNS)
+
+    trades = trades.assign(area_band=area_band(trades['area']))
+    rents = rents.assign(area_band=area_band(rents['area']))
+    trade_key, rent_key = _join_keys(trades, rents, keys)
+
+    trade_month = _month_index(trades['date'])
+    rent_month = _month_index(rents['date'])
+
+    # (키, 월) -> 정렬 가능한 하나의 정수. 키 사이 간격을 window 보다 넓게 두어
+    # 키 조건 없이 월 기준 asof 조인만으로 다른 키와 붙지 않게 함
+    first = min(trade_month.min(), rent_month.min())
+    stride = max(trade_month.max(), rent_month.max()) - first + window_months + 1
+    trade_pos = trade_key * stride + (trade_month - first)
+    rent_pos = rent_key * stride + (rent_month - first)
+
+    # 전세: (키, 월) 별 보증금 중앙값
+    jeonse = (
+        pd.DataFrame({'pos': rent_pos, 'key': rent_key, 'deposit': rents['deposit'].to_numpy()})
+        .groupby(['pos', 'key'], sort=True)['deposit'].agg(['median', 'count'])
+        .reset_index()
+    )
+
+    sale = pd.DataFrame({
+        'pos': trade_pos,
+        'key': trade_key,
+        'price': trades['price'].to_numpy(),
+        'row': np.arange(len(trades)),
+    }).sort_values('pos')
+
+    joined = pd.merge_asof(
+        sale, jeonse.drop(columns='key'), on='pos',
+        direction='nearest', tolerance=window_months,
+    ).dropna(subset=['median'])
+    if joined.empty:
+        return pd.DataFrame(columns=RATIO_COLUMNS)
+
+    joined['ratio'] = joined['median'] / joined['price'] * 100
+    grouped = joined.groupby('key', sort=False)
+    table = grouped.agg(
+        trade_price=('price', 'median'),
+        jeonse_deposit=('median', 'median'),
+        ratio=('ratio', 'median'),
+        trades=('price', 'size'),
+        row=('row', 'last'),
+    )
+    table['rents'] = (
+        jeonse.groupby('key', sort=False)['count'].sum().reindex(table.index).to_numpy()
+    )
+
+    # 키 -> 원래 컬럼 값 (각 키의 마지막 매매 행에서 가져옴)
+    sample = trades.iloc[table['row'].to_numpy()]
+    out = pd.DataFrame({
+        'bjdong_cd': sample['bjdong_cd'].array,
+        'dong': sample['dong'].array,
+        'apt': sample['apt'].array,
+        'area_band': sample['area_band'].array,
+        'trade_price': table['trade_price'].round().astype('int32').to_numpy(),
+        'jeonse_deposit': table['jeonse_deposit'].round().astype('int32').to_numpy(),
+        'ratio': table['ratio'].astype('float32').round(1).to_numpy(),
+        'trades': table['trades'].astype('int32').to_numpy(),
+        'rents': table['rents'].astype('int32').to_numpy(),
+    })
+    out['gap'] = out['trade_price'] - out['jeonse_deposit']
+    out['last_trade'] = (
+        trades['date'].groupby(trade_key).max().reindex(table.index).to_numpy()
+    )
+    return out[RATIO_COLUMNS].sort_values('ratio', ascending=False, ignore_index=True)
+
+
+def attach_ratio(df: pd.DataFrame, table: pd.DataFrame) -> pd.Series:
+    """거래 행마다 해당 단지·면적대의 전세가율 (없으면 NaN, df 인덱스 기준)"""
+    if df.empty or table.empty:
+        return pd.Series(np.nan, index=df.index, dtype='float32')
+    left = pd.DataFrame({
+        'bjdong_cd': df['bjdong_cd'].astype(str).to_numpy(),
+        'apt': df['apt'].astype(str).to_numpy(),
+        'area_band': area_band(df['area']).to_numpy(),
+    })
+    right = table[['bjdong_cd', 'apt', 'area_band', 'ratio']].astype(
+        {'bjdong_cd': str, 'apt': str, 'area_band': 'int16'}
+    )
+    ratio = left.merge(right, on=['bjdong_cd', 'apt', 'area_band'], how='left')['ratio']
+    return pd.Series(ratio.to_numpy(), index=df.index, dtype='float32')
+
+
+def get_ratio_color(ratio: float) -> str:
+    """전세가율 구간별 색상 (60% 미만 녹색 ~ 80% 이상 빨간색)"""
+    if pd.isna(ratio):
+        return "#9E9E9E"
+    for upper, color in RATIO_BINS:
+        if ratio < upper:
+            return color
+    return RATIO_HIGH_COLOR
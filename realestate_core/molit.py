@@ -0,0 +1,242 @@
+"""
+국토교통부 실거래가 조회
+
+모든 RTMS 데이터셋(datasets.DATASETS)을 하나의 엔진으로 조회합니다.
+fetch_dataset 이 페이지를 끝까지 넘겨 받고, 선언된 필드대로 파싱해 압축
+스키마로 바꾸며, 결과는 캐시(memoize)에 둡니다.
+
+API 호출은 quota.default_scheduler 를 거치므로 호출 간격과 일일 한도가
+프로세스 전체에서 함께 관리됩니다 (데이터셋마다 "molit:<이름>" 으로 따로
+집계). 한도에 걸리면 만료된 캐시라도 있으면 그 값을 쓰고, 없으면
+QuotaExceeded 가 호출한 쪽으로 전달됩니다.
+"""
+
+import logging
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from typing import Callable, List, NamedTuple, Optional, Tuple
+
+import pandas as pd
+import requests
+
+from . import config
+from .cache import memoize
+from .datasets import MolitDataset, get_dataset
+from .quota import QuotaExceeded, default_scheduler
+from .tracing import span
+from .transaction_schema import compact_transactions, to_number
+
+logger = logging.getLogger(__name__)
+
+MOLIT_BASE_URL = "https://apis.data.go.kr/1613000"
+PAGE_SIZE = 1000
+
+# 정상 응답 코드
+OK_RESULT_CODES = ('00', '000')
+
+# (완료 수, 전체 수, 상태 메시지)
+ProgressCallback = Callable[[int, int, str], None]
+
+
+class MolitAPIError(Exception):
+    """국토부 API 호출/응답 파싱 실패"""
+
+
+def recent_deal_months(months: int, today: Optional[datetime] = None) -> List[str]:
+    """이번 달부터 거슬러 올라간 최근 N개월의 YYYYMM 목록"""
+    today = today or datetime.now()
+    year, month = today.year, today.month
+    result = []
+    for _ in range(months):
+        result.append(f"{year:04d}{month:02d}")
+        month -= 1
+        if month == 0:
+            year, month = year - 1, 12
+    return result
+
+
+# ==================== 조회 엔진 ====================
+
+def parse_response(dataset: MolitDataset, root: ET.Element) -> pd.DataFrame:
+    """
+    RTMS 응답 XML -> 압축 스키마 프레임
+
+    item 마다 태그를 한 번씩만 읽고, 컬럼 변환은 프레임 단위로 합니다.
+    required 컬럼이 숫자로 읽히지 않는 행은 버립니다.
+    """
+    records = [
+        {child.tag: (child.text or '').strip() for child in item}
+        for item in root.iter('item')
+    ]
+    if not records:
+        return pd.DataFrame()
+
+    raw = pd.DataFrame.from_records(records)
+    missing = pd.Series('', index=raw.index)
+
+    columns = {}
+    for column, source in dataset.fields.items():
+        tags = (source,) if isinstance(source, str) else source
+        values = raw[tags[0]] if tags[0] in raw else missing
+        for tag in tags[1:]:
+            values = values + (raw[tag] if tag in raw else missing)
+        columns[column] = values
+    df = pd.DataFrame(columns)
+
+    if dataset.required:
+        valid = pd.Series(True, index=df.index)
+        for column in dataset.required:
+            valid &= to_number(df[column]).notna()
+        df = df[valid].reset_index(drop=True)
+
+    return compact_transactions(df, dataset.dtypes)
+
+
+def _check_result(root: ET.Element, where: str):
+    code = root.findtext('.//resultCode')
+    if code is not None and code.strip() not in OK_RESULT_CODES:
+        message = root.findtext('.//resultMsg', '')
+        raise MolitAPIError(f"{where} 응답 오류 {code}: {message}")
+
+
+def _fetch_page(dataset: MolitDataset, lawd_cd: str, deal_ymd: str,
+                page: int) -> ET.Element:
+    params = {
+        'serviceKey': config.MOLIT_API_KEY,
+        'LAWD_CD': lawd_cd,
+        'DEAL_YMD': deal_ymd,
+        'numOfRows': str(PAGE_SIZE),
+        'pageNo': str(page),
+    }
+    url = f"{MOLIT_BASE_URL}/{dataset.path}"
+
+    with span('molit.network', dataset=dataset.name, lawd_cd=lawd_cd,
+              deal_ymd=deal_ymd, page=page):
+        res = default_scheduler.call(
+            f"molit:{dataset.name}", lambda: requests.get(url, params=params, timeout=10)
+        )
+    root = ET.fromstring(res.content)
+    _check_result(root, f"{dataset.name} {lawd_cd}/{deal_ymd}")
+    return root
+
+
+# TTL 이 지난 뒤 하루 동안은 캐시된 프레임을 바로 쓰고 백그라운드에서 갱신
+@memoize('molit', ttl=600, stale_on=(MolitAPIError, QuotaExceeded),
+         stale_while_revalidate=24 * 3600)
+def fetch_dataset(name: str, lawd_cd: str, deal_ymd: str) -> pd.DataFrame:
+    """
+    국토부 실거래 데이터셋 한 달치 조회 (모든 페이지)
+
+    Args:
+        name: datasets.DATASETS 의 이름 (apt_trade, apt_rent, offi_trade, ...)
+
+    Raises:
+        KeyError: 알 수 없는 데이터셋
+        MolitAPIError: 네트워크 오류, 오류 응답 또는 XML 파싱 실패 (캐시되지 않음)
+        QuotaExceeded: 현재 우선순위의 일일 한도 초과 (캐시되지 않음)
+    """
+    dataset = get_dataset(name)
+    frames = []
+    received = 0
+    page = 1
+
+    try:
+        while True:
+            root = _fetch_page(dataset, lawd_cd, deal_ymd, page)
+            with span('molit.parse', dataset=name, page=page) as s:
+                frame = parse_response(dataset, root)
+                if s is not None:
+                    s.set_attribute('rows', len(frame))
+            if not frame.empty:
+                frames.append(frame)
+
+            # 받은 item 수로 판단 (numOfRows 보다 많이 주는 응답도 한 번에 끝남)
+            items = sum(1 for _ in root.iter('item'))
+            received += items
+            if items == 0 or received >= int(root.findtext('.//totalCount') or 0):
+                break
+            page += 1
+    except (requests.RequestException, ET.ParseError, ValueError) as e:
+        raise MolitAPIError(f"{name} {lawd_cd}/{deal_ymd} 조회 실패: {e}") from e
+
+    if not frames:
+        return pd.DataFrame()
+    if len(frames) == 1:
+        return frames[0]
+    return compact_transactions(pd.concat(frames, ignore_index=True), dataset.dtypes)
+
+
+def fetch_apt_trade_data(lawd_cd: str, deal_ymd: str) -> pd.DataFrame:
+    """국토부 아파트 매매 실거래가 조회 (fetch_dataset('apt_trade', ...))"""
+    return fetch_dataset('apt_trade', lawd_cd, deal_ymd)
+
+
+class Freshness(NamedTuple):
+    """조회 범위 캐시 상태"""
+    oldest: Optional[float]  # 가장 오래된 월의 저장 시각 (캐시가 없으면 None)
+    refreshing: bool         # 백그라운드 갱신 진행 중인 월이 있는지
+    version: Tuple           # 월별 저장 시각 (파생 캐시 키로 사용)
+
+
+def data_freshness(lawd_cd: str, months: int, dataset: str = 'apt_trade') -> Freshness:
+    """최근 N개월 조회 결과가 얼마나 오래됐는지 (API 호출 없음)"""
+    deal_months = recent_deal_months(months)
+    version = tuple(fetch_dataset.cached_at(dataset, lawd_cd, ymd) for ymd in deal_months)
+    stamps = [t for t in version if t is not None]
+    return Freshness(
+        oldest=min(stamps) if stamps else None,
+        refreshing=any(fetch_dataset.is_refreshing(dataset, lawd_cd, ymd) for ymd in deal_months),
+        version=version,
+    )
+
+
+def fetch_dataset_months(name: str, lawd_cd: str, months: int = 6,
+                         progress: Optional[ProgressCallback] = None) -> pd.DataFrame:
+    """
+    데이터셋의 최근 N개월 조회
+
+    월별 결과는 fetch_dataset 캐시를 그대로 쓰므로, 이 함수 자체는
+    캐시하지 않습니다. 호출 간격은 스케줄러가 지킵니다. 일부 월이 실패하면
+    나머지 월로 결과를 만들고, 모든 월이 실패했을 때만 마지막 예외
+    (MolitAPIError 또는 QuotaExceeded)를 다시 던집니다.
+
+    Args:
+        name: 데이터셋 이름
+        lawd_cd: 5자리 시군구 코드
+        months: 조회 개월 수
+        progress: 진행 상황 콜백 (완료 수, 전체 수, 메시지)
+    """
+    all_data = []
+    errors = []
+    deal_months = recent_deal_months(months)
+
+    for i, deal_ymd in enumerate(deal_months):
+        if progress:
+            progress(i, months, f"📥 {deal_ymd} 데이터 로딩 중...")
+
+        try:
+            df = fetch_dataset(name, lawd_cd, deal_ymd)
+        except (MolitAPIError, QuotaExceeded) as e:
+            logger.warning("%s", e)
+            errors.append(e)
+            df = pd.DataFrame()
+
+        if not df.empty:
+            all_data.append(df)
+
+    if progress:
+        progress(months, months, "")
+
+    if all_data:
+        # 월별 카테고리가 달라 concat 시 object 로 풀리므로 다시 압축
+        return compact_transactions(pd.concat(all_data, ignore_index=True),
+                                    get_dataset(name).dtypes)
+    if errors and len(errors) == months:
+        raise errors[-1]
+    return pd.DataFrame()
+
+
+def fetch_multi_month_data(lawd_cd: str, months: int = 6,
+                           progress: Optional[ProgressCallback] = None) -> pd.DataFrame:
+    """아파트 매매 최근 N개월 조회 (fetch_dataset_months('apt_trade', ...))"""
+    return fetch_dataset_months('apt_trade', lawd_cd, months, progress)
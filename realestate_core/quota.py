@@ -0,0 +1,232 @@
+"""
+API 사용량 장부와 예산 기반 호출 스케줄러
+
+data.go.kr, VWorld, Kakao 는 모두 일일 호출 한도가 있습니다. 모든 외부 호출은
+FetchScheduler 를 거치며, 스케줄러는
+
+1. API 별 대기열에서 우선순위(대화형 > 선조회 > 백필) 순으로 꺼내고
+2. 최소 호출 간격을 지키며
+3. QuotaLedger 에 사용량을 기록합니다.
+
+우선순위마다 쓸 수 있는 한도 비율이 달라서(백필 70%, 선조회 90%, 대화형 100%)
+대량 백필이 한도를 다 써 버려 대시보드가 멈추는 일이 없습니다. 한도에 걸린
+호출은 QuotaExceeded 로 실패하고, 캐시(memoize 의 stale_on)는 이때 만료된
+데이터라도 돌려주어 화면이 비지 않게 합니다.
+
+한도는 환경 변수로 바꿀 수 있습니다: MOLIT_DAILY_QUOTA, VWORLD_DAILY_QUOTA,
+KAKAO_DAILY_QUOTA. 사용량은 한국 시간 자정에 초기화됩니다.
+
+data.go.kr 한도는 서비스(데이터셋)마다 따로 잡히므로 "molit:apt_rent" 처럼
+콜론 뒤에 세부 이름을 붙여 따로 집계합니다. 세부 이름에 한도/간격이 없으면
+콜론 앞 이름("molit")의 값을 씁니다.
+"""
+
+import contextlib
+import contextvars
+import enum
+import itertools
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from .config import CACHE_DIR
+from .fileio import atomic_json_read, atomic_json_write
+from .singleflight import file_lock
+
+KST = timezone(timedelta(hours=9))
+
+DAILY_QUOTAS: Dict[str, int] = {
+    'molit': int(os.getenv('MOLIT_DAILY_QUOTA', '10000')),
+    'vworld': int(os.getenv('VWORLD_DAILY_QUOTA', '40000')),
+    'kakao': int(os.getenv('KAKAO_DAILY_QUOTA', '100000')),
+}
+
+# API 별 최소 호출 간격(초)
+MIN_INTERVALS: Dict[str, float] = {
+    'molit': 0.3,
+    'vworld': 0.05,
+    'kakao': 0.05,
+}
+
+
+class Priority(enum.IntEnum):
+    INTERACTIVE = 0  # 대시보드 사용자가 기다리는 호출
+    PREFETCH = 1     # 캐시 워밍, 감시 목록 폴링
+    BACKFILL = 2     # 과거 데이터 대량 수집
+
+
+# 우선순위별로 쓸 수 있는 일일 한도 비율
+BUDGET_SHARE: Dict[Priority, float] = {
+    Priority.INTERACTIVE: 1.0,
+    Priority.PREFETCH: 0.9,
+    Priority.BACKFILL: 0.7,
+}
+
+_current_priority: contextvars.ContextVar = contextvars.ContextVar(
+    'fetch_priority', default=Priority.INTERACTIVE
+)
+
+
+@contextlib.contextmanager
+def fetch_priority(priority: Priority) -> Iterator[None]:
+    """이 블록 안에서 나가는 외부 호출의 우선순위 지정"""
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def current_priority() -> Priority:
+    return _current_priority.get()
+
+
+def _lookup(table: Dict[str, Any], api: str, default: Any) -> Any:
+    """api 값, 없으면 콜론 앞 이름의 값"""
+    if api in table:
+        return table[api]
+    return table.get(api.split(':', 1)[0], default)
+
+
+class QuotaExceeded(Exception):
+    """우선순위에 허용된 일일 한도를 다 쓴 경우"""
+
+
+class QuotaLedger:
+    """
+    API 별 일일 사용량 장부 (JSON 파일, 프로세스 간 공유)
+
+    {"2024-05-01": {"molit": 120, "vworld": 3400}}
+    """
+
+    def __init__(self, path: Optional[str] = None, quotas: Optional[Dict[str, int]] = None):
+        self.path = path or os.path.join(CACHE_DIR, 'quota.json')
+        self.quotas = quotas or DAILY_QUOTAS
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def today() -> str:
+        return datetime.now(KST).strftime('%Y-%m-%d')
+
+    def _read(self) -> Dict[str, Dict[str, int]]:
+        return atomic_json_read(self.path, {})
+
+    def _write(self, data: Dict[str, Dict[str, int]]):
+        atomic_json_write(self.path, data)
+
+    def used(self, api: str) -> int:
+        return self._read().get(self.today(), {}).get(api, 0)
+
+    def limit(self, api: str, priority: Priority = Priority.INTERACTIVE) -> int:
+        return int(_lookup(self.quotas, api, 0) * BUDGET_SHARE[priority])
+
+    def remaining(self, api: str, priority: Priority = Priority.INTERACTIVE) -> int:
+        return max(0, self.limit(api, priority) - self.used(api))
+
+    def consume(self, api: str, priority: Priority = Priority.INTERACTIVE, n: int = 1) -> int:
+        """
+        한도 안이면 사용량을 n 만큼 늘리고 새 사용량 반환
+
+        Raises:
+            QuotaExceeded: 우선순위에 허용된 한도를 넘는 경우
+        """
+        with self._lock, file_lock(self.path + '.lock'):
+            data = self._read()
+            today = self.today()
+            usage = data.get(today, {})
+            used = usage.get(api, 0)
+
+            if used + n > self.limit(api, priority):
+                raise QuotaExceeded(
+                    f"{api} 일일 한도 도달 ({used}/{_lookup(self.quotas, api, 0)}, {priority.name})"
+                )
+
+            usage[api] = used + n
+            self._write({today: usage})  # 지난 날짜 기록은 버림
+            return usage[api]
+
+    def status(self) -> Dict[str, Dict[str, int]]:
+        """{api: {'used': n, 'limit': m}} (오늘 쓴 세부 이름은 따로, 안 쓴 API 는 0)"""
+        usage = self._read().get(self.today(), {})
+        used_bases = {api.split(':', 1)[0] for api in usage}
+        apis = sorted(usage) + [api for api in self.quotas
+                                if api not in usage and api not in used_bases]
+        return {
+            api: {'used': usage.get(api, 0), 'limit': _lookup(self.quotas, api, 0)}
+            for api in apis
+        }
+
+
+class FetchScheduler:
+    """
+    API 별 우선순위 대기열 + 호출 간격 + 한도 관리
+
+    API 마다 작업 스레드 하나가 대기열을 순서대로 처리합니다.
+    """
+
+    def __init__(self, ledger: Optional[QuotaLedger] = None,
+                 min_intervals: Optional[Dict[str, float]] = None):
+        self.ledger = ledger or QuotaLedger()
+        self.min_intervals = min_intervals or MIN_INTERVALS
+        self._queues: Dict[str, queue.PriorityQueue] = {}
+        self._last_call: Dict[str, float] = {}
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+
+    def _queue(self, api: str) -> queue.PriorityQueue:
+        with self._lock:
+            q = self._queues.get(api)
+            if q is None:
+                q = self._queues[api] = queue.PriorityQueue()
+                threading.Thread(
+                    target=self._worker, args=(api, q), name=f"fetch-{api}", daemon=True
+                ).start()
+            return q
+
+    def _worker(self, api: str, q: queue.PriorityQueue):
+        while True:
+            priority, _, future, fn = q.get()
+            if not future.set_running_or_notify_cancel():
+                continue
+
+            try:
+                self.ledger.consume(api, Priority(priority))
+            except QuotaExceeded as e:
+                future.set_exception(e)
+                continue
+
+            interval = _lookup(self.min_intervals, api, 0)
+            wait = self._last_call.get(api, 0) + interval - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            self._last_call[api] = time.monotonic()
+
+            try:
+                future.set_result(fn())
+            except BaseException as e:
+                future.set_exception(e)
+
+    def submit(self, api: str, fn: Callable[[], Any],
+               priority: Optional[Priority] = None) -> Future:
+        """외부 호출 fn 을 대기열에 넣고 Future 반환"""
+        if priority is None:
+            priority = current_priority()
+        future: Future = Future()
+        self._queue(api).put((int(priority), next(self._seq), future, fn))
+        return future
+
+    def call(self, api: str, fn: Callable[[], Any],
+             priority: Optional[Priority] = None) -> Any:
+        """submit 후 결과를 기다려 반환 (QuotaExceeded 포함, fn 의 예외를 그대로 전달)"""
+        return self.submit(api, fn, priority).result()
+
+    def pending(self) -> Dict[str, int]:
+        with self._lock:
+            return {api: q.qsize() for api, q in self._queues.items()}
+
+
+default_scheduler = FetchScheduler()
@@ -0,0 +1,206 @@
+"""
+법정동 코드 지역 인덱스
+
+bjdong_codes.csv 를 한 번만 읽어 코드 <-> 이름 조회, 시도 > 시군구 > 읍면동
+계층, 코드/이름 접두어 검색을 제공합니다. 코드는 두 단계를 모두 다룹니다.
+
+- 5자리: 시군구 코드 (국토부 API 의 LAWD_CD)
+- 10자리: 법정동 코드 (시도 2 + 시군구 3 + 읍면동 3 + 리 2)
+
+파싱 결과는 CSV 옆에 바이너리 스냅샷(pickle)으로 저장해 두고, 다음 실행부터는
+CSV 보다 스냅샷이 새로우면 스냅샷을 그대로 읽습니다.
+"""
+
+import bisect
+import csv
+import functools
+import os
+import pickle
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from . import config
+from .fileio import atomic_write
+
+SNAPSHOT_VERSION = 1
+SNAPSHOT_SUFFIX = '.idx'
+
+# 한 행: (법정동코드, 시도, 시군구, 읍면동) - 시군구 단계 행은 읍면동이 ''
+RegionRecord = Tuple[str, str, str, str]
+
+
+def sigungu_code_of(code: str) -> str:
+    """10자리 법정동 코드의 시군구(LAWD_CD) 부분"""
+    return code[:5]
+
+
+class RegionIndex:
+    """법정동 코드 조회 인덱스"""
+
+    def __init__(self, records: Iterable[RegionRecord] = ()):
+        self._names: Dict[str, Tuple[str, str, str]] = {}
+        self._by_name: Dict[Tuple[str, str, str], str] = {}
+        self._children: Dict[str, List[str]] = {}
+        self._sigungu_by_sido: Dict[str, List[str]] = {}
+        self._sorted_codes: List[str] = []
+        self._sorted_names: List[Tuple[str, str]] = []
+
+        for record in records:
+            self._add(*record)
+        self._finalize()
+
+    # ---------- 구성 ----------
+
+    def _add(self, code: str, sido: str, sigungu: str, eupmyeondong: str = ''):
+        code = code.strip()
+        if code in self._names:
+            return
+
+        self._names[code] = (sido, sigungu, eupmyeondong)
+        self._by_name[(sido, sigungu, eupmyeondong)] = code
+
+        if len(code) == 5:
+            self._sigungu_by_sido.setdefault(sido, []).append(sigungu)
+            self._children.setdefault(code[:2], []).append(code)
+        else:
+            self._children.setdefault(sigungu_code_of(code), []).append(code)
+
+    def _finalize(self):
+        self._sorted_codes = sorted(self._names)
+        self._sorted_names = sorted(
+            (self.full_name(code), code) for code in self._names
+        )
+
+    # ---------- 조회 ----------
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __contains__(self, code: str) -> bool:
+        return code in self._names
+
+    def sido_list(self) -> List[str]:
+        return list(self._sigungu_by_sido)
+
+    def sigungu_list(self, sido: str) -> List[str]:
+        return self._sigungu_by_sido.get(sido, [])
+
+    def lawd_cd(self, sido: str, sigungu: str) -> Optional[str]:
+        """시도/시군구 이름 -> 5자리 시군구 코드"""
+        return self._by_name.get((sido, sigungu, ''))
+
+    def code_of(self, sido: str, sigungu: str, eupmyeondong: str = '') -> Optional[str]:
+        """이름 -> 코드 (읍면동을 주면 10자리 법정동 코드)"""
+        return self._by_name.get((sido, sigungu, eupmyeondong))
+
+    def names_of(self, code: str) -> Optional[Tuple[str, str, str]]:
+        """코드 -> (시도, 시군구, 읍면동)"""
+        return self._names.get(code)
+
+    def full_name(self, code: str) -> str:
+        """코드 -> '서울특별시 강남구 역삼동' 형태의 전체 이름"""
+        names = self._names.get(code)
+        if names is None:
+            return ''
+        return ' '.join(n for n in names if n)
+
+    def children(self, code: str) -> List[str]:
+        """하위 코드 (시도 2자리 -> 시군구 5자리 -> 법정동 10자리)"""
+        return self._children.get(code, [])
+
+    def eupmyeondong_list(self, lawd_cd: str) -> List[str]:
+        """시군구 아래 읍면동 이름 목록"""
+        return [self._names[c][2] for c in self.children(lawd_cd)]
+
+    def eupmyeondong_codes(self, lawd_cd: str) -> Dict[str, str]:
+        """시군구 아래 {읍면동 이름: 10자리 법정동 코드}"""
+        return {self._names[c][2]: c for c in self.children(lawd_cd)}
+
+    def search_code(self, prefix: str, limit: int = 50) -> List[str]:
+        """코드 접두어 검색"""
+        i = bisect.bisect_left(self._sorted_codes, prefix)
+        result = []
+        while i < len(self._sorted_codes) and len(result) < limit:
+            code = self._sorted_codes[i]
+            if not code.startswith(prefix):
+                break
+            result.append(code)
+            i += 1
+        return result
+
+    def search_name(self, prefix: str, limit: int = 50) -> List[str]:
+        """전체 이름 접두어 검색 (예: '경기도 성남시')"""
+        i = bisect.bisect_left(self._sorted_names, (prefix, ''))
+        result = []
+        while i < len(self._sorted_names) and len(result) < limit:
+            name, code = self._sorted_names[i]
+            if not name.startswith(prefix):
+                break
+            result.append(code)
+            i += 1
+        return result
+
+    # ---------- 입출력 ----------
+
+    @classmethod
+    def from_csv(cls, filename: str) -> 'RegionIndex':
+        """
+        법정동 코드 CSV 로 인덱스 생성
+
+        필수 컬럼: 시도, 시군구, 법정동코드 / 선택 컬럼: 읍면동
+        """
+        with open(filename, encoding='utf-8-sig', newline='') as f:
+            records = [
+                (row['법정동코드'], row['시도'], row['시군구'], row.get('읍면동') or '')
+                for row in csv.DictReader(f)
+            ]
+        return cls(records)
+
+    def save(self, filename: str):
+        """바이너리 스냅샷 저장"""
+        state = {'version': SNAPSHOT_VERSION, 'state': self.__dict__}
+        with atomic_write(filename) as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def _from_snapshot(cls, filename: str) -> Optional['RegionIndex']:
+        with open(filename, 'rb') as f:
+            state = pickle.load(f)
+        if state.get('version') != SNAPSHOT_VERSION:
+            return None
+
+        index = cls.__new__(cls)
+        index.__dict__.update(state['state'])
+        return index
+
+    @classmethod
+    def load(cls, filename: str = 'bjdong_codes.csv') -> 'RegionIndex':
+        """
+        스냅샷이 CSV 보다 새로우면 스냅샷에서, 아니면 CSV 에서 읽고 스냅샷 갱신
+        """
+        snapshot = filename + SNAPSHOT_SUFFIX
+
+        if os.path.exists(snapshot) and (
+            not os.path.exists(filename)
+            or os.path.getmtime(snapshot) >= os.path.getmtime(filename)
+        ):
+            try:
+                index = cls._from_snapshot(snapshot)
+                if index is not None:
+                    return index
+            except (OSError, pickle.UnpicklingError, EOFError, KeyError):
+                pass
+
+        index = cls.from_csv(filename)
+        try:
+            index.save(snapshot)
+        except OSError:
+            pass  # 읽기 전용 배포 환경에서는 스냅샷 없이 사용
+        return index
+
+
+@functools.lru_cache(maxsize=1)
+def default_region_index() -> RegionIndex:
+    """통합 법정동 코드 파일이 있으면 그것을, 없으면 시군구 CSV 를 읽은 인덱스"""
+    if os.path.exists(config.FULL_BJDONG_CSV):
+        return RegionIndex.load(config.FULL_BJDONG_CSV)
+    return RegionIndex.load(config.BJDONG_CSV)
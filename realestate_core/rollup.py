@@ -0,0 +1,234 @@
+"""
+전국 집계 (파티션 병렬)
+
+저장소(store.TransactionStore)의 (시군구, 거래 월) 파티션마다 부분 집계를
+프로세스 풀에서 계산해 합칩니다. 작업자에게는 DataFrame 대신 Parquet 파일
+경로만 넘기고, 작업자는 필요한 컬럼만 메모리 맵으로 읽습니다. 부분 집계는
+건수·합계·가격 로그 히스토그램이라 합치는 순서나 작업자 수와 무관하게 결과가
+같습니다.
+
+    result = national_rollup(TransactionStore(), '202401', '202406', workers=8)
+    result.monthly     # 월별 전국 건수·평균·중앙값
+    result.districts   # 시군구 x 월
+    result.dongs       # (시군구, 동)별 평균 거래가 순위
+    result.py_bands    # 평수대별
+
+시군구 x 월 중앙값은 정확한 값이고, 여러 파티션을 합친 중앙값(전국 월별,
+평수대별)은 폭 1% 로그 가격 구간으로 구한 근사값(상대 오차 0.5% 이내)입니다.
+"""
+
+import logging
+import math
+import multiprocessing
+import os
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .stats import PY_BINS, PY_LABELS
+from .store import PartitionKey, TransactionStore, month_range
+from .transforms import PYEONG_M2
+
+logger = logging.getLogger(__name__)
+
+# 가격 로그 구간: 100만원부터 구간마다 1% 씩 (1천억원까지 약 1,160개)
+PRICE_BIN_MIN = 100
+PRICE_BIN_STEP = 0.01
+N_PRICE_BINS = math.ceil(math.log(10_000_000 / PRICE_BIN_MIN) / math.log1p(PRICE_BIN_STEP))
+
+# 작업자에 한 번에 넘기는 파티션 수 (프로세스 간 왕복 줄이기)
+CHUNK_SIZE = 16
+
+
+class Rollup(NamedTuple):
+    monthly: pd.DataFrame     # year_month, count, mean, median
+    districts: pd.DataFrame   # lawd_cd, year_month, count, mean, median
+    dongs: pd.DataFrame       # lawd_cd, dong, count, mean (평균 내림차순)
+    py_bands: pd.DataFrame    # py_range, count, mean, median
+
+
+def price_bins(price: np.ndarray) -> np.ndarray:
+    """거래가(만원) -> 로그 구간 번호"""
+    index = np.floor(np.log(np.maximum(price, PRICE_BIN_MIN) / PRICE_BIN_MIN)
+                     / math.log1p(PRICE_BIN_STEP))
+    return np.clip(index, 0, N_PRICE_BINS - 1).astype('int64')
+
+
+def histogram_median(counts: np.ndarray) -> float:
+    """로그 구간 히스토그램의 중앙값 (구간 기하 중앙)"""
+    total = counts.sum()
+    if total == 0:
+        return float('nan')
+    b = int(np.searchsorted(np.cumsum(counts), (total + 1) / 2))
+    return PRICE_BIN_MIN * (1 + PRICE_BIN_STEP) ** (b + 0.5)
+
+
+# ==================== 작업자 (파티션 하나) ====================
+
+def _empty_aggregate() -> Dict[str, Any]:
+    empty = np.empty(0, dtype='int64')
+    return {
+        'count': 0,
+        'sum': 0.0,
+        'median': float('nan'),
+        'hist': (empty, empty),
+        'band_hist': (empty, empty),
+        'band_sums': np.zeros(len(PY_LABELS)),
+        'dongs': ([], empty, np.empty(0)),
+    }
+
+
+def aggregate_partition(path: str) -> Dict[str, Any]:
+    """
+    파티션 파일 하나의 부분 집계 (작업자 프로세스에서 실행)
+
+    히스토그램은 0 이 아닌 구간만 (구간 번호, 건수) 로 돌려줘 결과가 작습니다.
+    """
+    import pyarrow.parquet as pq
+
+    columns = ['price', 'area', 'dong']
+    # 거래 없는 달(또는 예전에 컬럼 없이 저장된 파티션)은 읽지 않고 빈 집계
+    meta = pq.read_metadata(path)
+    if meta.num_rows == 0 or not set(columns) <= set(meta.schema.to_arrow_schema().names):
+        return _empty_aggregate()
+
+    table = pq.read_table(path, columns=columns, memory_map=True)
+    price = table.column('price').to_numpy(zero_copy_only=False).astype('float64')
+    area = table.column('area').to_numpy(zero_copy_only=False).astype('float64')
+    dong = table.column('dong').to_pandas()
+    ok = np.isfinite(price) & (price > 0)
+    price, area, dong = price[ok], area[ok], dong[ok].to_numpy()
+
+    bins = price_bins(price)
+    hist = np.bincount(bins, minlength=N_PRICE_BINS)
+    month_bins = np.flatnonzero(hist)
+
+    # 평수대: stats.py_band 와 같은 (a, b] 구간, 범위 밖은 제외
+    py = np.round(area / PYEONG_M2, 1)
+    band = np.searchsorted(PY_BINS, py, side='left') - 1
+    in_band = (band >= 0) & (band < len(PY_LABELS))
+    band_hist = np.bincount(band[in_band] * N_PRICE_BINS + bins[in_band],
+                            minlength=len(PY_LABELS) * N_PRICE_BINS)
+    band_keys = np.flatnonzero(band_hist)
+    band_sums = np.bincount(band[in_band], weights=price[in_band], minlength=len(PY_LABELS))
+
+    codes, names = pd.factorize(dong)
+    has_dong = codes >= 0
+    dong_counts = np.bincount(codes[has_dong], minlength=len(names))
+    dong_sums = np.bincount(codes[has_dong], weights=price[has_dong], minlength=len(names))
+
+    return {
+        'count': len(price),
+        'sum': float(price.sum()),
+        'median': float(np.median(price)) if len(price) else float('nan'),
+        'hist': (month_bins, hist[month_bins]),
+        'band_hist': (band_keys, band_hist[band_keys]),
+        'band_sums': band_sums,
+        'dongs': ([str(name) for name in names], dong_counts, dong_sums),
+    }
+
+
+# ==================== 실행 + 병합 ====================
+
+def _partition_keys(store: TransactionStore, start_ymd: str, end_ymd: str,
+                    lawd_cds: Optional[List[str]]) -> List[PartitionKey]:
+    months = set(month_range(start_ymd, end_ymd))
+    if lawd_cds is None:
+        keys = store.partitions()
+    else:
+        keys = (key for lawd_cd in lawd_cds for key in store.partitions(lawd_cd))
+    return [key for key in keys if key.deal_ymd in months]
+
+
+def _map_partitions(paths: List[str], workers: int):
+    """파티션 경로 -> 부분 집계 (작업자 1개면 현재 프로세스에서)"""
+    if workers <= 1 or len(paths) <= 1:
+        return map(aggregate_partition, paths)
+    # fork 는 부모의 스케줄러/캐시 스레드 상태를 복제하므로 spawn 으로 깨끗하게 시작
+    executor = ProcessPoolExecutor(max_workers=workers,
+                                   mp_context=multiprocessing.get_context('spawn'))
+
+    def results():
+        with executor:
+            yield from executor.map(aggregate_partition, paths, chunksize=CHUNK_SIZE)
+
+    return results()
+
+
+def national_rollup(store: TransactionStore, start_ymd: str, end_ymd: str,
+                    lawd_cds: Optional[List[str]] = None,
+                    workers: Optional[int] = None) -> Rollup:
+    """
+    저장된 파티션의 전국(또는 lawd_cds) 집계
+
+    API 를 호출하지 않고 저장소에 있는 파티션만 읽습니다. 매매가(price)가 있는
+    데이터셋 저장소만 지원합니다.
+
+    Args:
+        workers: 작업자 프로세스 수 (기본: CPU 수)
+    """
+    keys = _partition_keys(store, start_ymd, end_ymd, lawd_cds)
+    paths = [store.partition_path(*key) for key in keys]
+    workers = min(workers or os.cpu_count() or 1, max(len(paths), 1))
+    logger.info("파티션 %d개를 작업자 %d개로 집계", len(paths), workers)
+
+    monthly_hist: Dict[str, np.ndarray] = defaultdict(lambda: np.zeros(N_PRICE_BINS, dtype='int64'))
+    monthly_sum: Dict[str, List[float]] = defaultdict(lambda: [0, 0.0])
+    band_hist = np.zeros(len(PY_LABELS) * N_PRICE_BINS, dtype='int64')
+    band_sums = np.zeros(len(PY_LABELS))
+    dong_sum: Dict[Tuple[str, str], List[float]] = defaultdict(lambda: [0, 0.0])
+    districts = []
+
+    for key, part in zip(keys, _map_partitions(paths, workers)):
+        if part['count'] == 0:
+            continue
+        ym = f"{key.deal_ymd[:4]}-{key.deal_ymd[4:]}"
+        districts.append((key.lawd_cd, ym, part['count'], part['sum'] / part['count'],
+                          part['median']))
+
+        bins, counts = part['hist']
+        np.add.at(monthly_hist[ym], bins, counts)
+        monthly_sum[ym][0] += part['count']
+        monthly_sum[ym][1] += part['sum']
+
+        bins, counts = part['band_hist']
+        np.add.at(band_hist, bins, counts)
+        band_sums += part['band_sums']
+
+        for dong, count, total in zip(*part['dongs']):
+            entry = dong_sum[(key.lawd_cd, dong)]
+            entry[0] += count
+            entry[1] += total
+
+    months = sorted(monthly_sum)
+    monthly = pd.DataFrame({
+        'year_month': months,
+        'count': [monthly_sum[m][0] for m in months],
+        'mean': [monthly_sum[m][1] / monthly_sum[m][0] for m in months],
+        'median': [histogram_median(monthly_hist[m]) for m in months],
+    })
+
+    band_hist = band_hist.reshape(len(PY_LABELS), N_PRICE_BINS)
+    band_counts = band_hist.sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        band_mean = band_sums / band_counts
+    py_bands = pd.DataFrame({
+        'py_range': pd.Categorical(PY_LABELS, categories=PY_LABELS, ordered=True),
+        'count': band_counts,
+        'mean': band_mean,
+        'median': [histogram_median(h) for h in band_hist],
+    })
+
+    dongs = pd.DataFrame(
+        [(lawd_cd, dong, count, total / count) for (lawd_cd, dong), (count, total) in dong_sum.items()],
+        columns=['lawd_cd', 'dong', 'count', 'mean'],
+    ).sort_values(['mean', 'lawd_cd', 'dong'], ascending=[False, True, True], ignore_index=True)
+
+    districts = pd.DataFrame(
+        districts, columns=['lawd_cd', 'year_month', 'count', 'mean', 'median']
+    ).sort_values(['lawd_cd', 'year_month'], ignore_index=True)
+
+    return Rollup(monthly, districts, dongs, py_bands)
@@ -0,0 +1,106 @@
+"""
+동일 요청 합치기 (single-flight)
+
+여러 세션이 같은 (lawd_cd, deal_ymd) 나 같은 주소를 동시에 요청하면
+하나의 호출만 실제로 나가고 나머지는 그 결과를 기다려 함께 씁니다.
+
+- 같은 프로세스의 스레드: SingleFlight (키별 진행 중 호출 공유)
+- 같은 머신의 다른 워커 프로세스: file_lock (캐시 디렉터리의 잠금 파일)
+
+memoize 는 캐시 미스일 때 두 단계를 모두 거치고, 잠금을 얻은 뒤 디스크
+캐시를 한 번 더 확인하므로 먼저 끝난 프로세스의 결과를 그대로 재사용합니다.
+"""
+
+import contextlib
+import os
+import threading
+from typing import Any, Callable, Dict, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    try:
+        import msvcrt
+    except ImportError:
+        msvcrt = None
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """키별로 동시에 하나의 호출만 실행"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """
+        같은 key 로 진행 중인 호출이 있으면 그 결과를 기다려 반환하고,
+        없으면 fn 을 실행합니다. fn 의 예외는 기다리던 호출자에게도 전달됩니다.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = fn()
+            return call.value
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+
+@contextlib.contextmanager
+def file_lock(path: str) -> Iterator[None]:
+    """
+    프로세스 간 배타 잠금 (잠금을 지원하지 않는 환경에서는 잠금 없이 진행)
+
+    잠금 파일은 지우지 않습니다. 지우면 다른 프로세스가 이미 연 파일과
+    새로 만든 파일을 각각 잠그는 경쟁이 생깁니다.
+    """
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        f = open(path, 'a+b')
+    except OSError:
+        yield
+        return
+
+    try:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        elif msvcrt is not None:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        yield
+    finally:
+        try:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            elif msvcrt is not None:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            f.close()
@@ -0,0 +1,220 @@
+"""
+좌표 공간 인덱스
+
+좌표 변환이 끝난 단지/거래를 격자(grid)에 넣어 두고 반경·경계 상자·최근접
+질의를 네트워크 없이 처리합니다. 위경도를 대한민국 중심 위도 기준 평면
+좌표(m)로 투영해 한 변 cell_m 짜리 칸에 나누고, 질의는 겹치는 칸의 후보만
+꺼내 거리/범위를 정확히 다시 확인합니다.
+
+    index = SpatialIndex()
+    index.add(lats, lons, ids=addresses)       # 좌표가 생길 때마다 추가
+    pos, dist = index.radius(37.50, 127.03, 1_000)
+    index.ids_at(pos)
+
+점은 추가만 되고(삭제 없음) 넣은 순서대로 0부터 위치 번호가 붙습니다.
+"""
+
+import math
+import threading
+from typing import Any, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+EARTH_RADIUS_M = 6_371_008.8
+REF_LAT = 36.5  # 투영 기준 위도 (대한민국 중앙)
+M_PER_DEG_LAT = math.pi * EARTH_RADIUS_M / 180
+M_PER_DEG_LON = M_PER_DEG_LAT * math.cos(math.radians(REF_LAT))
+
+DEFAULT_CELL_M = 250
+
+
+def project(lat, lon) -> Tuple[np.ndarray, np.ndarray]:
+    """위경도 -> 평면 좌표 (m)"""
+    return (np.asarray(lon, dtype='float64') * M_PER_DEG_LON,
+            np.asarray(lat, dtype='float64') * M_PER_DEG_LAT)
+
+
+def haversine_m(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """두 좌표(배열 가능) 사이 대원 거리 (m)"""
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(v, dtype='float64'))
+                              for v in (lat1, lon1, lat2, lon2))
+    a = (np.sin((lat2 - lat1) / 2) ** 2
+         + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(a))
+
+
+# 칸 번호 (cx, cy) -> 정렬 가능한 int64 키 (cy 우선이라 같은 행의 칸이 이어짐)
+_CELL_OFFSET = 1 << 24
+_ROW_STRIDE = 1 << 32
+
+
+def _cell_keys(cx: np.ndarray, cy: np.ndarray) -> np.ndarray:
+    return (cy + _CELL_OFFSET) * _ROW_STRIDE + (cx + _CELL_OFFSET)
+
+
+class SpatialIndex:
+    """
+    격자 공간 인덱스 (점 추가 가능, 스레드 안전)
+
+    점 위치를 칸 키 순서로 정렬한 배열에 두고, 질의는 범위에 걸친 칸 행마다
+    searchsorted 로 연속 구간을 잘라냅니다. 새로 추가된 점은 작은 미정렬
+    버퍼에 모았다가 일정 크기를 넘으면 정렬 배열에 합칩니다.
+    """
+
+    def __init__(self, cell_m: float = DEFAULT_CELL_M):
+        self.cell_m = cell_m
+        self._size = 0
+        self._lat = np.empty(1024, dtype='float64')
+        self._lon = np.empty(1024, dtype='float64')
+        self._key = np.empty(1024, dtype='int64')
+        self._ids: List[Any] = []
+        self._sorted_keys = np.empty(0, dtype='int64')   # 정렬된 칸 키
+        self._sorted_pos = np.empty(0, dtype='int64')    # 같은 순서의 점 위치
+        self._pending_from = 0                           # 이 위치부터는 아직 정렬 전
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, lat: str = 'lat', lon: str = 'lon',
+                   cell_m: float = DEFAULT_CELL_M) -> 'SpatialIndex':
+        """프레임 행으로 인덱스 생성 (id 는 행 위치, 좌표 없는 행은 제외)"""
+        index = cls(cell_m)
+        index.add(df[lat].to_numpy(dtype='float64'), df[lon].to_numpy(dtype='float64'),
+                  ids=np.arange(len(df)))
+        return index
+
+    def __len__(self) -> int:
+        return self._size
+
+    # ---------- 추가 ----------
+
+    def _cells(self, lat, lon) -> Tuple[np.ndarray, np.ndarray]:
+        x, y = project(lat, lon)
+        return (np.floor_divide(x, self.cell_m).astype('int64'),
+                np.floor_divide(y, self.cell_m).astype('int64'))
+
+    def _reserve(self, n: int):
+        capacity = len(self._lat)
+        if n <= capacity:
+            return
+        while capacity < n:
+            capacity *= 2
+        for name in ('_lat', '_lon', '_key'):
+            old = getattr(self, name)
+            grown = np.empty(capacity, dtype=old.dtype)
+            grown[:self._size] = old[:self._size]
+            setattr(self, name, grown)
+
+    def add(self, lats: Sequence[float], lons: Sequence[float],
+            ids: Optional[Iterable[Any]] = None) -> np.ndarray:
+        """
+        점 추가
+
+        좌표가 없는(NaN/None) 점은 건너뜁니다. ids 를 생략하면 위치 번호가 id 입니다.
+
+        Returns:
+            추가된 점의 위치 번호 (건너뛴 점은 -1)
+        """
+        lats = np.asarray(lats, dtype='float64')
+        lons = np.asarray(lons, dtype='float64')
+        valid = np.isfinite(lats) & np.isfinite(lons)
+        positions = np.full(len(lats), -1, dtype='int64')
+        n = int(valid.sum())
+        if n == 0:
+            return positions
+
+        lats, lons = lats[valid], lons[valid]
+        keys = _cell_keys(*self._cells(lats, lons))
+
+        with self._lock:
+            start = self._size
+            self._reserve(start + n)
+            self._lat[start:start + n] = lats
+            self._lon[start:start + n] = lons
+            self._key[start:start + n] = keys
+            self._size = start + n
+            new = np.arange(start, start + n)
+            positions[valid] = new
+            if ids is None:
+                self._ids.extend(new.tolist())
+            else:
+                self._ids.extend(i for i, ok in zip(ids, valid.tolist()) if ok)
+            if self._size - self._pending_from > max(1024, len(self._sorted_pos) // 8):
+                self._merge_pending()
+        return positions
+
+    def _merge_pending(self):
+        """미정렬 버퍼를 정렬 배열에 합침 (lock 안에서 호출)"""
+        pending = np.arange(self._pending_from, self._size)
+        order = np.argsort(self._key[pending], kind='stable')
+        keys, pos = self._key[pending][order], pending[order]
+        at = np.searchsorted(self._sorted_keys, keys, side='right')
+        self._sorted_keys = np.insert(self._sorted_keys, at, keys)
+        self._sorted_pos = np.insert(self._sorted_pos, at, pos)
+        self._pending_from = self._size
+
+    # ---------- 조회 ----------
+
+    def ids_at(self, positions: np.ndarray) -> List[Any]:
+        return [self._ids[p] for p in positions.tolist()]
+
+    def coords_at(self, positions: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        return self._lat[positions], self._lon[positions]
+
+    def _candidates(self, x0: float, y0: float, x1: float, y1: float) -> np.ndarray:
+        """평면 범위와 겹치는 칸의 점 위치"""
+        cx0, cx1 = int(x0 // self.cell_m), int(x1 // self.cell_m)
+        cy0, cy1 = int(y0 // self.cell_m), int(y1 // self.cell_m)
+
+        with self._lock:
+            rows = np.arange(cy0, cy1 + 1, dtype='int64')
+            lo = np.searchsorted(self._sorted_keys, _cell_keys(cx0, rows), side='left')
+            hi = np.searchsorted(self._sorted_keys, _cell_keys(cx1, rows), side='right')
+            lengths = hi - lo
+            total = int(lengths.sum())
+            # 행마다 [lo, hi) 구간을 이어 붙인 인덱스
+            idx = np.arange(total) + np.repeat(lo - np.cumsum(lengths) + lengths, lengths)
+            found = self._sorted_pos[idx]
+
+            if self._pending_from < self._size:
+                keys = self._key[self._pending_from:self._size]
+                cy = keys // _ROW_STRIDE - _CELL_OFFSET
+                cx = keys % _ROW_STRIDE - _CELL_OFFSET
+                hit = (cx >= cx0) & (cx <= cx1) & (cy >= cy0) & (cy <= cy1)
+                found = np.concatenate([found, np.nonzero(hit)[0] + self._pending_from])
+        return found
+
+    def bbox(self, south: float, west: float, north: float, east: float) -> np.ndarray:
+        """경계 상자 안의 점 위치"""
+        (x0, x1), (y0, y1) = project([south, north], [west, east])
+        pos = self._candidates(x0, y0, x1, y1)
+        lat, lon = self._lat[pos], self._lon[pos]
+        return pos[(lat >= south) & (lat <= north) & (lon >= west) & (lon <= east)]
+
+    def radius(self, lat: float, lon: float,
+               radius_m: float) -> Tuple[np.ndarray, np.ndarray]:
+        """반경 안의 점 (위치, 거리 m) - 가까운 순"""
+        (x,), (y,) = project([lat], [lon])
+        # 경도 방향 축척은 기준 위도 기준이므로 질의 위도에 맞춰 후보 범위를 넓히고
+        # 대원 거리로 다시 거름
+        pad_y = radius_m * 1.01
+        pad_x = pad_y * math.cos(math.radians(REF_LAT)) / math.cos(math.radians(lat))
+        pos = self._candidates(x - pad_x, y - pad_y, x + pad_x, y + pad_y)
+        dist = haversine_m(lat, lon, self._lat[pos], self._lon[pos])
+        inside = dist <= radius_m
+        pos, dist = pos[inside], dist[inside]
+        order = np.argsort(dist, kind='stable')
+        return pos[order], dist[order]
+
+    def nearest(self, lat: float, lon: float, k: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+        """가장 가까운 k개 점 (위치, 거리 m) - 가까운 순"""
+        if len(self) == 0 or k <= 0:
+            return np.empty(0, dtype='int64'), np.empty(0)
+        k = min(k, len(self))
+        reach = float(self.cell_m)
+        while True:
+            pos, dist = self.radius(lat, lon, reach)
+            # 반경 안에 k 개가 있으면 그것이 곧 전체에서 가장 가까운 k 개
+            if len(pos) >= k or reach > math.pi * EARTH_RADIUS_M:
+                return pos[:k], dist[:k]
+            reach *= 2
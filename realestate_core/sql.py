@@ -0,0 +1,157 @@
+"""
+거래 저장소 SQL 조회 (DuckDB)
+
+저장소(store.TransactionStore)의 hive 파티션 Parquet 를 데이터셋마다 하나의
+뷰(apt_trade, apt_rent, offi_trade, ...)로 보여 줍니다. lawd_cd/deal_ymd 조건은
+파일 단위로 걸러지고(파티션 가지치기), 나머지 조건은 Parquet 행 그룹 통계로
+내려가 필요한 부분만 읽으므로 여러 해 전국 데이터도 메모리에 다 올리지 않습니다.
+
+    engine = QueryEngine()
+    engine.query('''
+        SELECT deal_ymd, median(price) FROM apt_trade
+        WHERE lawd_cd = ? AND deal_ymd >= '202401' GROUP BY ALL ORDER BY 1
+    ''', ['11680'])
+
+lawd_cd 와 deal_ymd 는 문자열('11680', '202401')입니다. 조회는 SELECT 문 하나만
+받으며, 엔진은 저장소 밖 파일에 접근할 수 없습니다.
+"""
+
+import glob
+import os
+import threading
+import time
+from typing import Any, List, NamedTuple, Optional, Sequence
+
+import duckdb
+import pandas as pd
+
+from .datasets import DATASETS
+from .store import DEFAULT_STORE_DIR
+
+
+class QueryError(Exception):
+    """SQL 오류 또는 허용되지 않는 문장"""
+
+
+class QueryResult(NamedTuple):
+    frame: pd.DataFrame
+    truncated: bool   # limit 에 걸려 잘렸는지
+    elapsed: float    # 초
+
+
+class QueryEngine:
+    """저장소 위 DuckDB 연결 (스레드마다 커서를 따로 씀)"""
+
+    def __init__(self, root: str = DEFAULT_STORE_DIR, memory_limit: Optional[str] = None,
+                 threads: Optional[int] = None):
+        self.root = os.path.abspath(root)
+        config = {}
+        if memory_limit:
+            config['memory_limit'] = memory_limit
+        if threads:
+            config['threads'] = threads
+        self._con = duckdb.connect(config=config)
+        # 저장소 밖 파일 읽기/쓰기(read_csv, COPY 등) 차단
+        self._con.execute("SET allowed_directories = ?", [[self.root]])
+        self._con.execute("SET enable_external_access = false")
+        self._views: List[str] = []
+        self._lock = threading.Lock()
+
+    def _glob(self, dataset: str) -> str:
+        return os.path.join(self.root, f"dataset={dataset}", "*", "*", "data.parquet")
+
+    def refresh(self) -> List[str]:
+        """
+        파티션이 생긴 데이터셋의 뷰를 만듦 (만들어진 뷰 이름 목록)
+
+        Raises:
+            QueryError: 파티션 파일을 읽을 수 없는 경우 (손상되었거나 컬럼 없이 저장된 파일)
+        """
+        with self._lock:
+            for name in DATASETS:
+                if name in self._views or next(glob.iglob(self._glob(name)), None) is None:
+                    continue
+                # 파일 목록은 조회 때마다 다시 읽으므로 이후 추가된 파티션도 보임
+                try:
+                    self._con.execute(f"""
+                        CREATE OR REPLACE VIEW {name} AS
+                        SELECT * EXCLUDE (dataset) FROM read_parquet(
+                            '{self._glob(name)}', hive_partitioning = true, union_by_name = true,
+                            hive_types = {{'dataset': VARCHAR, 'lawd_cd': VARCHAR, 'deal_ymd': VARCHAR}}
+                        )
+                    """)
+                except duckdb.Error as e:
+                    raise QueryError(f"{name} 테이블을 만들 수 없습니다: {e}") from e
+                self._views.append(name)
+            return list(self._views)
+
+    def _cursor(self, sql: str) -> duckdb.DuckDBPyConnection:
+        try:
+            statements = duckdb.extract_statements(sql)
+        except duckdb.Error as e:
+            raise QueryError(str(e)) from e
+        if len(statements) != 1 or statements[0].type != duckdb.StatementType.SELECT:
+            raise QueryError("SELECT 문 하나만 실행할 수 있습니다.")
+        self.refresh()
+        return self._con.cursor()
+
+    def query(self, sql: str, params: Optional[Sequence[Any]] = None,
+              limit: Optional[int] = None) -> QueryResult:
+        """
+        SELECT 실행
+
+        Args:
+            params: ? 자리에 넣을 값
+            limit: 최대 행 수 (넘으면 잘라내고 truncated=True)
+        """
+        began = time.perf_counter()
+        cursor = self._cursor(sql)
+        try:
+            relation = cursor.sql(sql, params=params)
+            if limit is not None:
+                relation = relation.limit(limit + 1)
+            frame = relation.df()
+        except duckdb.Error as e:
+            raise QueryError(str(e)) from e
+        finally:
+            cursor.close()
+
+        truncated = limit is not None and len(frame) > limit
+        if truncated:
+            frame = frame.iloc[:limit]
+        return QueryResult(frame, truncated, time.perf_counter() - began)
+
+    def explain(self, sql: str, params: Optional[Sequence[Any]] = None) -> str:
+        """실행 계획 (읽는 파일 수·내려간 조건 확인용)"""
+        cursor = self._cursor(sql)
+        try:
+            rows = cursor.execute(f"EXPLAIN {sql}", params).fetchall()
+        except duckdb.Error as e:
+            raise QueryError(str(e)) from e
+        finally:
+            cursor.close()
+        return "\n".join(row[1] for row in rows)
+
+    def tables(self) -> pd.DataFrame:
+        """
+        뷰별 컬럼 (table, column, type)
+
+        Raises:
+            QueryError: refresh 참고
+        """
+        views = self.refresh()
+        if not views:
+            return pd.DataFrame(columns=['table', 'column', 'type'])
+        cursor = self._con.cursor()
+        try:
+            frames = [
+                cursor.sql(f"DESCRIBE {name}").df()
+                .assign(table=name)
+                .rename(columns={'column_name': 'column', 'column_type': 'type'})
+                for name in views
+            ]
+        except duckdb.Error as e:
+            raise QueryError(str(e)) from e
+        finally:
+            cursor.close()
+        return pd.concat(frames, ignore_index=True)[['table', 'column', 'type']]
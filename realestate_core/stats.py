@@ -0,0 +1,128 @@
+"""
+거래 통계 집계
+
+시세 통계 탭과 HTTP API 가 같은 집계를 쓰도록 화면과 분리한 계산 함수입니다.
+입력 프레임은 수정하지 않습니다.
+"""
+
+from typing import Any, Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .transforms import PYEONG_M2
+
+PY_BINS = [0, 20, 30, 40, 50, 100]
+PY_LABELS = ['20평 이하', '20-30평', '30-40평', '40-50평', '50평 이상']
+
+# 평수 x 거래가 분포의 구간 수 (평, 거래가)
+HIST_BINS = (80, 60)
+
+
+def pyeong_series(df: pd.DataFrame) -> pd.Series:
+    """py 컬럼이 있으면 그대로, 없으면 area 로 계산"""
+    if 'py' in df.columns:
+        return df['py']
+    return (df['area'] / PYEONG_M2).round(1)
+
+
+def py_band(py: pd.Series) -> pd.Series:
+    """평수 -> 평수대 카테고리"""
+    return pd.cut(py, bins=PY_BINS, labels=PY_LABELS)
+
+
+def summarize_transactions(df: pd.DataFrame, top_dongs: int = 10) -> Dict[str, Any]:
+    """
+    시세 통계 탭의 지표/표 계산
+
+    Returns:
+        dict:
+            count, avg_price, median_price, avg_py - 주요 지표
+            dong_avg    - 동별 평균/건수 (평균 내림차순 상위 top_dongs)
+            monthly_avg - 월별 평균 거래가 (year_month, price)
+            py_stats    - 평수대별 평균/중앙값/건수
+    """
+    py = pyeong_series(df)
+
+    dong_avg = (
+        df.groupby('dong', observed=True)['price'].agg(['mean', 'count']).reset_index()
+        .sort_values('mean', ascending=False).head(top_dongs)
+    )
+
+    year_month = df['date'].dt.to_period('M').astype(str).rename('year_month')
+    monthly_avg = df['price'].groupby(year_month).mean().reset_index()
+
+    py_stats = (
+        df['price'].groupby(py_band(py).rename('py_range'), observed=False)
+        .agg(['mean', 'median', 'count']).reset_index()
+    )
+
+    return {
+        'count': len(df),
+        'avg_price': float(df['price'].mean()),
+        'median_price': float(df['price'].median()),
+        'avg_py': float(py.mean()),
+        'n_dates': int(df['date'].nunique()),
+        'dong_avg': dong_avg,
+        'monthly_avg': monthly_avg,
+        'py_stats': py_stats,
+    }
+
+
+def sample_rows(df: pd.DataFrame, n: int, seed: int = 0) -> pd.DataFrame:
+    """행 순서를 유지한 균등 표본 n 행 (n 행 이하면 그대로)"""
+    if len(df) <= n:
+        return df
+    rng = np.random.default_rng(seed)
+    return df.iloc[np.sort(rng.choice(len(df), n, replace=False))]
+
+
+def price_area_histogram(df: pd.DataFrame, bins: Tuple[int, int] = HIST_BINS,
+                         clip_quantile: float = 0.999) -> Dict[str, np.ndarray]:
+    """
+    평수 x 거래가 2차원 구간 집계 (결과 크기는 구간 수에만 비례)
+
+    극단값 몇 건 때문에 구간이 뭉개지지 않도록 범위는 clip_quantile 분위까지로
+    잡고, 범위 밖 거래는 가장자리 구간에 넣습니다 (총 건수 보존).
+
+    Returns:
+        dict:
+            x_edges - 평수 구간 경계 (nx + 1)
+            y_edges - 거래가 구간 경계 (ny + 1, 만원)
+            counts  - 구간별 거래 수 (ny, nx)
+    """
+    nx, ny = bins
+    x = pyeong_series(df).to_numpy(dtype='float64')
+    y = df['price'].to_numpy(dtype='float64')
+    ok = np.isfinite(x) & np.isfinite(y)
+    x, y = x[ok], y[ok]
+    if len(x) == 0:
+        return {'x_edges': np.zeros(nx + 1), 'y_edges': np.zeros(ny + 1),
+                'counts': np.zeros((ny, nx), dtype='int64')}
+
+    def bin_index(values: np.ndarray, n: int) -> Tuple[np.ndarray, np.ndarray]:
+        lo, hi = float(values.min()), float(np.quantile(values, clip_quantile))
+        if hi <= lo:
+            hi = lo + 1
+        index = np.clip(((values - lo) * (n / (hi - lo))).astype('int64'), 0, n - 1)
+        return index, np.linspace(lo, hi, n + 1)
+
+    ix, x_edges = bin_index(x, nx)
+    iy, y_edges = bin_index(y, ny)
+    counts = np.bincount(iy * nx + ix, minlength=nx * ny).reshape(ny, nx)
+    return {'x_edges': x_edges, 'y_edges': y_edges, 'counts': counts}
+
+
+def summary_to_json(summary: Dict[str, Any]) -> Dict[str, Any]:
+    """summarize_transactions 결과를 JSON 직렬화 가능한 dict 로"""
+    out = {}
+    for key, value in summary.items():
+        if isinstance(value, pd.DataFrame):
+            frame = value.copy()
+            for col in frame.columns:
+                if isinstance(frame[col].dtype, pd.CategoricalDtype):
+                    frame[col] = frame[col].astype(str)
+            out[key] = frame.astype(object).where(frame.notna(), None).to_dict(orient='records')
+        else:
+            out[key] = value
+    return out
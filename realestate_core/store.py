@@ -0,0 +1,197 @@
+"""
+파티션 단위 거래 저장소
+
+(데이터셋, 시군구 코드, 거래 월) 단위로 거래를 Parquet 파일에 저장합니다.
+
+    <root>/dataset=apt_trade/lawd_cd=11680/deal_ymd=202401/data.parquet
+
+예전 배치(<root>/lawd_cd=...)로 저장된 아파트 매매 파티션은 처음 열 때
+dataset=apt_trade 아래로 옮깁니다.
+
+디렉터리 이름이 hive 파티션 형식이라 DuckDB/pyarrow.dataset 으로 바로
+읽을 수 있습니다. 실거래 신고 기한(계약 후 30일)이 지난 월은 더 바뀌지
+않으므로 한 번 저장하면 다시 받지 않고, 최근 월만 TTL 이 지나면 새로 받습니다.
+"""
+
+import logging
+import os
+from datetime import datetime
+from typing import Iterator, List, NamedTuple, Optional, Tuple
+
+import pandas as pd
+
+from . import config
+from .datasets import get_dataset
+from .fileio import atomic_write
+from .molit import fetch_dataset, recent_deal_months
+from .quota import QuotaExceeded
+from .transaction_schema import compact_transactions, empty_transactions
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STORE_DIR = os.getenv(
+    "REALESTATE_STORE_DIR", os.path.join(config.PROJECT_DIR, "data", "store")
+)
+
+# 최근 월 파티션을 다시 받기까지의 시간(초)
+RECENT_PARTITION_TTL = 600
+
+
+class PartitionKey(NamedTuple):
+    lawd_cd: str
+    deal_ymd: str
+
+
+def month_range(start_ymd: str, end_ymd: str) -> List[str]:
+    """start_ymd ~ end_ymd (YYYYMM, 양 끝 포함) 월 목록"""
+    year, month = int(start_ymd[:4]), int(start_ymd[4:])
+    end_year, end_month = int(end_ymd[:4]), int(end_ymd[4:])
+    result = []
+    while (year, month) <= (end_year, end_month):
+        result.append(f"{year:04d}{month:02d}")
+        month += 1
+        if month == 13:
+            year, month = year + 1, 1
+    return result
+
+
+def is_settled_month(deal_ymd: str, today: Optional[datetime] = None) -> bool:
+    """신고 기한이 지나 더 이상 거래가 추가되지 않는 월인지"""
+    return deal_ymd not in recent_deal_months(2, today)
+
+
+def _move_legacy_partitions(root: str):
+    """<root>/lawd_cd=* (데이터셋 구분 전 배치) -> <root>/dataset=apt_trade/lawd_cd=*"""
+    if not os.path.isdir(root):
+        return
+    legacy = [d for d in os.listdir(root) if d.startswith("lawd_cd=")]
+    if not legacy:
+        return
+    target = os.path.join(root, "dataset=apt_trade")
+    os.makedirs(target, exist_ok=True)
+    for name in legacy:
+        try:
+            os.rename(os.path.join(root, name), os.path.join(target, name))
+        except OSError as e:
+            logger.warning("예전 파티션 이동 실패 %s: %s", name, e)
+
+
+class TransactionStore:
+    """(lawd_cd, deal_ymd) 파티션 Parquet 저장소 (데이터셋 하나)"""
+
+    def __init__(self, root: str = DEFAULT_STORE_DIR, dataset: str = 'apt_trade'):
+        get_dataset(dataset)  # 이름 확인
+        self.root = root
+        self.dataset = dataset
+        self.dataset_dir = os.path.join(root, f"dataset={dataset}")
+        if dataset == 'apt_trade':
+            _move_legacy_partitions(root)
+
+    def partition_dir(self, lawd_cd: str, deal_ymd: str) -> str:
+        return os.path.join(self.dataset_dir, f"lawd_cd={lawd_cd}", f"deal_ymd={deal_ymd}")
+
+    def partition_path(self, lawd_cd: str, deal_ymd: str) -> str:
+        return os.path.join(self.partition_dir(lawd_cd, deal_ymd), "data.parquet")
+
+    def has_partition(self, lawd_cd: str, deal_ymd: str) -> bool:
+        return os.path.exists(self.partition_path(lawd_cd, deal_ymd))
+
+    def partition_version(self, lawd_cd: str, deal_ymd: str) -> Optional[Tuple[int, int]]:
+        """파티션 파일의 (수정 시각 ns, 크기) - 없으면 None"""
+        try:
+            st = os.stat(self.partition_path(lawd_cd, deal_ymd))
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def is_fresh(self, lawd_cd: str, deal_ymd: str) -> bool:
+        """저장된 파티션을 그대로 써도 되는지"""
+        version = self.partition_version(lawd_cd, deal_ymd)
+        if version is None:
+            return False
+        if is_settled_month(deal_ymd):
+            return True
+        return datetime.now().timestamp() - version[0] / 1e9 < RECENT_PARTITION_TTL
+
+    def write_partition(self, lawd_cd: str, deal_ymd: str, df: pd.DataFrame):
+        """파티션 저장 (빈 결과도 컬럼이 있는 '거래 없음' 파티션으로 기록)"""
+        if df.empty:
+            dataset = get_dataset(self.dataset)
+            df = empty_transactions(dataset.fields, dataset.dtypes)
+        # 폴러 스레드와 세션이 같은 파티션을 동시에 써도 임시 파일이 겹치지 않음
+        with atomic_write(self.partition_path(lawd_cd, deal_ymd)) as f:
+            df.to_parquet(f, index=False, compression='zstd')
+
+    def read_partition(self, lawd_cd: str, deal_ymd: str,
+                       columns: Optional[List[str]] = None) -> pd.DataFrame:
+        return pd.read_parquet(self.partition_path(lawd_cd, deal_ymd), columns=columns)
+
+    def partitions(self, lawd_cd: Optional[str] = None) -> Iterator[PartitionKey]:
+        """저장된 파티션 목록"""
+        if not os.path.isdir(self.dataset_dir):
+            return
+        lawd_dirs = [f"lawd_cd={lawd_cd}"] if lawd_cd else sorted(os.listdir(self.dataset_dir))
+        for lawd_dir in lawd_dirs:
+            lawd_path = os.path.join(self.dataset_dir, lawd_dir)
+            if not lawd_dir.startswith("lawd_cd=") or not os.path.isdir(lawd_path):
+                continue
+            for ymd_dir in sorted(os.listdir(lawd_path)):
+                key = PartitionKey(lawd_dir[len("lawd_cd="):], ymd_dir[len("deal_ymd="):])
+                if ymd_dir.startswith("deal_ymd=") and self.has_partition(*key):
+                    yield key
+
+    # ---------- 조회 + 동기화 ----------
+
+    def sync_partition(self, lawd_cd: str, deal_ymd: str,
+                       revalidate: bool = False) -> pd.DataFrame:
+        """
+        저장된 파티션이 유효하면 읽고, 아니면 API 로 받아 저장한 뒤 반환
+
+        API 한도에 걸렸을 때 TTL 이 지난 파티션이라도 있으면 그것을 반환합니다.
+
+        Args:
+            revalidate: 조회 캐시가 만료됐으면 만료된 값을 쓰지 않고 새로 받음
+                (감시 목록 폴링처럼 최신 거래가 필요한 경우)
+        """
+        if self.is_fresh(lawd_cd, deal_ymd):
+            return self.read_partition(lawd_cd, deal_ymd)
+
+        fetch = fetch_dataset.revalidate if revalidate else fetch_dataset
+        try:
+            df = fetch(self.dataset, lawd_cd, deal_ymd)
+        except QuotaExceeded:
+            if self.has_partition(lawd_cd, deal_ymd):
+                return self.read_partition(lawd_cd, deal_ymd)
+            raise
+        self.write_partition(lawd_cd, deal_ymd, df)
+        return df
+
+    def load_range(self, lawd_cd: str, start_ymd: str, end_ymd: str,
+                   fetch_missing: bool = True) -> pd.DataFrame:
+        """
+        start_ymd ~ end_ymd 거래를 하나의 프레임으로
+
+        Args:
+            fetch_missing: False 면 저장소에 있는 파티션만 사용 (API 호출 없음)
+        """
+        frames = []
+        for deal_ymd in month_range(start_ymd, end_ymd):
+            if fetch_missing:
+                df = self.sync_partition(lawd_cd, deal_ymd)
+            elif self.has_partition(lawd_cd, deal_ymd):
+                df = self.read_partition(lawd_cd, deal_ymd)
+            else:
+                continue
+            if not df.empty:
+                frames.append(df)
+
+        if not frames:
+            return pd.DataFrame()
+        return compact_transactions(pd.concat(frames, ignore_index=True),
+                                    get_dataset(self.dataset).dtypes)
+
+    def range_version(self, lawd_cd: str, start_ymd: str, end_ymd: str) -> Tuple:
+        """범위에 속한 파티션 버전 묶음 (ETag 계산용)"""
+        return tuple(
+            self.partition_version(lawd_cd, ymd) for ymd in month_range(start_ymd, end_ymd)
+        )
@@ -0,0 +1,219 @@
+"""
+구간별 시간 측정 (span)
+
+네트워크/파싱/가공/좌표 변환/탭 렌더링 같은 구간을 span 으로 감싸 걸린 시간을
+기록합니다. 진행 중인 trace 가 없고 내보내기도 꺼져 있으면 span 은 아무것도
+하지 않으므로 배치 작업이나 API 서버에서도 비용 없이 남겨 둘 수 있습니다.
+
+    with trace("rerun") as root:
+        with span("molit.network", lawd_cd="11680"):
+            ...
+    for s in root.spans: print(s.name, s.duration_ms)
+
+REALESTATE_TRACE_FILE 을 지정하면 끝난 span 을 OpenTelemetry(OTLP JSON) 형식의
+JSON lines 로 그 파일에 덧붙입니다. 한 줄이 span 하나를 담은 ExportTraceServiceRequest
+({"resourceSpans": [{"resource": ..., "scopeSpans": [{"scope": ..., "spans": [...]}]}]})
+이므로 OTLP/HTTP 수집기나 otel-collector 의 otlpjsonfile 수신기에 그대로 넣을 수 있습니다.
+
+컨텍스트는 contextvars 로 전달되므로, 다른 스레드(스케줄러 작업 스레드,
+백그라운드 갱신)에서 실행된 구간은 호출한 쪽 trace 에 붙지 않습니다.
+"""
+
+import contextlib
+import contextvars
+import functools
+import json
+import os
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+SERVICE_NAME = "realestate-radar"
+SCOPE_NAME = "realestate_core.tracing"
+
+
+class Span:
+    """측정 구간 하나"""
+
+    __slots__ = ('name', 'trace_id', 'span_id', 'parent_id', 'depth',
+                 'start_ns', 'end_ns', 'attributes', 'spans')
+
+    def __init__(self, name: str, parent: Optional['Span'], attributes: Dict[str, Any]):
+        self.name = name
+        self.span_id = f"{random.getrandbits(64):016x}"
+        if parent is None:
+            self.trace_id = f"{random.getrandbits(128):032x}"
+            self.parent_id = None
+            self.depth = 0
+            self.spans: List[Span] = []  # 이 trace 에서 끝난 span (루트만 가짐)
+        else:
+            self.trace_id = parent.trace_id
+            self.parent_id = parent.span_id
+            self.depth = parent.depth + 1
+            self.spans = parent.spans
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes = attributes
+
+    @property
+    def duration_ms(self) -> float:
+        if self.end_ns is None:
+            return 0.0
+        return (self.end_ns - self.start_ns) / 1e6
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def to_otlp(self) -> Dict[str, Any]:
+        """OTLP JSON 의 span 표현"""
+        return {
+            'traceId': self.trace_id,
+            'spanId': self.span_id,
+            'parentSpanId': self.parent_id or '',
+            'name': self.name,
+            'kind': 'SPAN_KIND_INTERNAL',
+            'startTimeUnixNano': str(self.start_ns),
+            'endTimeUnixNano': str(self.end_ns),
+            'attributes': [
+                {'key': k, 'value': _otlp_value(v)} for k, v in self.attributes.items()
+            ],
+        }
+
+
+def _otlp_request(spans: List[Span]) -> Dict[str, Any]:
+    """span 들을 감싼 OTLP JSON 요청 (ExportTraceServiceRequest)"""
+    return {'resourceSpans': [{
+        'resource': {'attributes': [
+            {'key': 'service.name', 'value': {'stringValue': SERVICE_NAME}}
+        ]},
+        'scopeSpans': [{
+            'scope': {'name': SCOPE_NAME},
+            'spans': [s.to_otlp() for s in spans],
+        }],
+    }]}
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {'boolValue': value}
+    if isinstance(value, int):
+        return {'intValue': str(value)}
+    if isinstance(value, float):
+        return {'doubleValue': value}
+    return {'stringValue': str(value)}
+
+
+class JsonLinesExporter:
+    """끝난 span 을 한 줄씩 파일에 덧붙임"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def export(self, span: Span):
+        line = json.dumps(_otlp_request([span]), ensure_ascii=False)
+        with self._lock:
+            self._file.write(line + '\n')
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+_current: contextvars.ContextVar = contextvars.ContextVar('current_span', default=None)
+_exporter: Optional[JsonLinesExporter] = None
+
+
+def configure_exporter(path: Optional[str]):
+    """JSON lines 내보내기 경로 지정 (None 이면 끔)"""
+    global _exporter
+    if _exporter is not None:
+        _exporter.close()
+    _exporter = JsonLinesExporter(path) if path else None
+
+
+def current_span() -> Optional[Span]:
+    return _current.get()
+
+
+@contextlib.contextmanager
+def _run(span_: Span) -> Iterator[Span]:
+    token = _current.set(span_)
+    start = time.perf_counter_ns()
+    try:
+        yield span_
+    finally:
+        span_.end_ns = span_.start_ns + (time.perf_counter_ns() - start)
+        _current.reset(token)
+        span_.spans.append(span_)
+        if _exporter is not None:
+            _exporter.export(span_)
+
+
+@contextlib.contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Optional[Span]]:
+    """
+    구간 측정
+
+    진행 중인 trace 가 없고 내보내기도 꺼져 있으면 None 을 넘기고 측정하지 않습니다.
+    """
+    parent = _current.get()
+    if parent is None and _exporter is None:
+        yield None
+        return
+    with _run(Span(name, parent, attributes)) as s:
+        yield s
+
+
+@contextlib.contextmanager
+def trace(name: str, **attributes: Any) -> Iterator[Span]:
+    """새 trace 시작 (root.spans 에 끝난 순서대로 모든 구간이 담김)"""
+    with _run(Span(name, None, attributes)) as root:
+        yield root
+
+
+def traced(name: Optional[str] = None) -> Callable:
+    """함수 호출 전체를 span 으로 감싸는 데코레이터"""
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def breakdown(root: Span) -> List[Dict[str, Any]]:
+    """
+    trace 의 구간별 시간 (시작 순서, 같은 이름의 형제 구간은 합침)
+
+    Returns:
+        [{'name', 'depth', 'calls', 'ms', 'self_ms'}]
+    """
+    children_ms: Dict[str, float] = {}
+    for s in root.spans:
+        if s.parent_id is not None:
+            children_ms[s.parent_id] = children_ms.get(s.parent_id, 0.0) + s.duration_ms
+
+    rows: Dict[tuple, Dict[str, Any]] = {}
+    path_of: Dict[str, tuple] = {}
+    for s in sorted(root.spans, key=lambda s: (s.start_ns, s.depth)):
+        path = path_of.get(s.parent_id, ()) + (s.name,)
+        path_of[s.span_id] = path
+        row = rows.setdefault(path, {'name': s.name, 'depth': s.depth, 'calls': 0,
+                                     'ms': 0.0, 'self_ms': 0.0})
+        row['calls'] += 1
+        row['ms'] += s.duration_ms
+        row['self_ms'] += s.duration_ms - children_ms.get(s.span_id, 0.0)
+    return list(rows.values())
+
+
+configure_exporter(os.getenv("REALESTATE_TRACE_FILE"))
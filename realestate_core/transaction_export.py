@@ -0,0 +1,112 @@
+"""
+거래 데이터 내보내기
+
+필터 결과를 청크 단위로 받아 CSV / Parquet / Arrow IPC / Excel 로 기록합니다.
+전체 결과를 하나의 문자열이나 프레임으로 만들지 않으므로, 내보내기 크기가
+커져도 메모리 사용량은 청크 하나 분량을 크게 넘지 않습니다.
+
+- CSV, Excel: 화면과 같은 한글 컬럼 (사람이 보는 용도)
+- Parquet, Arrow: 원본 타입 그대로 (노트북/분석 도구용)
+"""
+
+import io
+from typing import BinaryIO, Callable, Dict, Iterable, NamedTuple
+
+import pandas as pd
+
+
+def write_csv(chunks: Iterable[pd.DataFrame], sink: BinaryIO):
+    """UTF-8 (BOM) CSV"""
+    sink.write('\ufeff'.encode('utf-8'))  # 엑셀 호환용 BOM
+    for i, chunk in enumerate(chunks):
+        sink.write(chunk.to_csv(index=False, header=(i == 0)).encode('utf-8'))
+
+
+def _iter_tables(chunks: Iterable[pd.DataFrame]):
+    """청크를 첫 청크의 스키마로 맞춘 Arrow 테이블로 변환"""
+    import pyarrow as pa
+
+    schema = None
+    for chunk in chunks:
+        table = pa.Table.from_pandas(chunk, preserve_index=False)
+        if schema is None:
+            schema = table.schema
+        else:
+            table = table.cast(schema)
+        yield table
+
+
+def write_parquet(chunks: Iterable[pd.DataFrame], sink: BinaryIO):
+    """Parquet (zstd 압축, 청크마다 row group 하나)"""
+    import pyarrow.parquet as pq
+
+    writer = None
+    try:
+        for table in _iter_tables(chunks):
+            if writer is None:
+                writer = pq.ParquetWriter(sink, table.schema, compression='zstd')
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def write_arrow(chunks: Iterable[pd.DataFrame], sink: BinaryIO):
+    """Arrow IPC 파일 (Feather v2)"""
+    import pyarrow as pa
+
+    writer = None
+    try:
+        for table in _iter_tables(chunks):
+            if writer is None:
+                writer = pa.ipc.new_file(sink, table.schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def write_excel(chunks: Iterable[pd.DataFrame], sink: BinaryIO,
+                sheet_name: str = '실거래'):
+    """Excel (openpyxl write-only 모드로 행 단위 기록)"""
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(sheet_name)
+
+    for i, chunk in enumerate(chunks):
+        if i == 0:
+            ws.append(list(chunk.columns))
+        # 빈 값(<NA>, NaT)은 openpyxl 이 쓸 수 없으므로 빈 셀(None)로
+        chunk = chunk.astype(object).where(chunk.notna(), None)
+        for row in chunk.itertuples(index=False, name=None):
+            ws.append(row)
+
+    wb.save(sink)
+
+
+class ExportFormat(NamedTuple):
+    extension: str
+    mime: str
+    writer: Callable[[Iterable[pd.DataFrame], BinaryIO], None]
+    formatted: bool  # True면 화면용 한글 컬럼, False면 원본 타입
+
+
+EXPORT_FORMATS: Dict[str, ExportFormat] = {
+    'CSV': ExportFormat('csv', 'text/csv', write_csv, True),
+    'Excel': ExportFormat(
+        'xlsx',
+        'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+        write_excel,
+        True
+    ),
+    'Parquet': ExportFormat('parquet', 'application/vnd.apache.parquet', write_parquet, False),
+    'Arrow': ExportFormat('arrow', 'application/vnd.apache.arrow.file', write_arrow, False),
+}
+
+
+def export_bytes(fmt: str, chunks: Iterable[pd.DataFrame]) -> bytes:
+    """선택한 형식으로 청크를 기록한 결과 바이트"""
+    buffer = io.BytesIO()
+    EXPORT_FORMATS[fmt].writer(chunks, buffer)
+    return buffer.getvalue()
@@ -0,0 +1,190 @@
+"""
+거래 목록 필터/조회 엔진
+
+render_list_tab 에서 위젯이 바뀔 때마다 df.copy(), 불리언 마스크, 문자열 정렬을
+반복하지 않도록 캐시된 거래 프레임 위에 인덱스를 한 번만 만들어 둡니다.
+
+- 아파트/동: 카테고리 코드(정수) 비교
+- 가격/거래일/평수: 미리 정렬해 둔 위치 배열 + searchsorted 범위 탐색
+- 결과: 원본 프레임은 복사하지 않고 행 위치 배열만 담은 TransactionView 반환
+"""
+
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+# 정렬 옵션 -> (정렬 컬럼, 오름차순 여부)
+SORT_OPTIONS: Dict[str, Tuple[str, bool]] = {
+    '거래일 (최신순)': ('date', False),
+    '거래일 (오래된순)': ('date', True),
+    '거래가 (높은순)': ('price', False),
+    '거래가 (낮은순)': ('price', True),
+    '평수 (큰순)': ('py', False),
+    '평수 (작은순)': ('py', True),
+}
+
+
+def _as_categorical(series: pd.Series) -> pd.Categorical:
+    """문자열 컬럼을 정렬된 카테고리로 변환 (이미 카테고리면 그대로 사용)"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.array
+    return pd.Categorical(series.fillna('').astype(str))
+
+
+def _sort_key_values(series: pd.Series) -> np.ndarray:
+    """정렬/범위 탐색용 숫자 배열 (날짜는 int64 나노초)"""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series.to_numpy(dtype='datetime64[ns]').view('i8')
+    return series.to_numpy()
+
+
+class TransactionView:
+    """
+    필터 결과 뷰
+
+    원본 프레임과 행 위치 배열만 보관하며, 실제 행은 필요한 구간만
+    rows() 로 꺼낼 때 만들어집니다.
+    """
+
+    def __init__(self, df: pd.DataFrame, positions: np.ndarray):
+        self.df = df
+        self.positions = positions
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def rows(self, start: int = 0, stop: Optional[int] = None,
+             columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """[start, stop) 구간의 행만 꺼내기"""
+        frame = self.df if columns is None else self.df[columns]
+        return frame.iloc[self.positions[start:stop]]
+
+    def n_pages(self, page_size: int) -> int:
+        return max(1, -(-len(self) // page_size))
+
+    def page(self, page_no: int, page_size: int,
+             columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """1부터 시작하는 page_no 번째 페이지의 행"""
+        start = (page_no - 1) * page_size
+        return self.rows(start, start + page_size, columns)
+
+    def iter_chunks(self, chunk_size: int = 50_000,
+                    columns: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+        """
+        전체 결과를 chunk_size 행씩 나누어 순회 (내보내기용)
+
+        결과가 없어도 빈 청크 하나를 넘기므로, 내보낸 파일에 헤더와 스키마가 남습니다.
+        """
+        if len(self) == 0:
+            yield self.rows(0, 0, columns)
+            return
+        for start in range(0, len(self), chunk_size):
+            yield self.rows(start, start + chunk_size, columns)
+
+
+class TransactionIndex:
+    """캐시된 거래 프레임 위의 필터/정렬 인덱스"""
+
+    RANGE_COLUMNS = ('price', 'date', 'py')
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+
+        # 법정동 필터(불리언 마스크) 뒤에도 남는 안 쓰는 카테고리는 옵션에서 빠지도록 제거
+        apt = _as_categorical(df['apt']).remove_unused_categories()
+        dong = _as_categorical(df['dong']).remove_unused_categories()
+        self.apt_codes = np.asarray(apt.codes)
+        self.dong_codes = np.asarray(dong.codes)
+        self.apt_categories = apt.categories
+        self.dong_categories = dong.categories
+
+        # 범위 컬럼별 정렬 순서와 정렬된 값
+        self._order: Dict[str, np.ndarray] = {}
+        self._sorted: Dict[str, np.ndarray] = {}
+        for col in self.RANGE_COLUMNS:
+            if col not in df.columns:
+                continue
+            values = _sort_key_values(df[col])
+            order = np.argsort(values, kind='stable')
+            self._order[col] = order
+            self._sorted[col] = values[order]
+
+    def __len__(self) -> int:
+        return len(self.df)
+
+    # ---------- 위젯 옵션 ----------
+
+    def apt_options(self) -> List[str]:
+        return [c for c in self.apt_categories if c]
+
+    def dong_options(self) -> List[str]:
+        return [c for c in self.dong_categories if c]
+
+    def value_range(self, col: str) -> Tuple:
+        """컬럼의 (최솟값, 최댓값)"""
+        values = self._sorted[col]
+        return values[0], values[-1]
+
+    # ---------- 조회 ----------
+
+    def _range_slice(self, col: str, low, high) -> np.ndarray:
+        """정렬 배열에서 low <= 값 <= high 인 행 위치"""
+        values = self._sorted[col]
+        if col == 'date':
+            low = pd.Timestamp(low).value if low is not None else None
+            high = pd.Timestamp(high).value if high is not None else None
+        lo = 0 if low is None else np.searchsorted(values, low, side='left')
+        hi = len(values) if high is None else np.searchsorted(values, high, side='right')
+        return self._order[col][lo:hi]
+
+    @staticmethod
+    def _category_code(categories: pd.Index, value: str) -> int:
+        try:
+            return categories.get_loc(value)
+        except KeyError:
+            return -2  # 존재하지 않는 값: 어떤 코드와도 일치하지 않음
+
+    def query(self,
+              apt: Optional[str] = None,
+              dong: Optional[str] = None,
+              price_range: Optional[Tuple[int, int]] = None,
+              date_range: Optional[Tuple] = None,
+              sort_by: str = 'date',
+              ascending: bool = False) -> TransactionView:
+        """
+        조건에 맞는 거래를 정렬된 뷰로 반환
+
+        Args:
+            apt: 아파트명 (None이면 전체)
+            dong: 동 이름 (None이면 전체)
+            price_range: (최소, 최대) 거래가, 양 끝 포함
+            date_range: (시작일, 종료일), 양 끝 포함
+            sort_by: 'date' | 'price' | 'py'
+            ascending: 오름차순 여부
+        """
+        n = len(self.df)
+        mask: Optional[np.ndarray] = None
+
+        for col, bounds in (('price', price_range), ('date', date_range)):
+            if bounds is None:
+                continue
+            hit = np.zeros(n, dtype=bool)
+            hit[self._range_slice(col, *bounds)] = True
+            mask = hit if mask is None else mask & hit
+
+        if apt is not None:
+            hit = self.apt_codes == self._category_code(self.apt_categories, apt)
+            mask = hit if mask is None else mask & hit
+
+        if dong is not None:
+            hit = self.dong_codes == self._category_code(self.dong_categories, dong)
+            mask = hit if mask is None else mask & hit
+
+        order = self._order[sort_by]
+        positions = order if mask is None else order[mask[order]]
+        if not ascending:
+            positions = positions[::-1]
+
+        return TransactionView(self.df, positions)
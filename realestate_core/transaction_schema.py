@@ -0,0 +1,142 @@
+"""
+거래 프레임 압축 스키마
+
+국토부 API 응답을 그대로 옮긴 프레임은 모든 컬럼이 파이썬 문자열(object)이라
+캐시에 올라가는 메모리가 크고 groupby 도 느립니다. 여기서는 분석에 쓰는
+컬럼을 좁은 타입으로 바꾸고, date 와 중복되는 year/month/day 는 버립니다.
+
+    apt, dong, jibun, bjdong_cd -> category
+    price                       -> int32 (만원)
+    area                        -> float32 (㎡)
+    floor, build_year           -> Int16 (nullable, 값이 없으면 <NA>)
+    date                        -> datetime64
+
+층·건축년도는 빠진 거래가 있어 nullable 정수로 두며, 빈 값은 평균·중앙값 같은
+집계에서 자동으로 빠집니다. 예전 형식(int16, 빈 값 0)으로 캐시·저장된 프레임은
+다시 변환할 때 0 을 빈 값으로 읽습니다 (0층·0년은 실제 값으로 나오지 않음).
+"""
+
+from typing import Dict, Iterable, Optional
+
+import pandas as pd
+
+
+COMPACT_DTYPES = {
+    'apt': 'category',
+    'dong': 'category',
+    'jibun': 'category',
+    'bjdong_cd': 'category',
+    'price': 'int32',
+    'area': 'float32',
+    'floor': 'Int16',
+    'build_year': 'Int16',
+}
+
+# date 컬럼과 중복되는 원본 날짜 조각
+DATE_PART_COLUMNS = ['year', 'month', 'day']
+
+
+def to_number(series: pd.Series) -> pd.Series:
+    """'12,345' 같은 금액 문자열도 숫자로 (변환 실패는 NaN)"""
+    if pd.api.types.is_numeric_dtype(series):
+        return series
+    return pd.to_numeric(series.astype(str).str.replace(',', '', regex=False), errors='coerce')
+
+
+def _to_int(series: pd.Series, dtype: str) -> pd.Series:
+    """
+    숫자 문자열을 정수로
+
+    빈 값/변환 실패는 nullable 타입(Int16 등)이면 <NA>(0 도 <NA>), 아니면 0 입니다.
+    """
+    if dtype[0] == 'I':
+        numbers = series if pd.api.types.is_integer_dtype(series) else to_number(series).round()
+        # 예전 형식은 빈 값을 0 으로 저장했으므로 0 도 빈 값으로
+        return numbers.mask((numbers == 0).fillna(False)).astype(dtype)
+    if pd.api.types.is_integer_dtype(series):
+        return series.astype(dtype)
+    return to_number(series).fillna(0).astype(dtype)
+
+
+def compact_transactions(df: pd.DataFrame,
+                         dtypes: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+    """
+    거래 프레임을 압축 스키마로 변환
+
+    이미 변환된 프레임에 다시 적용해도 결과가 같으므로, 여러 달을 concat 해서
+    카테고리가 object 로 풀린 경우에도 그대로 호출하면 됩니다.
+
+    Args:
+        dtypes: COMPACT_DTYPES 에 더할 컬럼별 타입 (데이터셋 고유 컬럼)
+    """
+    if df.empty:
+        return df
+
+    out = df.copy()
+
+    if 'date' not in out.columns and all(c in out.columns for c in DATE_PART_COLUMNS):
+        parts = {c: pd.to_numeric(out[c], errors='coerce') for c in DATE_PART_COLUMNS}
+        out['date'] = pd.to_datetime(pd.DataFrame(parts), errors='coerce')
+    out = out.drop(columns=[c for c in DATE_PART_COLUMNS if c in out.columns])
+
+    for col, dtype in {**COMPACT_DTYPES, **(dtypes or {})}.items():
+        if col not in out.columns:
+            continue
+        if dtype == 'category':
+            if not isinstance(out[col].dtype, pd.CategoricalDtype):
+                out[col] = out[col].fillna('').astype(str).astype('category')
+        elif dtype.lower().startswith('int'):
+            out[col] = _to_int(out[col], dtype)
+        else:
+            out[col] = to_number(out[col]).astype(dtype)
+
+    return out
+
+
+def empty_transactions(columns: Iterable[str],
+                       dtypes: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+    """
+    행이 없는 압축 스키마 프레임
+
+    거래가 없는 달도 컬럼·타입이 같은 파티션으로 저장해야 Parquet 을 읽는 쪽
+    (rollup, DuckDB)이 컬럼을 찾을 수 있습니다.
+
+    Args:
+        columns: 원본 컬럼 (year/month/day 는 date 하나로 바뀜)
+        dtypes: COMPACT_DTYPES 에 더할 컬럼별 타입 (데이터셋 고유 컬럼)
+    """
+    columns = [c for c in columns if c not in DATE_PART_COLUMNS] + ['date']
+    all_dtypes = {**COMPACT_DTYPES, **(dtypes or {}), 'date': 'datetime64[us]'}
+    # 빈 카테고리도 문자열 카테고리로 두어야 Parquet 타입이 null 이 아닌 문자열이 됨
+    category = pd.CategoricalDtype(pd.Index([], dtype='str'))
+    return pd.DataFrame({
+        col: pd.Series([], dtype='str').astype(
+            category if all_dtypes.get(col) == 'category' else all_dtypes.get(col, 'str')
+        )
+        for col in columns
+    })
+
+
+def memory_usage_report(df: pd.DataFrame,
+                        before: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """
+    컬럼별 메모리 사용량 (바이트, 문자열 내용까지 포함)
+
+    before 를 주면 변환 전 사용량과 비율도 함께 보여줍니다.
+    마지막 행은 합계(인덱스 포함)입니다.
+    """
+    usage = df.memory_usage(deep=True)
+    report = pd.DataFrame({
+        'dtype': df.dtypes.astype(str).reindex(usage.index).fillna(''),
+        'bytes': usage,
+    })
+
+    if before is not None:
+        report['before_bytes'] = before.memory_usage(deep=True).reindex(report.index)
+
+    report.loc['합계'] = {'dtype': '', 'bytes': usage.sum()}
+    if before is not None:
+        report.loc['합계', 'before_bytes'] = before.memory_usage(deep=True).sum()
+        report['ratio'] = (report['before_bytes'] / report['bytes']).round(1)
+
+    return report
@@ -0,0 +1,80 @@
+"""
+거래 데이터 가공 유틸리티
+"""
+
+from typing import Tuple
+
+import pandas as pd
+
+from .region_index import RegionIndex
+
+PYEONG_M2 = 3.3058
+
+
+def calc_pyeong(m2: float) -> float:
+    """제곱미터를 평수로 변환"""
+    try:
+        return round(float(m2) / PYEONG_M2, 1)
+    except (TypeError, ValueError):
+        return 0
+
+
+def add_pyeong(df: pd.DataFrame) -> pd.DataFrame:
+    """area(㎡) 컬럼으로 py(평) 컬럼 추가 (벡터 연산)"""
+    df['py'] = (df['area'] / PYEONG_M2).round(1).astype('float32')
+    return df
+
+
+def format_price_to_uk(price: int) -> str:
+    """만원 단위를 억/천 단위로 변환"""
+    try:
+        uk = price // 10000
+        man = price % 10000
+
+        if uk > 0:
+            if man > 0:
+                return f"{uk}.{man//100:02d}억"
+            return f"{uk}억"
+        return f"{price}만"
+    except TypeError:
+        return str(price)
+
+
+def filter_by_bjdong(df: pd.DataFrame, regions: RegionIndex,
+                     lawd_cd: str, bjdong_cd: str) -> pd.DataFrame:
+    """
+    10자리 법정동 코드로 거래 필터
+
+    응답의 sggCd+umdCd 코드를 비교하고, umdCd 가 없는 응답은 동 이름을
+    법정동 코드로 조인해 비교합니다 (카테고리 단위로 매핑하므로 행 수와 무관).
+    """
+    if 'bjdong_cd' in df.columns and (df['bjdong_cd'].cat.categories.str.len() == 10).all():
+        codes = df['bjdong_cd']
+    else:
+        codes = df['dong'].map(regions.eupmyeondong_codes(lawd_cd))
+
+    return df[(codes == bjdong_cd).to_numpy()]
+
+
+# 가격대별 색상 (카카오 스타일): 하위 25% 녹색 / 중저가 파란색 / 중고가 주황색 / 상위 25% 빨간색
+PRICE_COLORS = ("#4CAF50", "#2196F3", "#FF9800", "#F44336")
+
+
+def price_quartiles(df: pd.DataFrame) -> Tuple[float, float, float]:
+    """거래가 25/50/75% 분위 (마커를 여러 개 칠할 때 한 번만 계산)"""
+    return tuple(df['price'].quantile([0.25, 0.50, 0.75]).tolist())
+
+
+def price_color(price: float, quartiles: Tuple[float, float, float]) -> str:
+    """price_quartiles 구간별 색상"""
+    for upper, color in zip(quartiles, PRICE_COLORS):
+        if price <= upper:
+            return color
+    return PRICE_COLORS[-1]
+
+
+def get_price_color(price: int, df: pd.DataFrame) -> str:
+    """가격대별 색상 반환 (카카오 스타일)"""
+    if df.empty:
+        return "#258fff"
+    return price_color(price, price_quartiles(df))
@@ -0,0 +1,290 @@
+"""
+지도 뷰포트 단위 마커/집계
+
+지도에 보이는 범위(뷰포트)와 줌에 맞춰 단지 마커 또는 격자 집계를 만듭니다.
+단지 좌표는 SpatialIndex 에 두고, 결과는 줌 단계별 고정 타일 단위로 캐시해
+지도를 옮기면 새로 드러난 타일만 계산합니다.
+
+    layer = ComplexLayer(summarize_complexes(df))
+    layer.locate(lambda dong, jibun: get_coords(...), limit=100)
+    view = Viewport.from_folium(st_folium_state) or Viewport.around(*layer.home, zoom=14)
+    result = layer.query(view)     # result.frame, result.detail, result.built
+
+줌이 DETAIL_ZOOM 이상이면 단지마다 마커 하나이고, 그보다 멀면 화면에서 약
+CLUSTER_PX 픽셀 칸으로 묶은 집계(단지 수, 거래 수, 거래 가중 평균가, 가중 중심)입니다.
+"""
+
+import math
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .spatial import REF_LAT, SpatialIndex
+
+DETAIL_ZOOM = 15          # 이 줌부터 단지별 마커
+MIN_ZOOM = 5              # 이보다 멀리서도 이 줌의 칸으로 집계
+CLUSTER_PX = 64           # 집계 칸 한 변 (화면 픽셀)
+TILE_CELLS = 8            # 캐시 타일 한 변 = 집계 칸 8개
+TILE_PX = 256             # 웹 메르카토르 타일 크기 (줌 0 에서 세계 폭)
+TILE_CACHE_SIZE = 1024
+MAX_VIEW_TILES = 64       # 뷰포트 하나에 넘으면 한 단계 멀리 집계
+MAX_MARKERS = 300         # 단지별 마커 상한 (넘으면 거래 많은 단지만)
+
+CLUSTER_COLUMNS = ['lat', 'lon', 'complexes', 'count', 'avg_price', 'ratio']
+
+
+class Viewport(NamedTuple):
+    """지도에 보이는 범위 (도)와 줌"""
+    south: float
+    west: float
+    north: float
+    east: float
+    zoom: int
+
+    @classmethod
+    def from_folium(cls, state: Optional[Dict[str, Any]]) -> Optional['Viewport']:
+        """st_folium 반환값의 bounds/zoom (아직 지도가 범위를 보고하지 않았으면 None)"""
+        try:
+            sw, ne = state['bounds']['_southWest'], state['bounds']['_northEast']
+            return cls(float(sw['lat']), float(sw['lng']),
+                       float(ne['lat']), float(ne['lng']), int(state['zoom']))
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    @classmethod
+    def around(cls, lat: float, lon: float, zoom: int,
+               width_px: int = 1000, height_px: int = 600) -> 'Viewport':
+        """중심과 줌으로 추정한 뷰포트 (지도가 처음 그려질 때)"""
+        deg_per_px = 360 / (TILE_PX * 2 ** zoom)
+        half_lon = width_px / 2 * deg_per_px
+        half_lat = height_px / 2 * deg_per_px * math.cos(math.radians(lat))
+        return cls(lat - half_lat, lon - half_lon, lat + half_lat, lon + half_lon, zoom)
+
+
+class ViewportMarkers(NamedTuple):
+    frame: pd.DataFrame   # detail 이면 단지 행 + lat/lon, 아니면 CLUSTER_COLUMNS
+    detail: bool
+    level: int            # 집계에 쓴 줌 단계
+    tiles: int            # 뷰포트를 덮은 타일 수
+    built: int            # 그중 새로 계산한 타일 수 (나머지는 캐시)
+    hidden: int           # 상한에 걸려 빠진 단지 수
+
+
+def cell_size(level: int) -> Tuple[float, float]:
+    """줌 단계의 집계 칸 (위도 폭, 경도 폭) - 화면에서 정사각형에 가깝게"""
+    lon = 360 / (TILE_PX * 2 ** level) * CLUSTER_PX
+    return lon * math.cos(math.radians(REF_LAT)), lon
+
+
+def _tile_size(level: int) -> Tuple[float, float]:
+    cell_lat, cell_lon = cell_size(level)
+    return cell_lat * TILE_CELLS, cell_lon * TILE_CELLS
+
+
+class ComplexLayer:
+    """
+    단지 집계의 뷰포트 조회 (좌표 추가 가능, 스레드 안전)
+
+    complexes 는 summarize_complexes 결과이며 ratio(전세가율) 컬럼이 있으면 집계에
+    함께 씁니다. lat/lon 이 없거나 비어 있는 단지는 locate 로 나눠 채울 수 있습니다.
+    """
+
+    def __init__(self, complexes: pd.DataFrame):
+        self.complexes = complexes.reset_index(drop=True)
+        n = len(self.complexes)
+        lat = self._column('lat', n)
+        lon = self._column('lon', n)
+        self._count = self.complexes['count'].to_numpy(dtype='float64')
+        self._price = self.complexes['avg_price'].to_numpy(dtype='float64')
+        self._ratio = self._column('ratio', n)
+        self._index = SpatialIndex()
+        self._index.add(lat, lon, ids=np.arange(n))
+        self._tried = np.isfinite(lat) & np.isfinite(lon)   # 좌표 변환을 시도한 단지
+        self._tiles: "OrderedDict[Tuple[int, int, int], pd.DataFrame]" = OrderedDict()
+        self._generation = 0     # 좌표가 추가될 때마다 증가 (그 전에 계산한 타일은 버림)
+        self._lock = threading.Lock()
+        self.home: Optional[Tuple[float, float]] = None
+        self._set_home(lat, lon)
+
+    def _column(self, name: str, n: int) -> np.ndarray:
+        if name in self.complexes:
+            return self.complexes[name].to_numpy(dtype='float64', na_value=np.nan)
+        return np.full(n, np.nan)
+
+    def _set_home(self, lat: np.ndarray, lon: np.ndarray):
+        """처음 좌표가 생긴 단지들의 중앙값을 지도 중심으로 고정"""
+        ok = np.isfinite(lat) & np.isfinite(lon)
+        if self.home is None and ok.any():
+            self.home = (float(np.median(lat[ok])), float(np.median(lon[ok])))
+
+    @property
+    def located(self) -> int:
+        """좌표가 있는 단지 수"""
+        return len(self._index)
+
+    @property
+    def pending(self) -> int:
+        """아직 좌표 변환을 시도하지 않은 단지 수"""
+        return int((~self._tried).sum())
+
+    def located_frame(self) -> pd.DataFrame:
+        """좌표가 있는 단지 (lat, lon 포함)"""
+        pos = np.arange(len(self._index))
+        rows = np.asarray(self._index.ids_at(pos), dtype='int64')
+        lat, lon = self._index.coords_at(pos)
+        return self.complexes.iloc[rows].assign(lat=lat, lon=lon)
+
+    # ---------- 좌표 채우기 ----------
+
+    def locate(self, geocode: Callable[[str, str], Tuple[Optional[float], Optional[float]]],
+               limit: int) -> int:
+        """
+        좌표 없는 단지를 거래 많은 순으로 최대 limit 개 변환해 추가
+
+        Args:
+            geocode: (동, 지번) -> (lat, lon), 실패하면 (None, None)
+
+        Returns:
+            새로 좌표가 생긴 단지 수
+        """
+        with self._lock:
+            todo = np.flatnonzero(~self._tried)
+            todo = todo[np.argsort(-self._count[todo], kind='stable')][:limit]
+            self._tried[todo] = True  # 동시에 도는 다른 세션이 같은 단지를 변환하지 않게
+        if len(todo) == 0:
+            return 0
+
+        coords = [geocode(dong, jibun) for dong, jibun in
+                  zip(self.complexes['dong'].iloc[todo], self.complexes['jibun'].iloc[todo])]
+        lat = np.array([lat or np.nan for lat, _ in coords], dtype='float64')
+        lon = np.array([lon or np.nan for _, lon in coords], dtype='float64')
+        ok = np.isfinite(lat) & np.isfinite(lon)
+        if not ok.any():
+            return 0
+
+        self._index.add(lat[ok], lon[ok], ids=todo[ok])
+        with self._lock:
+            self._generation += 1
+            self._invalidate(lat[ok], lon[ok])
+            self._set_home(lat[ok], lon[ok])
+        return int(ok.sum())
+
+    def _invalidate(self, lat: np.ndarray, lon: np.ndarray):
+        """새 점이 들어간 타일을 캐시에서 제거 (lock 안에서 호출)"""
+        for level in {key[0] for key in self._tiles}:
+            tile_lat, tile_lon = _tile_size(level)
+            ty = np.floor(lat / tile_lat).astype('int64')
+            tx = np.floor(lon / tile_lon).astype('int64')
+            for tile in set(zip(tx.tolist(), ty.tolist())):
+                self._tiles.pop((level, *tile), None)
+
+    # ---------- 조회 ----------
+
+    def query(self, view: Viewport, limit: int = MAX_MARKERS) -> ViewportMarkers:
+        """
+        뷰포트를 덮는 타일의 마커/집계 (캐시에 없는 타일만 계산)
+
+        단지별 마커는 뷰포트 안의 단지만, limit 개를 넘으면 거래 많은 순으로 남깁니다.
+        """
+        level = min(max(view.zoom, MIN_ZOOM), DETAIL_ZOOM)
+        keys = self._tile_keys(view, level)
+        while len(keys) > MAX_VIEW_TILES and level > 0:
+            level -= 1
+            keys = self._tile_keys(view, level)
+
+        frames: List[pd.DataFrame] = []
+        built = 0
+        for key in keys:
+            with self._lock:
+                frame = self._tiles.get(key)
+                if frame is not None:
+                    self._tiles.move_to_end(key)
+                generation = self._generation
+            if frame is None:
+                frame = self._build_tile(*key)
+                built += 1
+                with self._lock:
+                    if generation == self._generation:
+                        self._tiles[key] = frame
+                        while len(self._tiles) > TILE_CACHE_SIZE:
+                            self._tiles.popitem(last=False)
+            frames.append(frame)
+
+        detail = level >= DETAIL_ZOOM
+        frames = [f for f in frames if not f.empty]
+        if frames:
+            frame = pd.concat(frames, ignore_index=True)
+        else:
+            frame = self._empty(detail)
+
+        hidden = 0
+        if detail:
+            inside = (frame['lat'].between(view.south, view.north)
+                      & frame['lon'].between(view.west, view.east))
+            frame = frame[inside.to_numpy()]
+            if len(frame) > limit:
+                hidden = len(frame) - limit
+                frame = frame.nlargest(limit, 'count', keep='first')
+        return ViewportMarkers(frame, detail, level, len(keys), built, hidden)
+
+    @staticmethod
+    def _tile_keys(view: Viewport, level: int) -> List[Tuple[int, int, int]]:
+        tile_lat, tile_lon = _tile_size(level)
+        tx0, tx1 = math.floor(view.west / tile_lon), math.floor(view.east / tile_lon)
+        ty0, ty1 = math.floor(view.south / tile_lat), math.floor(view.north / tile_lat)
+        return [(level, tx, ty) for ty in range(ty0, ty1 + 1) for tx in range(tx0, tx1 + 1)]
+
+    def _empty(self, detail: bool) -> pd.DataFrame:
+        if detail:
+            return self.complexes.iloc[:0].assign(lat=np.empty(0), lon=np.empty(0))
+        return pd.DataFrame({col: np.empty(0) for col in CLUSTER_COLUMNS})
+
+    def _build_tile(self, level: int, tx: int, ty: int) -> pd.DataFrame:
+        tile_lat, tile_lon = _tile_size(level)
+        south, west = ty * tile_lat, tx * tile_lon
+        pos = self._index.bbox(south, west, south + tile_lat, west + tile_lon)
+        lat, lon = self._index.coords_at(pos)
+        # 경계 위의 점은 한 타일에만 (반열린 구간)
+        own = (np.floor(lat / tile_lat) == ty) & (np.floor(lon / tile_lon) == tx)
+        pos, lat, lon = pos[own], lat[own], lon[own]
+        rows = np.asarray(self._index.ids_at(pos), dtype='int64')
+
+        if level >= DETAIL_ZOOM:
+            return self.complexes.iloc[rows].assign(lat=lat, lon=lon)
+        return self._clusters(rows, lat, lon, level, tx, ty)
+
+    def _clusters(self, rows: np.ndarray, lat: np.ndarray, lon: np.ndarray,
+                  level: int, tx: int, ty: int) -> pd.DataFrame:
+        """타일 안의 단지를 집계 칸별로 묶음 (거래 수 가중)"""
+        cell_lat, cell_lon = cell_size(level)
+        iy = np.clip(np.floor(lat / cell_lat).astype('int64') - ty * TILE_CELLS, 0, TILE_CELLS - 1)
+        ix = np.clip(np.floor(lon / cell_lon).astype('int64') - tx * TILE_CELLS, 0, TILE_CELLS - 1)
+        cell = iy * TILE_CELLS + ix
+        size = TILE_CELLS * TILE_CELLS
+
+        weight = self._count[rows]
+        complexes = np.bincount(cell, minlength=size)
+        trades = np.bincount(cell, weights=weight, minlength=size)
+        ratio = self._ratio[rows]
+        has_ratio = np.isfinite(ratio)
+        ratio_weight = np.bincount(cell, weights=np.where(has_ratio, weight, 0), minlength=size)
+
+        keep = complexes > 0
+
+        def weighted(values: np.ndarray) -> np.ndarray:
+            return np.bincount(cell, weights=weight * values, minlength=size)[keep] / trades[keep]
+
+        ratio_sum = np.bincount(cell, weights=np.where(has_ratio, weight * ratio, 0), minlength=size)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            ratio = ratio_sum[keep] / ratio_weight[keep]   # 전세가율 있는 단지가 없으면 NaN
+        return pd.DataFrame({
+            'lat': weighted(lat),
+            'lon': weighted(lon),
+            'complexes': complexes[keep],
+            'count': trades[keep].astype('int64'),
+            'avg_price': weighted(self._price[rows]),
+            'ratio': ratio,
+        })
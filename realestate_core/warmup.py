@@ -0,0 +1,208 @@
+"""
+인기 지역 캐시 워밍
+
+대시보드는 지역·기간을 고를 때마다 접근 통계(AccessStats)를 남깁니다. 워밍
+작업은 최근 며칠 동안 많이 본 시군구 N곳의 실거래 프레임(자주 고른 기간 중
+가장 긴 기간의 월별 조회)과 거래 많은 단지의 좌표를 한가한 시간에 미리 받아
+디스크 캐시에 채웁니다. 1/3/6개월은 같은 월별 캐시를 나눠 쓰므로 가장 긴
+기간만 받으면 나머지도 적중합니다.
+
+    stats = AccessStats()
+    warm_up(stats.top(20))
+
+대시보드 프로세스 안의 파생 캐시(단지 집계, 거래 목록 인덱스, 그림 스펙)는
+TTL 이 10분이라 미리 만들어 둘 수 없지만, 워밍된 프레임에서 수 ms 안에
+만들어지므로 아침 첫 조회도 네트워크를 기다리지 않습니다.
+
+호출은 선조회 우선순위로 나가 일일 한도의 90% 까지만 쓰며, 남은 한도로
+다음 시군구를 다 채울 수 없으면 거기서 멈춥니다(인기 순이므로 덜 중요한
+지역부터 빠짐).
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence
+
+import pandas as pd
+
+from .config import CACHE_DIR
+from .fileio import atomic_json_read, atomic_json_write
+from .geocode import get_coords, summarize_complexes
+from .molit import MolitAPIError, fetch_dataset, recent_deal_months
+from .quota import KST, Priority, QuotaExceeded, default_scheduler, fetch_priority
+from .singleflight import file_lock
+
+logger = logging.getLogger(__name__)
+
+# 접근 통계 보관 일수
+ACCESS_KEEP_DAYS = 14
+
+# 시군구마다 미리 좌표를 받을 단지 수 (거래 많은 순, 대시보드 지도 첫 화면 몇 번 분량)
+GEOCODE_WARM_LIMIT = 300
+
+
+class DistrictAccess(NamedTuple):
+    lawd_cd: str
+    sido: str
+    sigungu: str
+    count: int                # 기간 동안 조회 횟수
+    months: tuple             # 고른 조회 기간들 (오름차순)
+    jeonse: bool              # 전세가율을 함께 본 적이 있는지
+
+
+class WarmResult(NamedTuple):
+    lawd_cd: str
+    months: int
+    rows: int
+    geocoded: int
+    seconds: float
+
+
+# ==================== 접근 통계 ====================
+
+class AccessStats:
+    """
+    시군구별 일일 조회 횟수 (JSON 파일, 프로세스 간 공유)
+
+    {"2024-05-01": {"11680": {"sido": "서울특별시", "sigungu": "강남구",
+                              "months": {"1": 3, "6": 1}, "jeonse": 1}}}
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.path.join(CACHE_DIR, 'access_stats.json')
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def today() -> str:
+        return datetime.now(KST).strftime('%Y-%m-%d')
+
+    def _read(self) -> Dict[str, Dict[str, dict]]:
+        return atomic_json_read(self.path, {})
+
+    def _write(self, data: Dict[str, Dict[str, dict]]):
+        atomic_json_write(self.path, data)
+
+    def record(self, lawd_cd: str, sido: str, sigungu: str, months: int, jeonse: bool = False):
+        """조회 한 번 기록"""
+        with self._lock, file_lock(self.path + '.lock'):
+            data = self._read()
+            today = self.today()
+            entry = data.setdefault(today, {}).setdefault(
+                lawd_cd, {'sido': sido, 'sigungu': sigungu, 'months': {}, 'jeonse': 0}
+            )
+            entry['months'][str(months)] = entry['months'].get(str(months), 0) + 1
+            entry['jeonse'] += int(jeonse)
+            # 보관 기간이 지난 날짜는 버림
+            cutoff = (datetime.now(KST) - timedelta(days=ACCESS_KEEP_DAYS)).strftime('%Y-%m-%d')
+            self._write({day: usage for day, usage in data.items() if day > cutoff})
+
+    def districts(self, days: int = 7) -> List[DistrictAccess]:
+        """최근 days 일 동안 조회한 시군구 (많이 조회한 순)"""
+        cutoff = (datetime.now(KST) - timedelta(days=days)).strftime('%Y-%m-%d')
+        names: Dict[str, tuple] = {}
+        months: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+        jeonse: Dict[str, int] = defaultdict(int)
+        for day, usage in sorted(self._read().items()):
+            if day <= cutoff:
+                continue
+            for lawd_cd, entry in usage.items():
+                names[lawd_cd] = (entry['sido'], entry['sigungu'])
+                for m, count in entry['months'].items():
+                    months[lawd_cd][int(m)] += count
+                jeonse[lawd_cd] += entry.get('jeonse', 0)
+
+        ranked = sorted(names, key=lambda cd: (-sum(months[cd].values()), cd))
+        return [
+            DistrictAccess(cd, *names[cd], sum(months[cd].values()),
+                           tuple(sorted(months[cd])), jeonse[cd] > 0)
+            for cd in ranked
+        ]
+
+    def top(self, n: int, days: int = 7) -> List[DistrictAccess]:
+        """최근 days 일 동안 많이 조회한 시군구 n곳"""
+        return self.districts(days)[:n]
+
+    def coverage(self, districts: Sequence[DistrictAccess], days: int = 2) -> float:
+        """최근 days 일(오늘 포함) 조회 중 districts 가 차지한 비율 (워밍 적중률 추정)"""
+        recent = self.districts(days)
+        total = sum(d.count for d in recent)
+        if total == 0:
+            return float('nan')
+        covered = {d.lawd_cd for d in districts}
+        return sum(d.count for d in recent if d.lawd_cd in covered) / total
+
+
+# ==================== 워밍 ====================
+
+def _calls_needed(access: DistrictAccess, geocode_limit: int) -> Dict[str, int]:
+    """시군구 하나를 채우는 데 드는 최소 호출 수 (API 별, 페이지 수는 1로 가정)"""
+    n_months = max(access.months)
+    calls = {'molit:apt_trade': n_months, 'vworld': geocode_limit}
+    if access.jeonse:
+        calls['molit:apt_rent'] = n_months
+    return calls
+
+
+def warm_district(access: DistrictAccess,
+                  geocode_limit: int = GEOCODE_WARM_LIMIT) -> WarmResult:
+    """
+    시군구 하나의 캐시 채우기
+
+    만료된 캐시는 바로 돌려받지 않고 새로 받아(revalidate) 아침까지 유효하게 둡니다.
+    """
+    began = time.perf_counter()
+    n_months = max(access.months)
+    deal_months = recent_deal_months(n_months)
+
+    frames = [fetch_dataset.revalidate('apt_trade', access.lawd_cd, ymd) for ymd in deal_months]
+    if access.jeonse:
+        for ymd in deal_months:
+            fetch_dataset.revalidate('apt_rent', access.lawd_cd, ymd)
+
+    frames = [f for f in frames if not f.empty]
+    geocoded = 0
+    if frames:
+        df = pd.concat(frames, ignore_index=True)
+        complexes = summarize_complexes(df).nlargest(geocode_limit, 'count', keep='first')
+        for dong, jibun in zip(complexes['dong'], complexes['jibun']):
+            lat, _ = get_coords(f"{access.sido} {access.sigungu} {dong} {jibun}",
+                                revalidate=True)
+            geocoded += lat is not None
+    rows = sum(len(f) for f in frames)
+    return WarmResult(access.lawd_cd, n_months, rows, geocoded, time.perf_counter() - began)
+
+
+def warm_up(districts: Sequence[DistrictAccess], geocode_limit: int = GEOCODE_WARM_LIMIT,
+            on_district: Optional[Callable[[WarmResult], None]] = None) -> List[WarmResult]:
+    """
+    인기 순서대로 시군구 캐시 채우기 (선조회 우선순위)
+
+    다음 시군구에 필요한 호출만큼 한도가 남지 않으면 멈춥니다.
+    """
+    ledger = default_scheduler.ledger
+    results = []
+    with fetch_priority(Priority.PREFETCH):
+        for access in districts:
+            short = {
+                api: n for api, n in _calls_needed(access, geocode_limit).items()
+                if ledger.remaining(api, Priority.PREFETCH) < n
+            }
+            if short:
+                logger.warning("한도 부족으로 워밍 중단 (%s): %s", access.lawd_cd, sorted(short))
+                break
+            try:
+                result = warm_district(access, geocode_limit)
+            except QuotaExceeded as e:
+                logger.warning("워밍 중단: %s", e)
+                break
+            except MolitAPIError as e:
+                logger.warning("%s 워밍 실패: %s", access.lawd_cd, e)
+                continue
+            results.append(result)
+            if on_district:
+                on_district(result)
+    return results
@@ -0,0 +1,385 @@
+"""
+감시 목록과 새 거래 알림
+
+감시 항목(시군구 전체, 동, 단지)을 모아 두고 백그라운드 스레드가 최근 월
+파티션을 주기적으로 받아 저장소(store.TransactionStore)와 비교합니다. 새로
+나타난 거래 중 감시 항목에 맞는 것을 알림 싱크(JSON lines 파일, 웹훅,
+메모리)로 보냅니다.
+
+    poller = WatchPoller(Watchlist(), [JsonLinesSink()])
+    poller.watchlist.add(Watch('11680', apt='래미안대치팰리스'))
+    poller.start()
+
+폴링은 시군구 단위로 묶습니다. 한 주기에 (시군구, 월) 파티션마다 한 번만
+조회하므로 단지 1,000개를 감시해도 호출 수는 그 단지들이 속한 시군구 수 x
+월 수(x 페이지 수)입니다. 호출은 선조회 우선순위로 나가 일일 한도의 90%
+까지만 쓰고, 저장소 TTL 안에 다른 작업(대시보드, 배치)이 이미 받은 파티션은
+다시 받지 않습니다.
+
+이미 본 거래는 파티션마다 지문(거래 행 해시) 파일로 남겨 두므로 재시작이나
+여러 프로세스(대시보드 + watch_deals.py)가 함께 돌아도 같은 거래를 두 번
+알리지 않습니다. 처음 보는 파티션은 저장소에 있던 거래를 기준으로 삼습니다.
+
+경로는 REALESTATE_WATCH_DIR (기본 data/watch) 아래에 둡니다:
+watchlist.json, alerts.jsonl, seen/.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+import requests
+
+from . import config
+from .fileio import atomic_json_read, atomic_json_write, atomic_write
+from .molit import MolitAPIError, recent_deal_months
+from .quota import Priority, QuotaExceeded, default_scheduler, fetch_priority
+from .singleflight import file_lock
+from .store import RECENT_PARTITION_TTL, PartitionKey, TransactionStore
+
+logger = logging.getLogger(__name__)
+
+WATCH_DIR = os.getenv("REALESTATE_WATCH_DIR", os.path.join(config.PROJECT_DIR, "data", "watch"))
+
+# 신고 기한이 남아 거래가 추가될 수 있는 최근 월 수 (store.is_settled_month 와 같은 기준)
+WATCH_MONTHS = 2
+
+# 저장소 TTL 보다 자주 돌면 받을 파티션이 없음
+POLL_INTERVAL = RECENT_PARTITION_TTL
+
+# 거래 지문에 쓰는 컬럼 (저장 형식이 바뀌어도 같은 거래면 같은 지문)
+DEAL_COLUMNS = ['apt', 'price', 'dong', 'jibun', 'area', 'floor', 'date']
+
+# 대시보드가 읽는 알림 기록 끝부분 크기
+ALERT_TAIL_BYTES = 256 * 1024
+
+
+class Watch(NamedTuple):
+    """감시 항목 (apt/dong 이 None 이면 그 조건 없음)"""
+    lawd_cd: str
+    apt: Optional[str] = None
+    dong: Optional[str] = None
+
+    @property
+    def label(self) -> str:
+        parts = [p for p in (self.dong, self.apt) if p]
+        return " ".join(parts) if parts else "시군구 전체"
+
+    def match(self, deals: pd.DataFrame) -> pd.DataFrame:
+        mask = np.ones(len(deals), dtype=bool)
+        if self.apt is not None:
+            mask &= (deals['apt'] == self.apt).to_numpy()
+        if self.dong is not None:
+            mask &= (deals['dong'] == self.dong).to_numpy()
+        return deals[mask]
+
+
+class Alert(NamedTuple):
+    watch: Watch
+    deal_ymd: str
+    deals: pd.DataFrame
+    detected_at: float  # time.time()
+
+
+def deal_ids(df: pd.DataFrame) -> np.ndarray:
+    """
+    거래 행 지문 (uint64)
+
+    같은 내용의 거래가 여러 건이면 몇 번째인지까지 넣어 서로 다른 지문이 됩니다.
+    """
+    if df.empty:
+        return np.empty(0, dtype='uint64')
+    columns = [c for c in DEAL_COLUMNS if c in df.columns]
+    frame = df[columns]
+    if 'floor' in frame.columns:
+        # 빈 층(<NA>)은 예전 형식(0)과 같은 지문이 되도록
+        frame = frame.assign(floor=frame['floor'].fillna(0))
+    base = pd.util.hash_pandas_object(frame, index=False)
+    nth = base.groupby(base.to_numpy()).cumcount()
+    return pd.util.hash_pandas_object(
+        pd.DataFrame({'base': base.to_numpy(), 'nth': nth.to_numpy()}), index=False
+    ).to_numpy()
+
+
+# ==================== 감시 목록 ====================
+
+class Watchlist:
+    """감시 항목 목록 (JSON 파일, 프로세스 간 공유)"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.path.join(WATCH_DIR, "watchlist.json")
+        self._cached: Optional[tuple] = None  # (mtime_ns, watches)
+
+    def _read(self) -> List[Watch]:
+        try:
+            return [Watch(**item) for item in atomic_json_read(self.path, [])]
+        except TypeError:
+            return []
+
+    def _write(self, watches: List[Watch]):
+        atomic_json_write(self.path, [w._asdict() for w in watches], indent=1)
+
+    def watches(self) -> List[Watch]:
+        """현재 항목 (파일이 바뀌었을 때만 다시 읽음)"""
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError:
+            return []
+        if self._cached is None or self._cached[0] != mtime:
+            self._cached = (mtime, self._read())
+        return list(self._cached[1])
+
+    def add(self, watch: Watch) -> bool:
+        with file_lock(self.path + '.lock'):
+            watches = self._read()
+            if watch in watches:
+                return False
+            self._write(watches + [watch])
+            return True
+
+    def remove(self, watch: Watch) -> bool:
+        with file_lock(self.path + '.lock'):
+            watches = self._read()
+            if watch not in watches:
+                return False
+            self._write([w for w in watches if w != watch])
+            return True
+
+    def by_district(self) -> Dict[str, List[Watch]]:
+        """시군구 -> 항목 (항목이 많은 시군구부터)"""
+        groups: Dict[str, List[Watch]] = {}
+        for watch in self.watches():
+            groups.setdefault(watch.lawd_cd, []).append(watch)
+        return dict(sorted(groups.items(), key=lambda item: -len(item[1])))
+
+
+# ==================== 알림 싱크 ====================
+
+AlertSink = Callable[[List[Alert]], None]
+
+
+def alert_records(alerts: Sequence[Alert]) -> List[dict]:
+    """알림 -> 거래 한 건당 JSON 직렬화 가능한 dict"""
+    records = []
+    for alert in alerts:
+        for row in alert.deals.itertuples(index=False):
+            row = row._asdict()
+            records.append({
+                'detected_at': round(alert.detected_at, 3),
+                'watch': alert.watch.label,
+                'lawd_cd': alert.watch.lawd_cd,
+                'deal_ymd': alert.deal_ymd,
+                'apt': str(row.get('apt', '')),
+                'dong': str(row.get('dong', '')),
+                'jibun': str(row.get('jibun', '')),
+                'area': round(float(row['area']), 2) if pd.notna(row.get('area')) else None,
+                'floor': int(row['floor']) if pd.notna(row.get('floor')) else None,
+                'price': int(row['price']) if pd.notna(row.get('price')) else None,
+                'date': str(pd.Timestamp(row['date']).date()) if pd.notna(row.get('date')) else None,
+            })
+    return records
+
+
+class JsonLinesSink:
+    """거래 한 건당 한 줄씩 파일에 덧붙임 (대시보드 알림 배지가 읽음)"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.path.join(WATCH_DIR, "alerts.jsonl")
+
+    def __call__(self, alerts: List[Alert]):
+        lines = "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in alert_records(alerts))
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with file_lock(self.path + '.lock'), open(self.path, 'a', encoding='utf-8') as f:
+            f.write(lines)
+
+
+class WebhookSink:
+    """주기마다 새 거래를 한 번에 POST ({"alerts": [...]})"""
+
+    def __init__(self, url: str, timeout: float = 10):
+        self.url = url
+        self.timeout = timeout
+
+    def __call__(self, alerts: List[Alert]):
+        res = requests.post(self.url, json={'alerts': alert_records(alerts)}, timeout=self.timeout)
+        res.raise_for_status()
+
+
+class MemorySink:
+    """최근 알림을 메모리에 보관 (같은 프로세스에서 조회)"""
+
+    def __init__(self, maxlen: int = 500):
+        self.records: deque = deque(maxlen=maxlen)
+
+    def __call__(self, alerts: List[Alert]):
+        self.records.extend(alert_records(alerts))
+
+
+def read_alerts(path: Optional[str] = None, limit: int = 100) -> List[dict]:
+    """JsonLinesSink 기록의 최근 limit 건 (오래된 것부터, 파일 끝부분만 읽음)"""
+    path = path or os.path.join(WATCH_DIR, "alerts.jsonl")
+    try:
+        with open(path, 'rb') as f:
+            size = f.seek(0, os.SEEK_END)
+            f.seek(max(0, size - ALERT_TAIL_BYTES))
+            lines = f.read().splitlines()
+    except OSError:
+        return []
+    if size > ALERT_TAIL_BYTES:
+        lines = lines[1:]  # 잘린 첫 줄
+    records = []
+    for line in lines[-limit:]:
+        try:
+            records.append(json.loads(line))
+        except ValueError:
+            continue
+    return records
+
+
+# ==================== 폴링 ====================
+
+class WatchPoller:
+    """
+    감시 목록 폴링 스케줄러
+
+    start() 로 백그라운드 스레드를 띄우거나, run() 으로 현재 스레드에서 돌리거나,
+    poll_once() 를 직접(cron 등) 부릅니다.
+    """
+
+    def __init__(self, watchlist: Watchlist, sinks: Sequence[AlertSink] = (),
+                 store: Optional[TransactionStore] = None,
+                 interval: float = POLL_INTERVAL, months: int = WATCH_MONTHS,
+                 state_dir: Optional[str] = None):
+        self.watchlist = watchlist
+        self.sinks = list(sinks)
+        self.store = store or TransactionStore()
+        self.interval = interval
+        self.months = months
+        self.state_dir = state_dir or os.path.join(WATCH_DIR, "seen")
+        self.last_poll: Optional[float] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # ---------- 본 거래 ----------
+
+    def _seen_path(self, key: PartitionKey) -> str:
+        return os.path.join(self.state_dir, self.store.dataset, f"{key.lawd_cd}-{key.deal_ymd}.npy")
+
+    def _load_seen(self, key: PartitionKey) -> Optional[np.ndarray]:
+        try:
+            return np.load(self._seen_path(key))
+        except (OSError, ValueError):
+            return None
+
+    def _save_seen(self, key: PartitionKey, ids: np.ndarray):
+        with atomic_write(self._seen_path(key)) as f:
+            np.save(f, ids)
+
+    def _prune_seen(self, months: List[str]):
+        """감시 범위를 벗어난 월의 지문 파일 삭제"""
+        directory = os.path.join(self.state_dir, self.store.dataset)
+        if not os.path.isdir(directory):
+            return
+        for name in os.listdir(directory):
+            if name.endswith(".npy") and name[:-4].rsplit("-", 1)[-1] not in months:
+                try:
+                    os.remove(os.path.join(directory, name))
+                except OSError:
+                    pass
+
+    def _new_deals(self, key: PartitionKey) -> pd.DataFrame:
+        """파티션을 갱신하고 지난번에 본 뒤 새로 생긴 거래 반환"""
+        seen = self._load_seen(key)
+        if seen is None and self.store.has_partition(*key):
+            seen = deal_ids(self.store.read_partition(*key))  # 처음: 저장소 기준
+
+        df = self.store.sync_partition(*key, revalidate=True)
+        ids = deal_ids(df)
+        if seen is not None and np.array_equal(ids, seen):
+            return df.iloc[:0]
+        self._save_seen(key, ids)
+        if seen is None:
+            return df.iloc[:0]  # 저장소에도 없던 파티션: 기준만 잡음
+        return df[~np.isin(ids, seen)]
+
+    # ---------- 한 주기 ----------
+
+    def poll_once(self) -> List[Alert]:
+        """
+        감시 중인 시군구의 최근 월을 한 번씩 조회하고 새 거래 알림을 싱크로 보냄
+
+        한도가 남지 않으면 주기를 중단하고 다음 주기에 이어서 합니다.
+        """
+        districts = self.watchlist.by_district()
+        months = recent_deal_months(self.months)
+        api = f"molit:{self.store.dataset}"
+        alerts: List[Alert] = []
+
+        # 여러 폴러(대시보드 + CLI)가 같은 주기를 겹쳐 돌지 않게
+        os.makedirs(self.state_dir, exist_ok=True)
+        with file_lock(os.path.join(self.state_dir, "poll.lock")), \
+                fetch_priority(Priority.PREFETCH):
+            for lawd_cd, watches in districts.items():
+                if default_scheduler.ledger.remaining(api, Priority.PREFETCH) <= 0:
+                    logger.warning("%s 선조회 한도 소진, 폴링 중단", api)
+                    break
+                try:
+                    for deal_ymd in months:
+                        new = self._new_deals(PartitionKey(lawd_cd, deal_ymd))
+                        if new.empty:
+                            continue
+                        now = time.time()
+                        for watch in watches:
+                            matched = watch.match(new)
+                            if not matched.empty:
+                                alerts.append(Alert(watch, deal_ymd, matched, now))
+                except QuotaExceeded as e:
+                    logger.warning("폴링 중단: %s", e)
+                    break
+                except MolitAPIError as e:
+                    logger.warning("%s 폴링 실패: %s", lawd_cd, e)
+            self._prune_seen(months)
+
+        self.last_poll = time.time()
+        if alerts:
+            logger.info("새 거래 알림 %d건", sum(len(a.deals) for a in alerts))
+            for sink in self.sinks:
+                try:
+                    sink(alerts)
+                except Exception as e:
+                    logger.warning("알림 전송 실패 (%s): %s", type(sink).__name__, e)
+        return alerts
+
+    # ---------- 백그라운드 실행 ----------
+
+    def run(self):
+        """현재 스레드에서 stop() 까지 interval 마다 폴링"""
+        while not self._stop.is_set():
+            try:
+                self.poll_once()
+            except Exception:
+                logger.exception("감시 목록 폴링 오류")
+            self._stop.wait(self.interval)
+
+    def start(self) -> 'WatchPoller':
+        """백그라운드 폴링 시작 (이미 실행 중이면 그대로)"""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self.run, name="watch-poller", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
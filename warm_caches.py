@@ -0,0 +1,78 @@
+"""
+인기 지역 캐시 워밍 (야간 배치)
+
+대시보드 접근 통계로 최근 많이 본 시군구를 골라 실거래 프레임과 단지 좌표를
+디스크 캐시에 미리 채웁니다. 아침 첫 사용자도 국토부·VWorld 응답을 기다리지
+않습니다 (realestate_core.warmup 참고).
+
+실행:
+    python warm_caches.py --top 20                 # 지금 한 번 (cron: 0 5 * * *)
+    python warm_caches.py --top 20 --at 05:00      # 매일 05:00 (한국 시간)에 반복
+    python warm_caches.py --dry-run                # 대상 시군구와 예상 적중률만 출력
+
+호출은 선조회 우선순위로 나가므로 대시보드 몫의 API 한도는 남겨 둡니다.
+"""
+
+import argparse
+import logging
+import time
+from datetime import datetime, timedelta
+
+from realestate_core.quota import KST
+from realestate_core.warmup import GEOCODE_WARM_LIMIT, AccessStats, WarmResult, warm_up
+
+logger = logging.getLogger("warm_caches")
+
+
+def seconds_until(hhmm: str) -> float:
+    """다음 HH:MM (한국 시간)까지 남은 초"""
+    hour, minute = map(int, hhmm.split(":"))
+    now = datetime.now(KST)
+    target = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if target <= now:
+        target += timedelta(days=1)
+    return (target - now).total_seconds()
+
+
+def print_result(result: WarmResult):
+    print(f"  {result.lawd_cd}: {result.months}개월 {result.rows:,}건, "
+          f"좌표 {result.geocoded:,}개 ({result.seconds:.1f}s)")
+
+
+def run(stats: AccessStats, top: int, days: int, geocode_limit: int, dry_run: bool):
+    districts = stats.top(top, days)
+    coverage = stats.coverage(districts)
+    print(f"🔥 워밍 대상 {len(districts)}곳 (최근 {days}일 기준, "
+          f"어제·오늘 조회 중 {coverage:.0%} 해당)")
+    for d in districts:
+        print(f"  {d.lawd_cd} {d.sido} {d.sigungu}: {d.count}회, 기간 {list(d.months)}"
+              f"{', 전세가율' if d.jeonse else ''}")
+    if dry_run:
+        return
+
+    began = time.perf_counter()
+    results = warm_up(districts, geocode_limit, on_district=print_result)
+    print(f"✅ {len(results)}/{len(districts)}곳 완료 ({time.perf_counter() - began:.1f}s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="인기 지역 캐시 워밍")
+    parser.add_argument("--top", type=int, default=20, help="워밍할 시군구 수 (기본 20)")
+    parser.add_argument("--days", type=int, default=7, help="접근 통계 기간(일, 기본 7)")
+    parser.add_argument("--geocode-limit", type=int, default=GEOCODE_WARM_LIMIT,
+                        help=f"시군구마다 좌표를 받을 단지 수 (기본 {GEOCODE_WARM_LIMIT})")
+    parser.add_argument("--at", metavar="HH:MM", help="매일 이 시각(한국 시간)에 반복 실행")
+    parser.add_argument("--dry-run", action="store_true", help="대상만 출력")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    stats = AccessStats()
+
+    if not args.at:
+        run(stats, args.top, args.days, args.geocode_limit, args.dry_run)
+    else:
+        while True:
+            wait = seconds_until(args.at)
+            logger.info("다음 워밍까지 %.0f분", wait / 60)
+            time.sleep(wait)
+            run(stats, args.top, args.days, args.geocode_limit, args.dry_run)
@@ -0,0 +1,76 @@
+"""
+감시 목록 관리 + 새 거래 폴링
+
+감시 중인 단지·시군구의 최근 월 거래를 주기적으로 받아 새 거래를 알립니다.
+폴링은 시군구 단위로 묶이므로 감시 항목 수와 무관하게 (시군구, 월)마다 한 번만
+조회합니다 (realestate_core.watch 참고). 대시보드도 같은 감시 목록과 알림 기록을
+쓰며, 함께 돌려도 같은 거래를 두 번 알리지 않습니다.
+
+실행:
+    python watch_deals.py --add 11680 --apt 래미안대치팰리스
+    python watch_deals.py --add 11650                   # 시군구 전체
+    python watch_deals.py --list
+    python watch_deals.py                               # 계속 폴링 (Ctrl+C 로 종료)
+    python watch_deals.py --once --webhook http://localhost:9000/hook   # cron 용 한 번
+
+알림은 data/watch/alerts.jsonl (REALESTATE_WATCH_DIR)에 한 줄씩 쌓이고,
+--webhook 을 주면 주기마다 새 거래를 모아 POST 합니다.
+"""
+
+import argparse
+import logging
+
+import pandas as pd
+
+from realestate_core.watch import (
+    POLL_INTERVAL, JsonLinesSink, Watch, Watchlist, WatchPoller, WebhookSink
+)
+
+
+def print_alerts(alerts):
+    for alert in alerts:
+        for row in alert.deals.itertuples(index=False):
+            floor = "-" if pd.isna(row.floor) else row.floor
+            print(f"🔔 [{alert.watch.label}] {row.date:%Y-%m-%d} {row.dong} {row.apt} "
+                  f"{row.area:.1f}㎡ {floor}층 {row.price:,}만원")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="감시 목록 새 거래 알림")
+    parser.add_argument("--add", metavar="LAWD_CD", help="감시 항목 추가 (시군구 코드)")
+    parser.add_argument("--remove", metavar="LAWD_CD", help="감시 항목 삭제 (시군구 코드)")
+    parser.add_argument("--apt", help="단지명 (--add/--remove 와 함께, 생략하면 조건 없음)")
+    parser.add_argument("--dong", help="법정동 이름 (--add/--remove 와 함께)")
+    parser.add_argument("--list", action="store_true", help="감시 목록 출력")
+    parser.add_argument("--once", action="store_true", help="한 번만 폴링하고 종료")
+    parser.add_argument("--interval", type=float, default=POLL_INTERVAL,
+                        help=f"폴링 간격(초, 기본 {POLL_INTERVAL})")
+    parser.add_argument("--webhook", help="새 거래를 POST 할 URL")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    watchlist = Watchlist()
+
+    if args.add or args.remove:
+        watch = Watch(args.add or args.remove, apt=args.apt, dong=args.dong)
+        changed = watchlist.add(watch) if args.add else watchlist.remove(watch)
+        print(f"{'✅' if changed else 'ℹ️ 변경 없음:'} {watch.lawd_cd} {watch.label}")
+    if args.list:
+        for lawd_cd, watches in watchlist.by_district().items():
+            print(f"{lawd_cd}: " + ", ".join(w.label for w in watches))
+    if args.add or args.remove or args.list:
+        raise SystemExit(0)
+
+    sinks = [JsonLinesSink(), print_alerts]
+    if args.webhook:
+        sinks.append(WebhookSink(args.webhook))
+    poller = WatchPoller(watchlist, sinks, interval=args.interval)
+
+    if args.once:
+        poller.poll_once()
+    else:
+        print(f"👀 감시 {len(watchlist.watches())}건, {args.interval:.0f}초마다 폴링 (Ctrl+C 로 종료)")
+        try:
+            poller.run()
+        except KeyboardInterrupt:
+            pass